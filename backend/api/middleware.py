@@ -0,0 +1,84 @@
+import cProfile
+import json
+import logging
+import os
+import random
+import time
+import uuid
+
+from django.conf import settings
+
+from .services import timing
+
+logger = logging.getLogger(__name__)
+
+# Profiles are kept only for requests at least this slow
+DEFAULT_PROFILE_SLOW_MS = 1000
+
+
+class TimingMiddleware:
+    """
+    With REQUEST_TIMING on, times each request and the stages recorded by
+    ``timing.span``. They are sent back in a Server-Timing header, logged as a
+    JSON line (``api.middleware`` at INFO) and added to the metrics served at
+    ``metrics/``, which cover only the worker process that serves the scrape.
+
+    A request is profiled with cProfile when it is picked by
+    PROFILE_SAMPLE_RATE (a fraction of requests), or sends ``X-Profile: 1``
+    while PROFILE_HEADER is on. Profiles of requests slower than
+    PROFILE_SLOW_MS are written to PROFILE_DIR for ``pstats``/snakeviz.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+        self.allow_header = os.environ.get('PROFILE_HEADER', '').lower() in ('1', 'true', 'yes')
+        self.slow_ms = float(os.environ.get('PROFILE_SLOW_MS', DEFAULT_PROFILE_SLOW_MS))
+        self.profile_dir = os.environ.get('PROFILE_DIR', os.path.join(settings.BASE_DIR, 'data', 'profiles'))
+
+    def _should_profile(self, request):
+        if self.allow_header and request.headers.get('X-Profile') == '1':
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if not timing.ENABLED:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile() if self._should_profile(request) else None
+        token = timing.start()
+        started = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            spans = timing.finish(token)
+        elapsed = time.perf_counter() - started
+
+        endpoint = request.resolver_match.url_name if request.resolver_match else 'unmatched'
+        stages = timing.stage_totals(spans)
+        # Streaming responses are timed up to their first chunk
+        server_timing = [f'{stage};dur={seconds * 1000:.1f}' for stage, seconds in stages.items()]
+        server_timing.append(f'total;dur={elapsed * 1000:.1f}')
+        response['Server-Timing'] = ', '.join(server_timing)
+        timing.metrics.observe_request(endpoint, response.status_code, elapsed, stages)
+
+        log = {
+            'event': 'request_timing',
+            'endpoint': endpoint,
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 1),
+            'stages_ms': {stage: round(seconds * 1000, 1) for stage, seconds in stages.items()},
+        }
+        if profiler is not None and elapsed * 1000 >= self.slow_ms:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            path = os.path.join(self.profile_dir, f'{endpoint}-{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}.prof')
+            profiler.dump_stats(path)
+            log['profile'] = path
+        logger.info(json.dumps(log))
+        return response
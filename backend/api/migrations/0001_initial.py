@@ -0,0 +1,237 @@
+# Generated by Django 4.2.20 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoreLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('table', models.CharField(max_length=32)),
+                ('rows', models.BigIntegerField()),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CorePeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('net_volume', models.FloatField(null=True)),
+                ('boas_count', models.BigIntegerField(default=0)),
+                ('bids_count', models.BigIntegerField(default=0)),
+                ('offers_count', models.BigIntegerField(default=0)),
+                ('balancing_cost', models.FloatField(null=True)),
+                ('system_volume', models.FloatField(null=True)),
+                ('energy_volume', models.FloatField(null=True)),
+                ('gen_BATTERY', models.FloatField(default=0.0)),
+                ('gen_BIOMASS', models.FloatField(default=0.0)),
+                ('gen_CCGT', models.FloatField(default=0.0)),
+                ('gen_COAL', models.FloatField(default=0.0)),
+                ('gen_DIESEL', models.FloatField(default=0.0)),
+                ('gen_GAS', models.FloatField(default=0.0)),
+                ('gen_HYDRO', models.FloatField(default=0.0)),
+                ('gen_INTELEC', models.FloatField(default=0.0)),
+                ('gen_INTEW', models.FloatField(default=0.0)),
+                ('gen_INTFR', models.FloatField(default=0.0)),
+                ('gen_INTGRNL', models.FloatField(default=0.0)),
+                ('gen_INTIFA2', models.FloatField(default=0.0)),
+                ('gen_INTIRL', models.FloatField(default=0.0)),
+                ('gen_INTNED', models.FloatField(default=0.0)),
+                ('gen_INTNEM', models.FloatField(default=0.0)),
+                ('gen_INTNSL', models.FloatField(default=0.0)),
+                ('gen_INTVKL', models.FloatField(default=0.0)),
+                ('gen_NPSHYD', models.FloatField(default=0.0)),
+                ('gen_NUCLEAR', models.FloatField(default=0.0)),
+                ('gen_OCGT', models.FloatField(default=0.0)),
+                ('gen_OIL', models.FloatField(default=0.0)),
+                ('gen_PS', models.FloatField(default=0.0)),
+                ('gen_SOLAR', models.FloatField(default=0.0)),
+                ('gen_WIND', models.FloatField(default=0.0)),
+                ('gen_OTHER', models.FloatField(default=0.0)),
+                ('con_BATTERY', models.FloatField(default=0.0)),
+                ('con_BIOMASS', models.FloatField(default=0.0)),
+                ('con_CCGT', models.FloatField(default=0.0)),
+                ('con_COAL', models.FloatField(default=0.0)),
+                ('con_DIESEL', models.FloatField(default=0.0)),
+                ('con_GAS', models.FloatField(default=0.0)),
+                ('con_HYDRO', models.FloatField(default=0.0)),
+                ('con_INTELEC', models.FloatField(default=0.0)),
+                ('con_INTEW', models.FloatField(default=0.0)),
+                ('con_INTFR', models.FloatField(default=0.0)),
+                ('con_INTGRNL', models.FloatField(default=0.0)),
+                ('con_INTIFA2', models.FloatField(default=0.0)),
+                ('con_INTIRL', models.FloatField(default=0.0)),
+                ('con_INTNED', models.FloatField(default=0.0)),
+                ('con_INTNEM', models.FloatField(default=0.0)),
+                ('con_INTNSL', models.FloatField(default=0.0)),
+                ('con_INTVKL', models.FloatField(default=0.0)),
+                ('con_NPSHYD', models.FloatField(default=0.0)),
+                ('con_NUCLEAR', models.FloatField(default=0.0)),
+                ('con_OCGT', models.FloatField(default=0.0)),
+                ('con_OIL', models.FloatField(default=0.0)),
+                ('con_PS', models.FloatField(default=0.0)),
+                ('con_SOLAR', models.FloatField(default=0.0)),
+                ('con_WIND', models.FloatField(default=0.0)),
+                ('con_OTHER', models.FloatField(default=0.0)),
+                ('settlement_date', models.DateField()),
+                ('settlement_period', models.SmallIntegerField()),
+                ('gsp_group_id', models.CharField(max_length=16)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('net_volume', models.FloatField(null=True)),
+                ('boas_count', models.BigIntegerField(default=0)),
+                ('bids_count', models.BigIntegerField(default=0)),
+                ('offers_count', models.BigIntegerField(default=0)),
+                ('balancing_cost', models.FloatField(null=True)),
+                ('system_volume', models.FloatField(null=True)),
+                ('energy_volume', models.FloatField(null=True)),
+                ('gen_BATTERY', models.FloatField(default=0.0)),
+                ('gen_BIOMASS', models.FloatField(default=0.0)),
+                ('gen_CCGT', models.FloatField(default=0.0)),
+                ('gen_COAL', models.FloatField(default=0.0)),
+                ('gen_DIESEL', models.FloatField(default=0.0)),
+                ('gen_GAS', models.FloatField(default=0.0)),
+                ('gen_HYDRO', models.FloatField(default=0.0)),
+                ('gen_INTELEC', models.FloatField(default=0.0)),
+                ('gen_INTEW', models.FloatField(default=0.0)),
+                ('gen_INTFR', models.FloatField(default=0.0)),
+                ('gen_INTGRNL', models.FloatField(default=0.0)),
+                ('gen_INTIFA2', models.FloatField(default=0.0)),
+                ('gen_INTIRL', models.FloatField(default=0.0)),
+                ('gen_INTNED', models.FloatField(default=0.0)),
+                ('gen_INTNEM', models.FloatField(default=0.0)),
+                ('gen_INTNSL', models.FloatField(default=0.0)),
+                ('gen_INTVKL', models.FloatField(default=0.0)),
+                ('gen_NPSHYD', models.FloatField(default=0.0)),
+                ('gen_NUCLEAR', models.FloatField(default=0.0)),
+                ('gen_OCGT', models.FloatField(default=0.0)),
+                ('gen_OIL', models.FloatField(default=0.0)),
+                ('gen_PS', models.FloatField(default=0.0)),
+                ('gen_SOLAR', models.FloatField(default=0.0)),
+                ('gen_WIND', models.FloatField(default=0.0)),
+                ('gen_OTHER', models.FloatField(default=0.0)),
+                ('con_BATTERY', models.FloatField(default=0.0)),
+                ('con_BIOMASS', models.FloatField(default=0.0)),
+                ('con_CCGT', models.FloatField(default=0.0)),
+                ('con_COAL', models.FloatField(default=0.0)),
+                ('con_DIESEL', models.FloatField(default=0.0)),
+                ('con_GAS', models.FloatField(default=0.0)),
+                ('con_HYDRO', models.FloatField(default=0.0)),
+                ('con_INTELEC', models.FloatField(default=0.0)),
+                ('con_INTEW', models.FloatField(default=0.0)),
+                ('con_INTFR', models.FloatField(default=0.0)),
+                ('con_INTGRNL', models.FloatField(default=0.0)),
+                ('con_INTIFA2', models.FloatField(default=0.0)),
+                ('con_INTIRL', models.FloatField(default=0.0)),
+                ('con_INTNED', models.FloatField(default=0.0)),
+                ('con_INTNEM', models.FloatField(default=0.0)),
+                ('con_INTNSL', models.FloatField(default=0.0)),
+                ('con_INTVKL', models.FloatField(default=0.0)),
+                ('con_NPSHYD', models.FloatField(default=0.0)),
+                ('con_NUCLEAR', models.FloatField(default=0.0)),
+                ('con_OCGT', models.FloatField(default=0.0)),
+                ('con_OIL', models.FloatField(default=0.0)),
+                ('con_PS', models.FloatField(default=0.0)),
+                ('con_SOLAR', models.FloatField(default=0.0)),
+                ('con_WIND', models.FloatField(default=0.0)),
+                ('con_OTHER', models.FloatField(default=0.0)),
+                ('settlement_date', models.DateField()),
+                ('gsp_group_id', models.CharField(max_length=16)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('net_volume', models.FloatField(null=True)),
+                ('boas_count', models.BigIntegerField(default=0)),
+                ('bids_count', models.BigIntegerField(default=0)),
+                ('offers_count', models.BigIntegerField(default=0)),
+                ('balancing_cost', models.FloatField(null=True)),
+                ('system_volume', models.FloatField(null=True)),
+                ('energy_volume', models.FloatField(null=True)),
+                ('gen_BATTERY', models.FloatField(default=0.0)),
+                ('gen_BIOMASS', models.FloatField(default=0.0)),
+                ('gen_CCGT', models.FloatField(default=0.0)),
+                ('gen_COAL', models.FloatField(default=0.0)),
+                ('gen_DIESEL', models.FloatField(default=0.0)),
+                ('gen_GAS', models.FloatField(default=0.0)),
+                ('gen_HYDRO', models.FloatField(default=0.0)),
+                ('gen_INTELEC', models.FloatField(default=0.0)),
+                ('gen_INTEW', models.FloatField(default=0.0)),
+                ('gen_INTFR', models.FloatField(default=0.0)),
+                ('gen_INTGRNL', models.FloatField(default=0.0)),
+                ('gen_INTIFA2', models.FloatField(default=0.0)),
+                ('gen_INTIRL', models.FloatField(default=0.0)),
+                ('gen_INTNED', models.FloatField(default=0.0)),
+                ('gen_INTNEM', models.FloatField(default=0.0)),
+                ('gen_INTNSL', models.FloatField(default=0.0)),
+                ('gen_INTVKL', models.FloatField(default=0.0)),
+                ('gen_NPSHYD', models.FloatField(default=0.0)),
+                ('gen_NUCLEAR', models.FloatField(default=0.0)),
+                ('gen_OCGT', models.FloatField(default=0.0)),
+                ('gen_OIL', models.FloatField(default=0.0)),
+                ('gen_PS', models.FloatField(default=0.0)),
+                ('gen_SOLAR', models.FloatField(default=0.0)),
+                ('gen_WIND', models.FloatField(default=0.0)),
+                ('gen_OTHER', models.FloatField(default=0.0)),
+                ('con_BATTERY', models.FloatField(default=0.0)),
+                ('con_BIOMASS', models.FloatField(default=0.0)),
+                ('con_CCGT', models.FloatField(default=0.0)),
+                ('con_COAL', models.FloatField(default=0.0)),
+                ('con_DIESEL', models.FloatField(default=0.0)),
+                ('con_GAS', models.FloatField(default=0.0)),
+                ('con_HYDRO', models.FloatField(default=0.0)),
+                ('con_INTELEC', models.FloatField(default=0.0)),
+                ('con_INTEW', models.FloatField(default=0.0)),
+                ('con_INTFR', models.FloatField(default=0.0)),
+                ('con_INTGRNL', models.FloatField(default=0.0)),
+                ('con_INTIFA2', models.FloatField(default=0.0)),
+                ('con_INTIRL', models.FloatField(default=0.0)),
+                ('con_INTNED', models.FloatField(default=0.0)),
+                ('con_INTNEM', models.FloatField(default=0.0)),
+                ('con_INTNSL', models.FloatField(default=0.0)),
+                ('con_INTVKL', models.FloatField(default=0.0)),
+                ('con_NPSHYD', models.FloatField(default=0.0)),
+                ('con_NUCLEAR', models.FloatField(default=0.0)),
+                ('con_OCGT', models.FloatField(default=0.0)),
+                ('con_OIL', models.FloatField(default=0.0)),
+                ('con_PS', models.FloatField(default=0.0)),
+                ('con_SOLAR', models.FloatField(default=0.0)),
+                ('con_WIND', models.FloatField(default=0.0)),
+                ('con_OTHER', models.FloatField(default=0.0)),
+                ('settlement_date', models.DateField()),
+                ('gsp_group_id', models.CharField(max_length=16)),
+                ('hour', models.SmallIntegerField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='hourlyrollup',
+            constraint=models.UniqueConstraint(fields=('settlement_date', 'gsp_group_id', 'hour'), name='hourly_rollup_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('settlement_date', 'gsp_group_id'), name='daily_rollup_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='coreperiod',
+            constraint=models.UniqueConstraint(fields=('settlement_date', 'settlement_period', 'gsp_group_id'), name='core_period_key'),
+        ),
+        migrations.AddConstraint(
+            model_name='coreload',
+            constraint=models.UniqueConstraint(fields=('year', 'table'), name='core_load_key'),
+        ),
+    ]
@@ -0,0 +1,71 @@
+from django.db import models
+
+from .services.fuel_mix import ALL_MIX_COLUMNS
+
+
+class CoreValues(models.Model):
+    """
+    Numeric columns of the core rows and their rollups. The per-fuel mix
+    columns (``gen_CCGT``, ``con_CCGT``, ...) are added below from the fuel
+    vocabulary so they stay in step with the core files.
+    """
+    net_volume = models.FloatField(null=True)
+    boas_count = models.BigIntegerField(default=0)
+    bids_count = models.BigIntegerField(default=0)
+    offers_count = models.BigIntegerField(default=0)
+    balancing_cost = models.FloatField(null=True)
+    system_volume = models.FloatField(null=True)
+    energy_volume = models.FloatField(null=True)
+
+    class Meta:
+        abstract = True
+
+
+for _column in ALL_MIX_COLUMNS:
+    CoreValues.add_to_class(_column, models.FloatField(default=0.0))
+
+
+class CorePeriod(CoreValues):
+    """Core rows: one per settlement period and GSP group."""
+    settlement_date = models.DateField()
+    settlement_period = models.SmallIntegerField()
+    gsp_group_id = models.CharField(max_length=16)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['settlement_date', 'settlement_period', 'gsp_group_id'], name='core_period_key'),
+        ]
+
+
+class HourlyRollup(CoreValues):
+    settlement_date = models.DateField()
+    gsp_group_id = models.CharField(max_length=16)
+    hour = models.SmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['settlement_date', 'gsp_group_id', 'hour'], name='hourly_rollup_key'),
+        ]
+
+
+class DailyRollup(CoreValues):
+    settlement_date = models.DateField()
+    gsp_group_id = models.CharField(max_length=16)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['settlement_date', 'gsp_group_id'], name='daily_rollup_key'),
+        ]
+
+
+class CoreLoad(models.Model):
+    """The last bulk load of each table and year; its time versions cached responses."""
+    year = models.IntegerField()
+    table = models.CharField(max_length=32)
+    rows = models.BigIntegerField()
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['year', 'table'], name='core_load_key'),
+        ]
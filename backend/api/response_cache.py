@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+import threading
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .services.timing import span
+
+# Part of every key; bump it when a cached endpoint's output changes
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_MB = 256
+
+# Response headers stored and replayed alongside the body
+CACHED_HEADERS = ['X-Resolution']
+
+
+class DiskResponseCache:
+    """
+    Cached responses as files under ``cache_dir``, shared by every server
+    process. A file's mtime records its last use; once the directory holds
+    more than ``max_bytes`` the least recently used files are removed.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.bin')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return {**meta, 'content': content}
+
+    def set(self, key, entry):
+        if len(entry['content']) > self.max_bytes:
+            return
+        meta = {k: v for k, v in entry.items() if k != 'content'}
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(meta).encode() + b'\n')
+            f.write(entry['content'])
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        files, total = [], 0
+        for item in os.scandir(self.cache_dir):
+            if not item.name.endswith('.bin'):
+                continue
+            try:
+                stat = item.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, item.path))
+            total += stat.st_size
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class DjangoResponseCache:
+    """Cached responses in a Django cache (settings.CACHES); size limits are that backend's."""
+
+    def __init__(self, alias='default'):
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(f'response:{key}')
+
+    def set(self, key, entry):
+        self.cache.set(f'response:{key}', entry)
+
+
+class ResponseCache:
+    """
+    Caches GET views whose output depends only on their query parameters and
+    a data version. Keys are the view name, the sorted query parameters and
+    that version, and double as strong ETags, so a client revalidating with
+    If-None-Match gets a 304 without the view or the store being touched.
+    ``backend`` may be None to keep the ETags but store nothing.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def key(view_name, query, version, variant=None):
+        params = sorted((name, values) for name, values in query.lists())
+        raw = json.dumps([CACHE_FORMAT, view_name, params, version, variant])
+        return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+    def cached(self, version, vary=None):
+        """
+        Decorator for a view. ``version(request)`` returns the fingerprint of
+        the data the request reads, or None to skip caching (e.g. invalid
+        parameters, which the view then reports). ``vary(request)``, if given,
+        returns anything else the response depends on, such as a format
+        negotiated from the Accept header. Only 200 responses are stored.
+
+        The decorated view gets a ``warm(request)`` attribute that runs the
+        view and stores its response if it is not cached yet, for prefetching.
+        """
+        def decorator(view):
+            def store(request, key, *args, **kwargs):
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200 or response.streaming:
+                    return response
+                if self.backend is not None:
+                    with span('cache'):
+                        self.backend.set(key, {
+                            'content_type': response['Content-Type'],
+                            'headers': {name: response[name] for name in CACHED_HEADERS if response.has_header(name)},
+                            'content': response.content,
+                        })
+                response['X-Cache'] = 'MISS'
+                return response
+
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                data_version = version(request) if request.method in ('GET', 'HEAD') else None
+                if data_version is None:
+                    return view(request, *args, **kwargs)
+
+                key = self.key(view.__name__, request.GET, data_version, vary(request) if vary else None)
+                etag = f'"{key}"'
+                client_etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+                if '*' in client_etags or etag in [tag.removeprefix('W/') for tag in client_etags]:
+                    response = HttpResponseNotModified()
+                    response['ETag'] = etag
+                    return response
+
+                entry = None
+                if self.backend is not None:
+                    with span('cache'):
+                        entry = self.backend.get(key)
+                if entry is not None:
+                    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+                    for name, value in entry['headers'].items():
+                        response[name] = value
+                    response['X-Cache'] = 'HIT'
+                else:
+                    response = store(request, key, *args, **kwargs)
+                    if response.status_code != 200 or response.streaming:
+                        return response
+
+                response['ETag'] = etag
+                # Stored by browsers but revalidated on every use
+                response['Cache-Control'] = 'no-cache'
+                return response
+
+            def warm(request, *args, **kwargs):
+                if self.backend is None:
+                    return
+                data_version = version(request)
+                if data_version is None:
+                    return
+                key = self.key(view.__name__, request.GET, data_version, vary(request) if vary else None)
+                if self.backend.get(key) is None:
+                    store(request, key, *args, **kwargs)
+
+            wrapper.warm = warm
+            return wrapper
+        return decorator
+
+
+def response_cache_from_env(cache_dir):
+    """
+    The ResponseCache configured by RESPONSE_CACHE: 'disk' (default, files
+    under ``cache_dir`` capped at RESPONSE_CACHE_MAX_MB), 'django' (the
+    RESPONSE_CACHE_ALIAS cache, 'default' unless set) or 'off' (ETags only).
+    """
+    kind = os.environ.get('RESPONSE_CACHE', 'disk')
+    if kind == 'django':
+        backend = DjangoResponseCache(os.environ.get('RESPONSE_CACHE_ALIAS', 'default'))
+    elif kind == 'off':
+        backend = None
+    else:
+        max_mb = float(os.environ.get('RESPONSE_CACHE_MAX_MB', DEFAULT_MAX_MB))
+        backend = DiskResponseCache(cache_dir, int(max_mb * 1024 * 1024))
+    return ResponseCache(backend)
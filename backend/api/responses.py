@@ -0,0 +1,59 @@
+from itertools import chain
+
+from django.http import HttpResponse, StreamingHttpResponse
+
+from .services.serialization import dumps, frame_arrow, pa
+
+# Arrow IPC streaming format, as registered with IANA
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+class FastJsonResponse(HttpResponse):
+    """JsonResponse counterpart encoded with services.serialization.dumps (orjson when available)."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class ArrowResponse(HttpResponse):
+    """A DataFrame as an Arrow IPC stream; ``metadata`` goes in the schema metadata."""
+
+    def __init__(self, df, metadata=None, **kwargs):
+        kwargs.setdefault('content_type', ARROW_CONTENT_TYPE)
+        super().__init__(content=frame_arrow(df, metadata), **kwargs)
+
+
+def arrow_available():
+    return pa is not None
+
+
+def response_format(request, default='json'):
+    """
+    The ``format`` query parameter if given, otherwise 'arrow' when the
+    Accept header lists the Arrow stream type, otherwise ``default``.
+    """
+    fmt = request.GET.get('format')
+    if fmt:
+        return fmt
+    if ARROW_CONTENT_TYPE in request.META.get('HTTP_ACCEPT', ''):
+        return 'arrow'
+    return default
+
+
+def ndjson_response(chunks):
+    """
+    A StreamingHttpResponse sending ``chunks`` (bytes, each one or more whole
+    NDJSON lines) as they are produced, or None if there are none. The first
+    chunk is produced here so an empty result can still get an error status.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return None
+    return StreamingHttpResponse(chain([first], chunks), content_type='application/x-ndjson')
+
+
+def ndjson_lines(items):
+    """One NDJSON chunk holding a line per item."""
+    return b''.join(dumps(item) + b'\n' for item in items)
@@ -1,84 +1,254 @@
-import pandas as pd
-import numpy as np
-
-class AssetBenchmark:
-    def __init__(self, all_data_df):
-        self.df = all_data_df.copy()
-        # Ensure price is numeric
-        self.df['accepted_price'] = pd.to_numeric(self.df['accepted_price'], errors='coerce')
-        self.df.dropna(subset=['accepted_price'], inplace=True)
-
-    def run_simulation(self, asset_type, capacity_mw, price_bid, price_offer):
-        # This is a simplified simulation based on the provided logic
-        
-        regional_results = {}
-        gsp_groups = self.df['gsp_group_id'].unique()
-
-        for gsp in gsp_groups:
-            regional_df = self.df[self.df['gsp_group_id'] == gsp]
-            
-            total_accepted_vol = 0
-            total_skipped_vol = 0
-            
-            # Group by each settlement period to run the logic
-            for (date, period), group in regional_df.groupby(['settlement_date', 'settlement_period']):
-                
-                # Offer simulation (asset sells energy)
-                if asset_type in ['offer', 'both'] and price_offer is not None:
-                    offers = group[group['total_volume_accepted'] > 0].copy()
-                    imbalance_req = offers['total_volume_accepted'].sum()
-                    
-                    if imbalance_req > 0:
-                        offers['is_hypothetical'] = False
-                        asset_row = pd.DataFrame([{'accepted_price': price_offer, 'total_volume_accepted': capacity_mw / 2, 'system_operator_flag': 0, 'is_hypothetical': True}])
-                        merit_stack = pd.concat([offers[['accepted_price', 'total_volume_accepted', 'system_operator_flag', 'is_hypothetical']], asset_row], ignore_index=True)
-                        merit_stack.sort_values(by='accepted_price', ascending=True, inplace=True)
-                        
-                        merit_stack['cumulative_vol'] = merit_stack['total_volume_accepted'].cumsum()
-                        in_merit_stack = merit_stack[merit_stack['cumulative_vol'] <= (imbalance_req + 0.0001)]
-                        
-                        if in_merit_stack['is_hypothetical'].any():
-                            energy_req = offers[offers['system_operator_flag'] == 0]['total_volume_accepted'].sum()
-                            
-                            asset_in_energy_stack = price_offer <= in_merit_stack[~in_merit_stack['is_hypothetical'] & (in_merit_stack['system_operator_flag'] == 0)]['accepted_price'].max()
-                            
-                            if pd.isna(asset_in_energy_stack) or asset_in_energy_stack:
-                                total_accepted_vol += (capacity_mw / 2)
-                            else:
-                                total_skipped_vol += (capacity_mw / 2)
-
-                # Bid simulation (asset buys energy)
-                if asset_type in ['bid', 'both'] and price_bid is not None:
-                    bids = group[group['total_volume_accepted'] < 0].copy()
-                    bids['total_volume_accepted'] = bids['total_volume_accepted'].abs() # Work with positive volumes
-                    imbalance_req = bids['total_volume_accepted'].sum()
-
-                    if imbalance_req > 0:
-                        bids['is_hypothetical'] = False
-                        asset_row = pd.DataFrame([{'accepted_price': price_bid, 'total_volume_accepted': capacity_mw / 2, 'system_operator_flag': 0, 'is_hypothetical': True}])
-                        merit_stack = pd.concat([bids[['accepted_price', 'total_volume_accepted', 'system_operator_flag', 'is_hypothetical']], asset_row], ignore_index=True)
-                        merit_stack.sort_values(by='accepted_price', ascending=False, inplace=True) # Descending for bids
-                        
-                        merit_stack['cumulative_vol'] = merit_stack['total_volume_accepted'].cumsum()
-                        in_merit_stack = merit_stack[merit_stack['cumulative_vol'] <= (imbalance_req + 0.0001)]
-
-                        if in_merit_stack['is_hypothetical'].any():
-                            asset_in_energy_stack = price_bid >= in_merit_stack[~in_merit_stack['is_hypothetical'] & (in_merit_stack['system_operator_flag'] == 0)]['accepted_price'].min()
-
-                            if pd.isna(asset_in_energy_stack) or asset_in_energy_stack:
-                                total_accepted_vol += (capacity_mw / 2)
-                            else:
-                                total_skipped_vol += (capacity_mw / 2)
-            
-            # Calculate final metrics for the GSP region
-            skip_rate = (total_skipped_vol / (total_accepted_vol + total_skipped_vol)) * 100 if (total_accepted_vol + total_skipped_vol) > 0 else 0
-            
-            regional_results[gsp] = {
-                'gsp_group_id': gsp,
-                'accepted_volume_mwh': total_accepted_vol,
-                'skipped_volume_mwh': total_skipped_vol,
-                'estimated_revenue': total_accepted_vol * (price_offer if asset_type == 'offer' else (price_bid if asset_type == 'bid' else ((price_offer + price_bid or 0)/2) )), # Simplified revenue
-                'skip_rate_percent': skip_rate
-            }
-
-        return list(regional_results.values()) 
\ No newline at end of file
+import os
+import pandas as pd
+import numpy as np
+from .merit_order import build_merit_stacks, count_periods
+from . import parallel_benchmark
+from .timing import span
+
+class AssetBenchmark:
+    def __init__(self, all_data_df, workers=None):
+        # GSP groups are simulated on a process pool when workers > 1
+        if workers is None:
+            workers = int(os.environ.get('ASSET_BENCHMARK_WORKERS', 1))
+        self.workers = max(1, workers)
+        self._shared = None
+
+        df = all_data_df
+        # Ensure price is numeric (rows from the BOA store already are)
+        if not pd.api.types.is_float_dtype(df['accepted_price']):
+            df = df.assign(accepted_price=pd.to_numeric(df['accepted_price'], errors='coerce'))
+        missing_price = df['accepted_price'].isna()
+        self.df = df[~missing_price] if missing_price.any() else df
+        self._stacks = None
+        self._index_parts = None
+        # Called with each GSP group id once its counts are done, e.g. for job progress
+        self.progress = None
+
+    @classmethod
+    def from_merit_indexes(cls, indexes, start_date, end_date, gsp_group_ids=None):
+        """
+        A benchmark over prebuilt MeritIndexes (one per year) restricted to an
+        inclusive date range, and optionally to some GSP groups; no BOA rows
+        are read or sorted. Only each group's slice of a year's stacks in the
+        range is evaluated, so it always runs in-process.
+        """
+        benchmark = cls.__new__(cls)
+        benchmark.workers = 1
+        benchmark._shared = None
+        benchmark.df = None
+        benchmark._stacks = None
+        benchmark.progress = None
+        benchmark._index_parts = []
+        gsps = set()
+        for index in indexes:
+            benchmark._index_parts.append((index, {side: index.gsp_parts(side, start_date, end_date, gsp_group_ids) for side in index.stacks}))
+            gsps.update(index.gsp_group_ids(start_date, end_date))
+        if gsp_group_ids is not None:
+            gsps &= set(gsp_group_ids)
+        benchmark._gsp_ids = pd.Index(sorted(gsps))
+        return benchmark
+
+    @property
+    def gsp_ids(self):
+        if self._index_parts is not None:
+            return self._gsp_ids
+        return self.stacks[0]
+
+    def _result_gsps(self):
+        # Results are listed by GSP group id, whichever store the rows came
+        # from (rows without a group, only read from CSV, come last)
+        if self._index_parts is not None:
+            return list(self._gsp_ids)
+        gsps = self.df['gsp_group_id'].unique()
+        known = sorted(gsp for gsp in gsps if not pd.isna(gsp))
+        return known + [gsp for gsp in gsps if pd.isna(gsp)][:1]
+
+    @property
+    def stacks(self):
+        # Offer/bid stacks don't depend on the asset, so they are sorted once and reused
+        if self._stacks is None:
+            with span('merit_stack'):
+                self._stacks = build_merit_stacks(self.df)
+        return self._stacks
+
+    def _count_sides(self, sides):
+        # {side: (accepted, skipped)} for each ``(side, capacities, prices)``.
+        # GSP groups are reported to ``progress`` as the last side counts them
+        if self.progress is None:
+            return {side: self._side_counts(side, capacities, prices) for side, capacities, prices in sides}
+
+        reported = set()
+
+        def gsp_done(code):
+            if code not in reported:
+                reported.add(code)
+                self.progress(self.gsp_ids[code])
+
+        counts = {}
+        for i, (side, capacities, prices) in enumerate(sides):
+            counts[side] = self._side_counts(side, capacities, prices, gsp_done if i == len(sides) - 1 else None)
+        # Groups with no stacks on the last side
+        for code in range(len(self.gsp_ids)):
+            gsp_done(code)
+        return counts
+
+    def _side_counts(self, side, capacities, prices, on_gsp=None):
+        # (capacity, price, gsp) accepted/skipped period counts for one side;
+        # ``on_gsp(code)`` is called as each GSP group's counts are done
+        if self._index_parts is not None:
+            return self._index_side_counts(side, capacities, prices, on_gsp)
+        gsp_ids, _, offer_stack, bid_stack = self.stacks
+        stack = offer_stack if side == 'offer' else bid_stack
+        with span('simulate'):
+            if self.workers == 1 or len(gsp_ids) < 2:
+                if on_gsp is None:
+                    return count_periods(stack, capacities, prices, len(gsp_ids))
+                return _counts_by_gsp(stack, capacities, prices, len(gsp_ids), on_gsp)
+
+            # Stacks go to shared memory once; each GSP group is its own task
+            if self._shared is None:
+                self._shared = parallel_benchmark.SharedStacks({'offer': offer_stack, 'bid': bid_stack})
+            return parallel_benchmark.side_counts(self._shared, side, stack, capacities, prices, len(gsp_ids), self.workers, on_gsp)
+
+    def _index_side_counts(self, side, capacities, prices, on_gsp=None):
+        shape = (len(capacities), len(prices), len(self._gsp_ids))
+        accepted = np.zeros(shape, dtype=np.int64)
+        skipped = np.zeros(shape, dtype=np.int64)
+        with span('simulate'):
+            for code, gsp in enumerate(self._gsp_ids):
+                for index, parts in self._index_parts:
+                    part = parts[side].get(gsp)
+                    if part is None:
+                        continue
+                    # Year indexes number their GSP groups independently; a
+                    # part only has stacks of this group
+                    part_accepted, part_skipped = count_periods(part, capacities, prices, len(index.gsp_ids))
+                    accepted[..., code] += part_accepted.sum(axis=-1)
+                    skipped[..., code] += part_skipped.sum(axis=-1)
+                if on_gsp is not None:
+                    on_gsp(code)
+        return accepted, skipped
+
+    def close(self):
+        """Release the shared memory used by the parallel mode."""
+        if self._shared is not None:
+            self._shared.close()
+            self._shared = None
+
+    def run_simulation(self, asset_type, capacity_mw, price_bid, price_offer):
+        # This is a simplified simulation based on the provided logic:
+        # each settlement period the asset offers/bids capacity_mw / 2 MWh at its
+        # price into that period's accepted stack for its GSP group. It counts as
+        # accepted when it falls within the accepted volume and is priced inside
+        # the energy (SO flag 0) part of the stack, and as skipped otherwise.
+        gsp_ids = self.gsp_ids
+        volume = capacity_mw / 2
+
+        accepted_periods = np.zeros(len(gsp_ids), dtype=np.int64)
+        skipped_periods = np.zeros(len(gsp_ids), dtype=np.int64)
+
+        sides = []
+        if asset_type in ['offer', 'both'] and price_offer is not None:
+            sides.append(('offer', price_offer))
+        if asset_type in ['bid', 'both'] and price_bid is not None:
+            sides.append(('bid', price_bid))
+
+        counts = self._count_sides([(side, [capacity_mw], [price]) for side, price in sides])
+        for side, _ in sides:
+            accepted, skipped = counts[side]
+            accepted_periods += accepted[0, 0]
+            skipped_periods += skipped[0, 0]
+
+        regional_results = {}
+        for gsp in self._result_gsps():
+            if pd.isna(gsp):
+                total_accepted_vol = total_skipped_vol = 0
+            else:
+                code = gsp_ids.get_loc(gsp)
+                total_accepted_vol = float(accepted_periods[code] * volume)
+                total_skipped_vol = float(skipped_periods[code] * volume)
+
+            # Calculate final metrics for the GSP region
+            skip_rate = (total_skipped_vol / (total_accepted_vol + total_skipped_vol)) * 100 if (total_accepted_vol + total_skipped_vol) > 0 else 0
+
+            regional_results[gsp] = {
+                'gsp_group_id': gsp,
+                'accepted_volume_mwh': total_accepted_vol,
+                'skipped_volume_mwh': total_skipped_vol,
+                'estimated_revenue': total_accepted_vol * (price_offer if asset_type == 'offer' else (price_bid if asset_type == 'bid' else ((price_offer + price_bid or 0)/2) )), # Simplified revenue
+                'skip_rate_percent': skip_rate
+            }
+
+        return list(regional_results.values())
+
+    def run_sweep(self, asset_type, capacities_mw, prices_bid=None, prices_offer=None):
+        """
+        Run the simulation for every combination of capacity, bid price and
+        offer price in one pass over the stacks.
+
+        Each price is placed in every stack once and then evaluated at every
+        capacity. The offer and bid sides are independent, so they are counted
+        separately and summed. Result arrays are indexed
+        ``[capacity][price_bid][price_offer]``. The axis for a side that is not
+        simulated has a single ``None`` entry.
+        """
+        gsp_ids = self.gsp_ids
+        capacities = [float(c) for c in capacities_mw]
+        bid_axis = list(prices_bid) if asset_type in ['bid', 'both'] and prices_bid else [None]
+        offer_axis = list(prices_offer) if asset_type in ['offer', 'both'] and prices_offer else [None]
+
+        counts = self._count_sides([('offer', capacities, offer_axis), ('bid', capacities, bid_axis)])
+        offer_acc, offer_skip = counts['offer']
+        bid_acc, bid_skip = counts['bid']
+
+        # (capacity, price_bid, price_offer, gsp) period counts
+        accepted_periods = bid_acc[:, :, None, :] + offer_acc[:, None, :, :]
+        skipped_periods = bid_skip[:, :, None, :] + offer_skip[:, None, :, :]
+        volume = np.asarray(capacities)[:, None, None, None] / 2
+        accepted_vol = accepted_periods * volume
+        skipped_vol = skipped_periods * volume
+        total_vol = accepted_vol + skipped_vol
+        skip_rate = np.divide(skipped_vol * 100, total_vol, out=np.zeros_like(total_vol), where=total_vol > 0)
+
+        # Same simplified revenue price as run_simulation, per grid cell
+        bid_prices = np.array([np.nan if p is None else p for p in bid_axis], dtype=np.float64)[None, :, None]
+        offer_prices = np.array([np.nan if p is None else p for p in offer_axis], dtype=np.float64)[None, None, :]
+        if asset_type == 'offer':
+            revenue_price = np.broadcast_to(offer_prices, accepted_vol.shape[:3])
+        elif asset_type == 'bid':
+            revenue_price = np.broadcast_to(bid_prices, accepted_vol.shape[:3])
+        else:
+            revenue_price = np.nan_to_num((offer_prices + bid_prices) / 2)
+        revenue = accepted_vol * revenue_price[..., None]
+
+        results = []
+        for gsp in self._result_gsps():
+            if pd.isna(gsp):
+                continue
+            code = gsp_ids.get_loc(gsp)
+            results.append({
+                'gsp_group_id': gsp,
+                'accepted_volume_mwh': accepted_vol[..., code].tolist(),
+                'skipped_volume_mwh': skipped_vol[..., code].tolist(),
+                'estimated_revenue': revenue[..., code].tolist(),
+                'skip_rate_percent': skip_rate[..., code].tolist(),
+            })
+
+        return {
+            'capacity_mw': capacities,
+            'price_bid': bid_axis,
+            'price_offer': offer_axis,
+            'results': results,
+        }
+
+
+def _counts_by_gsp(stack, capacities, prices, n_gsp, on_gsp):
+    # count_periods one GSP group at a time, reporting each as it finishes
+    accepted = np.zeros((len(capacities), len(prices), n_gsp), dtype=np.int64)
+    skipped = np.zeros_like(accepted)
+    for first, last in parallel_benchmark.gsp_parts(stack, n_gsp):
+        part_accepted, part_skipped = count_periods(stack.part(first, last), capacities, prices, n_gsp)
+        accepted += part_accepted
+        skipped += part_skipped
+        on_gsp(int(stack.stack_gsp[first]))
+    return accepted, skipped
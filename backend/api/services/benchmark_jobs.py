@@ -0,0 +1,52 @@
+from datetime import datetime
+
+# Asset benchmark runs for the job queue. A job builds one benchmark for its
+# range (over the merit indexes, or the BOA rows with their stacks sorted
+# once and, with ASSET_BENCHMARK_WORKERS > 1, shared with the worker pool)
+# and reports progress as each GSP group's counts finish.
+
+
+def _benchmark(data_processor, params):
+    start_date = datetime.strptime(params['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(params['end_date'], '%Y-%m-%d')
+    benchmark = data_processor.simulation_benchmark(start_date, end_date, build_index=True)
+    if benchmark is None:
+        raise ValueError('No data available for the selected date range')
+    return benchmark
+
+
+def _run(kind, data_processor, params, progress):
+    benchmark = _benchmark(data_processor, params)
+    total = len(benchmark.gsp_ids)
+    completed = []
+
+    def gsp_done(gsp):
+        completed.append(gsp)
+        progress(len(completed), total, gsp)
+
+    progress(0, total)
+    benchmark.progress = gsp_done
+    try:
+        if kind == 'simulation':
+            return benchmark.run_simulation(
+                params['asset_type'], params['capacity_mw'], params['price_bid'], params['price_offer'])
+        return benchmark.run_sweep(
+            params['asset_type'], params['capacity_mw'], params['price_bid'], params['price_offer'])
+    finally:
+        benchmark.close()
+
+
+def run_simulation_job(data_processor, params, progress):
+    """AssetBenchmark.run_simulation for ``params``, with progress per GSP group."""
+    return _run('simulation', data_processor, params, progress)
+
+
+def run_sweep_job(data_processor, params, progress):
+    """AssetBenchmark.run_sweep for ``params``, with progress per GSP group."""
+    return _run('sweep', data_processor, params, progress)
+
+
+JOB_KINDS = {
+    'simulation': run_simulation_job,
+    'sweep': run_sweep_job,
+}
@@ -0,0 +1,151 @@
+import json
+import os
+import glob
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+from .core_store import _atomic_write_text, _current_version, _new_version, _publish_version, _to_date
+
+# The processed BOA columns the asset benchmark reads, with compact dtypes.
+# Prices and volumes stay float64: the merit-order engine compares prices for
+# equality with the asset's price and volumes against a 0.0001 MWh tolerance,
+# which float32 rounding of the CSV decimals would change.
+BOA_DTYPES = {
+    'settlement_date': 'category',
+    'settlement_period': 'int8',
+    'gsp_group_id': 'category',
+    'total_volume_accepted': 'float64',
+    'system_operator_flag': 'int8',
+    'accepted_price': 'float64',
+}
+BOA_COLUMNS = list(BOA_DTYPES)
+
+
+class BoaStore:
+    """
+    Simulation input store: processed BOA rows in uncompressed Arrow IPC files,
+    ``boa/{year}/{version}/{month:02d}/{gsp_group_id}.arrow``, that are
+    memory-mapped when read. Each file keeps the row order of the processed
+    CSV, so rows of equal price stay in the order the merit-order engine has
+    always seen. ``boa/{year}/CURRENT`` names the live version; a rebuild
+    writes a new one and repoints it, so the year never goes missing.
+
+    A year is rebuilt when the size or modification time of its processed CSV
+    differs from the ones recorded in the live version's ``_SOURCE``.
+    """
+
+    def __init__(self, data_dir):
+        self.boa_dir = os.path.join(data_dir, 'boa')
+
+    @property
+    def available(self):
+        return pa is not None
+
+    def year_dir(self, year):
+        return os.path.join(self.boa_dir, str(year))
+
+    def version_dir(self, year):
+        return _current_version(self.year_dir(year))
+
+    @staticmethod
+    def source_signature(processed_file):
+        stat = os.stat(processed_file)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def is_current(self, year, processed_file):
+        version = self.version_dir(year)
+        if version is None:
+            return False
+        with open(os.path.join(version, '_SOURCE')) as f:
+            return json.load(f) == self.source_signature(processed_file)
+
+    def build(self, year, processed_file):
+        """Partition a processed BOA CSV into per-month, per-GSP Arrow files."""
+        signature = self.source_signature(processed_file)
+        df = pd.read_csv(processed_file, usecols=BOA_COLUMNS, dtype={
+            **BOA_DTYPES,
+            # Coerced below; the CSV can hold blanks here
+            'system_operator_flag': 'float32',
+            'accepted_price': 'object',
+        })
+        df['accepted_price'] = pd.to_numeric(df['accepted_price'], errors='coerce')
+        df = df.dropna(subset=['accepted_price', 'gsp_group_id'])
+        # A missing flag never counts as energy (flag 0), as before
+        df['system_operator_flag'] = df['system_operator_flag'].fillna(-1).astype('int8')
+
+        dates = df['settlement_date'].cat.categories
+        months = pd.to_datetime(pd.Series(dates)).dt.month.to_numpy()[df['settlement_date'].cat.codes]
+        df['settlement_date'] = pd.to_datetime(df['settlement_date'].astype(str)).dt.date
+
+        # Written as a new version and published once complete, so readers never see a partial year
+        version = _new_version(self.year_dir(year))
+        for (month, gsp), part in df.groupby([months, df['gsp_group_id']], sort=True, observed=True):
+            os.makedirs(os.path.join(version, f'{month:02d}'), exist_ok=True)
+            table = pa.Table.from_pandas(part, schema=self._schema(), preserve_index=False)
+            with pa.OSFile(os.path.join(version, f'{month:02d}', f'{gsp}.arrow'), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        _atomic_write_text(os.path.join(version, '_SOURCE'), json.dumps(signature))
+
+        _publish_version(self.year_dir(year), version)
+
+    @staticmethod
+    def _schema():
+        return pa.schema([
+            pa.field('settlement_date', pa.date32()),
+            pa.field('settlement_period', pa.int8()),
+            pa.field('gsp_group_id', pa.dictionary(pa.int8(), pa.string())),
+            pa.field('total_volume_accepted', pa.float64()),
+            pa.field('system_operator_flag', pa.int8()),
+            pa.field('accepted_price', pa.float64()),
+        ])
+
+    def _month_dirs(self, start_date, end_date):
+        for year in range(start_date.year, end_date.year + 1):
+            version = self.version_dir(year)
+            if version is None:
+                continue
+            first_month = start_date.month if year == start_date.year else 1
+            last_month = end_date.month if year == end_date.year else 12
+            for month in range(first_month, last_month + 1):
+                yield os.path.join(version, f'{month:02d}')
+
+    def gsp_group_ids(self, start_date, end_date):
+        """Sorted GSP groups with rows stored in the months of a date range."""
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        gsps = set()
+        for month_dir in self._month_dirs(start_date, end_date):
+            for path in glob.glob(os.path.join(month_dir, '*.arrow')):
+                gsps.add(os.path.splitext(os.path.basename(path))[0])
+        return sorted(gsps)
+
+    def read_range(self, start_date, end_date, gsp_group_ids=None):
+        """
+        Rows with ``start_date <= settlement_date <= end_date``, optionally
+        only for some GSP groups, with settlement_date as datetime64 and
+        gsp_group_id categorical. Returns None when nothing is stored.
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        tables = []
+        for month_dir in self._month_dirs(start_date, end_date):
+            for path in sorted(glob.glob(os.path.join(month_dir, '*.arrow'))):
+                gsp = os.path.splitext(os.path.basename(path))[0]
+                if gsp_group_ids is None or gsp in gsp_group_ids:
+                    tables.append(pa.ipc.open_file(pa.memory_map(path)).read_all())
+        if not tables:
+            return None
+
+        table = pa.concat_tables(tables)
+        dates = table['settlement_date']
+        mask = pc.and_(pc.greater_equal(dates, pa.scalar(start_date, pa.date32())),
+                       pc.less_equal(dates, pa.scalar(end_date, pa.date32())))
+        df = table.filter(mask).to_pandas(split_blocks=True, date_as_object=False)
+        df['settlement_date'] = df['settlement_date'].astype('datetime64[ns]')
+        return df
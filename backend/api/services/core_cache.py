@@ -0,0 +1,229 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from .core_store import TABLE_KEYS, _tmp_path, _to_date
+
+DEFAULT_MAX_MB = 512
+
+
+class CachedYear:
+    """
+    A loaded year of one table, sorted by key, with a settlement_date -> rows
+    index. A year read from a snapshot (``shared=True``) is already sorted and
+    its numeric columns are read-only views of the memory-mapped file, so
+    only its other columns count towards the cache size.
+    """
+
+    def __init__(self, year, df, signature, table='core', shared=False):
+        self.year = year
+        self.table = table
+        self.signature = signature
+        self.shared = shared
+        if shared:
+            self.df = df
+        else:
+            self.df = df.sort_values(TABLE_KEYS[table], kind='stable').reset_index(drop=True)
+        self.dates = self.df['settlement_date'].to_numpy(dtype=object)
+        if shared:
+            private = self.df.select_dtypes(exclude='number')
+            self.nbytes = int(private.memory_usage(deep=True).sum())
+        else:
+            self.nbytes = int(self.df.memory_usage(deep=True).sum())
+
+        # Rows for each date are contiguous after sorting, so store (start, stop)
+        self.date_index = {}
+        if len(self.dates):
+            starts = np.r_[0, np.flatnonzero(self.dates[1:] != self.dates[:-1]) + 1]
+            stops = np.r_[starts[1:], len(self.dates)]
+            for start, stop in zip(starts, stops):
+                self.date_index[self.dates[start]] = (int(start), int(stop))
+
+    def day(self, date_str, columns=None):
+        start, stop = self.date_index.get(date_str, (0, 0))
+        df = self.df if columns is None else self.df[columns]
+        return df.iloc[start:stop].copy()
+
+    def range(self, start_str, end_str, columns=None):
+        # ISO date strings sort chronologically, so binary search the sorted column
+        start = np.searchsorted(self.dates, start_str, side='left')
+        stop = np.searchsorted(self.dates, end_str, side='right')
+        df = self.df if columns is None else self.df[columns]
+        return df.iloc[start:stop].copy()
+
+
+class CoreDataCache:
+    """
+    Process-wide cache of whole core years, keyed by ``(table, year)`` so the
+    rollup tables are cached alongside the per-period rows.
+
+    Years are reloaded when the modification times of their files change and
+    evicted least-recently-used first once ``max_bytes`` is exceeded (the most
+    recent year is always kept). ``CORE_CACHE_MAX_MB=0`` disables caching.
+
+    A year with a current snapshot in ``snapshot_dir`` (an uncompressed Arrow
+    file of the sorted year, written by ``write_snapshot``) is memory-mapped
+    from it instead of being read and sorted, so every process reading it
+    shares one copy of its pages.
+    """
+
+    def __init__(self, core_store, max_bytes=None, snapshot_dir=None):
+        self.core_store = core_store
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('CORE_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        if snapshot_dir is None:
+            snapshot_dir = os.environ.get('CORE_SNAPSHOT_DIR') or os.path.join(core_store.core_data_dir, '_snapshots')
+        self.snapshot_dir = snapshot_dir
+        self._years = OrderedDict()
+        self._lock = threading.Lock()
+        # A fork while another thread holds the lock would leave it held in the child
+        os.register_at_fork(after_in_child=self._reset_lock)
+
+    def _reset_lock(self):
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self._years.values())
+
+    def signature(self, year, table='core'):
+        """Modification times of the files backing a year, or None if absent."""
+        if self.core_store.has_parquet(year, table):
+            paths = self.core_store.month_files(year, table)
+        elif os.path.exists(self.core_store.csv_path(year, table)):
+            paths = [self.core_store.csv_path(year, table)]
+        else:
+            return None
+        return tuple((path, os.stat(path).st_mtime_ns) for path in paths)
+
+    def get_year(self, year, table='core'):
+        signature = self.signature(year, table)
+        if signature is None:
+            return None
+
+        key = (table, year)
+        with self._lock:
+            entry = self._years.get(key)
+            if entry is not None and entry.signature == signature:
+                self._years.move_to_end(key)
+                return entry
+
+        entry = self._load_snapshot(year, table, signature)
+        if entry is None:
+            df = self.core_store.read_year(year, table=table)
+            if df is None:
+                return None
+            entry = CachedYear(year, df, signature, table)
+        if self.max_bytes <= 0:
+            return entry
+
+        with self._lock:
+            self._years[key] = entry
+            self._years.move_to_end(key)
+            while len(self._years) > 1 and self.nbytes > self.max_bytes:
+                self._years.popitem(last=False)
+        return entry
+
+    def snapshot_path(self, year, table='core'):
+        return os.path.join(self.snapshot_dir, f'{table}_{year}.arrow')
+
+    def snapshot_is_current(self, year, table='core'):
+        signature = self.signature(year, table)
+        return pa is not None and signature is not None and self._snapshot_signature(year, table) == signature
+
+    def _snapshot_signature(self, year, table):
+        try:
+            with pa.memory_map(self.snapshot_path(year, table)) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        if b'signature' not in metadata:
+            return None
+        return tuple(tuple(item) for item in json.loads(metadata[b'signature']))
+
+    def write_snapshot(self, year, table='core'):
+        """Write the sorted year to its snapshot file. Returns False if the year has no data."""
+        entry = self.get_year(year, table)
+        if entry is None:
+            return False
+        table_data = pa.Table.from_pandas(entry.df, preserve_index=False)
+        table_data = table_data.replace_schema_metadata({
+            **(table_data.schema.metadata or {}),
+            'signature': json.dumps(entry.signature),
+        })
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = self.snapshot_path(year, table)
+        tmp_path = _tmp_path(path)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table_data.schema) as writer:
+                writer.write_table(table_data)
+        os.replace(tmp_path, path)
+        return True
+
+    def _load_snapshot(self, year, table, signature):
+        if pa is None or self._snapshot_signature(year, table) != signature:
+            return None
+        table_data = pa.ipc.open_file(pa.memory_map(self.snapshot_path(year, table))).read_all()
+        # split_blocks keeps each numeric column a zero-copy view of the mapping
+        df = table_data.to_pandas(split_blocks=True)
+        return CachedYear(year, df, signature, table, shared=True)
+
+    def get_day(self, date, columns=None, table='core'):
+        date = _to_date(date)
+        entry = self.get_year(date.year, table)
+        if entry is None:
+            return None
+        return entry.day(date.strftime('%Y-%m-%d'), columns=columns)
+
+    def get_range(self, start_date, end_date, columns=None, table='core'):
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        start_str, end_str = start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        frames = []
+        for year in range(start_date.year, end_date.year + 1):
+            entry = self.get_year(year, table)
+            if entry is not None:
+                frames.append(entry.range(start_str, end_str, columns=columns))
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def evict(self, year, table='core'):
+        with self._lock:
+            self._years.pop((table, year), None)
+
+    def clear(self):
+        with self._lock:
+            self._years.clear()
+
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def _reset_shared_lock():
+    global _shared_lock
+    _shared_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_shared_lock)
+
+
+def shared_core_cache(core_store):
+    """The cache shared by every DataProcessor reading the same core directory."""
+    key = os.path.abspath(core_store.core_data_dir)
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = CoreDataCache(core_store)
+            _shared_caches[key] = cache
+        return cache
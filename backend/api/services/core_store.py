@@ -0,0 +1,329 @@
+import json
+import os
+import glob
+import shutil
+import threading
+import time
+from datetime import date as date_cls, datetime
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from .fuel_mix import upgrade_legacy_mixes
+
+KEY_COLUMNS = ['settlement_date', 'settlement_period', 'gsp_group_id']
+
+# Sort keys of every table kept alongside the per-period core rows; the
+# rollups are materialised at build time by DataProcessor.build_rollups
+TABLE_KEYS = {
+    'core': KEY_COLUMNS,
+    'hourly': ['settlement_date', 'gsp_group_id', 'hour'],
+    'daily': ['settlement_date', 'gsp_group_id'],
+    'hourly_national': ['settlement_date', 'hour'],
+    'daily_national': ['settlement_date'],
+    'national': ['settlement_date', 'settlement_period'],
+}
+ROLLUP_TABLES = ['hourly', 'daily', 'hourly_national', 'daily_national', 'national']
+
+
+def _to_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date_cls):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _tmp_path(path):
+    # Unique per process and thread, so concurrent writers of the same file
+    # never rename each other's half-written copy into place
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def _new_version(path):
+    # A fresh, empty version directory inside ``path``, published with
+    # _publish_version once fully written. Names sort by creation time.
+    version = os.path.join(path, f'v{time.time_ns()}-{os.getpid()}-{threading.get_ident()}')
+    os.makedirs(version)
+    return version
+
+
+def _current_version(path):
+    """The published version directory of ``path``, or None if none is."""
+    try:
+        with open(os.path.join(path, 'CURRENT')) as f:
+            return os.path.join(path, f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def _publish_version(path, version):
+    # Point ``path``'s CURRENT file at ``version`` in one atomic rename, so
+    # readers always find a complete directory. The version it replaces is
+    # kept for readers still inside it; older ones, and files of the
+    # unversioned layout, are removed. Versions newer than the replaced one
+    # may still be being written by a concurrent builder and are left alone.
+    previous = _current_version(path)
+    _atomic_write_text(os.path.join(path, 'CURRENT'), os.path.basename(version))
+    keep = {os.path.basename(version), 'CURRENT'}
+    if previous is not None:
+        keep.add(os.path.basename(previous))
+    for name in os.listdir(path):
+        if name in keep or name.endswith('.tmp'):
+            continue
+        if name.startswith('v') and (previous is None or name > os.path.basename(previous)):
+            continue
+        entry = os.path.join(path, name)
+        if os.path.isdir(entry):
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+
+def _atomic_write_text(path, text):
+    tmp_path = _tmp_path(path)
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class CoreStore:
+    """
+    Storage backend for the per-year core data tables.
+
+    Parquet layout is ``core/core_data_{year}/{month:02d}.parquet`` with one row
+    group per settlement date, so a one-day lookup opens a single month file and
+    only decodes the row group whose statistics match. The original
+    ``core_data_{year}.csv`` files are still read (and written when pyarrow is
+    not installed or ``CORE_DATA_FORMAT=csv``).
+
+    Rollup tables (see ``TABLE_KEYS``) use the same layout in a subdirectory,
+    ``core_data_{year}/{table}/{month:02d}.parquet``, or ``{table}_{year}.csv``.
+    """
+
+    def __init__(self, core_data_dir, storage_format=None):
+        self.core_data_dir = core_data_dir
+        if storage_format is None:
+            storage_format = os.environ.get('CORE_DATA_FORMAT', 'parquet')
+        if storage_format == 'parquet' and pq is None:
+            storage_format = 'csv'
+        self.storage_format = storage_format
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+    def csv_path(self, year, table='core'):
+        if table == 'core':
+            return os.path.join(self.core_data_dir, f'core_data_{year}.csv')
+        return os.path.join(self.core_data_dir, f'{table}_{year}.csv')
+
+    def parquet_dir(self, year, table='core'):
+        year_dir = os.path.join(self.core_data_dir, f'core_data_{year}')
+        return year_dir if table == 'core' else os.path.join(year_dir, table)
+
+    def month_path(self, year, month, table='core'):
+        return os.path.join(self.parquet_dir(year, table), f'{month:02d}.parquet')
+
+    def month_files(self, year, table='core'):
+        return sorted(glob.glob(os.path.join(self.parquet_dir(year, table), '[0-9][0-9].parquet')))
+
+    def complete_path(self, year):
+        return os.path.join(self.parquet_dir(year), '_COMPLETE')
+
+    def state_path(self, year):
+        return os.path.join(self.core_data_dir, f'core_data_{year}.state.json')
+
+    def has_parquet(self, year, table='core'):
+        return pq is not None and len(self.month_files(year, table)) > 0
+
+    def has_month(self, year, month, table='core'):
+        return os.path.exists(self.month_path(year, month, table))
+
+    def exists(self, year, table='core'):
+        return self.has_parquet(year, table) or os.path.exists(self.csv_path(year, table))
+
+    def is_complete(self, year):
+        """True once every month of a year has been written (CSV files are written whole)."""
+        if pq is not None and os.path.exists(self.complete_path(year)):
+            return True
+        return os.path.exists(self.csv_path(year))
+
+    def mark_complete(self, year):
+        os.makedirs(self.parquet_dir(year), exist_ok=True)
+        months = [int(os.path.basename(path)[:2]) for path in self.month_files(year)]
+        _atomic_write_text(self.complete_path(year), json.dumps({'months': months}))
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def write(self, year, core_data, table='core'):
+        if self.storage_format == 'parquet':
+            self.write_parquet(year, core_data, table)
+            if table == 'core':
+                self.mark_complete(year)
+        else:
+            tmp_path = _tmp_path(self.csv_path(year, table))
+            core_data.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.csv_path(year, table))
+
+    def write_parquet(self, year, core_data, table='core'):
+        table_df = self._to_storage_frame(core_data)
+        months = table_df['settlement_date'].map(lambda d: d.month)
+        for month, month_df in table_df.groupby(months, sort=True):
+            self._write_month_file(year, month, month_df, table)
+
+    def write_month(self, year, month, core_data, table='core'):
+        """Write the rows of one month (as produced by DataProcessor)."""
+        return self._write_month_file(year, month, self._to_storage_frame(core_data), table)
+
+    def _write_month_file(self, year, month, month_df, table='core'):
+        # One row group per settlement date; written to a temp file and renamed
+        # into place so a crash never leaves a truncated month behind
+        os.makedirs(self.parquet_dir(year, table), exist_ok=True)
+        month_df = month_df.sort_values(TABLE_KEYS[table], kind='stable')
+        arrow_table = pa.Table.from_pandas(month_df, schema=self._schema(month_df), preserve_index=False)
+        dates = month_df['settlement_date'].to_numpy()
+        # Boundaries of each run of equal dates within the sorted table
+        starts = [0] + list(np.flatnonzero(dates[1:] != dates[:-1]) + 1) + [len(dates)]
+        path = self.month_path(year, month, table)
+        tmp_path = _tmp_path(path)
+        with pq.ParquetWriter(tmp_path, arrow_table.schema) as writer:
+            for start, end in zip(starts[:-1], starts[1:]):
+                writer.write_table(arrow_table.slice(start, end - start))
+        os.replace(tmp_path, path)
+        return path
+
+    def replace_dates(self, year, core_data, table='core'):
+        """
+        Write the rows of ``core_data`` in place of the stored rows of every
+        settlement date it covers, adding dates the year doesn't have yet.
+        """
+        new_df = core_data.copy()
+        new_dates = pd.to_datetime(new_df['settlement_date']).dt.strftime('%Y-%m-%d')
+
+        def merged(existing, new_rows):
+            existing_dates = pd.to_datetime(existing['settlement_date']).dt.strftime('%Y-%m-%d')
+            kept = existing[~existing_dates.isin(set(new_dates))]
+            return pd.concat([kept, new_rows], ignore_index=True)
+
+        if self.storage_format == 'parquet' and self.has_parquet(year):
+            months = pd.to_datetime(new_df['settlement_date']).dt.month
+            for month, month_df in new_df.groupby(months, sort=True):
+                if self.has_month(year, month, table):
+                    month_df = merged(self._read_parquet([self.month_path(year, month, table)]), month_df)
+                self.write_month(year, month, month_df, table)
+            if table == 'core':
+                self.mark_complete(year)
+        else:
+            path = self.csv_path(year, table)
+            combined = merged(upgrade_legacy_mixes(pd.read_csv(path)), new_df) if os.path.exists(path) else new_df
+            self.write(year, combined.sort_values(TABLE_KEYS[table], ignore_index=True), table)
+
+    def read_state(self, year):
+        """Incremental build state for a year (see DataProcessor.update_core_data)."""
+        if not os.path.exists(self.state_path(year)):
+            return None
+        with open(self.state_path(year)) as f:
+            return json.load(f)
+
+    def write_state(self, year, state):
+        _atomic_write_text(self.state_path(year), json.dumps(state))
+
+    def last_settlement_date(self, year):
+        df = self.read_year(year, columns=['settlement_date'])
+        if df is None or df.empty:
+            return None
+        return str(df['settlement_date'].max())
+
+    def convert_csv(self, year):
+        """Build the parquet files for a year from an existing core CSV."""
+        if self.storage_format != 'parquet' or self.has_parquet(year) or not os.path.exists(self.csv_path(year)):
+            return False
+        df = pd.read_csv(self.csv_path(year))
+        self.write_parquet(year, df)
+        self.mark_complete(year)
+        return True
+
+    def _to_storage_frame(self, core_data):
+        df = upgrade_legacy_mixes(core_data).copy()
+        df['settlement_date'] = pd.to_datetime(df['settlement_date']).dt.date
+        if 'settlement_period' in df.columns:
+            df['settlement_period'] = df['settlement_period'].astype('int16')
+        return df
+
+    @staticmethod
+    def _schema(df):
+        fields = []
+        for col in df.columns:
+            if col == 'settlement_date':
+                fields.append(pa.field(col, pa.date32()))
+            elif col == 'settlement_period':
+                fields.append(pa.field(col, pa.int16()))
+            elif col == 'gsp_group_id':
+                fields.append(pa.field(col, pa.string()))
+            elif pd.api.types.is_integer_dtype(df[col]):
+                fields.append(pa.field(col, pa.int64()))
+            else:
+                fields.append(pa.field(col, pa.float64()))
+        return pa.schema(fields)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def read_year(self, year, columns=None, table='core'):
+        if self.has_parquet(year, table):
+            return self._read_parquet(self.month_files(year, table), columns=columns)
+        if os.path.exists(self.csv_path(year, table)):
+            return upgrade_legacy_mixes(pd.read_csv(self.csv_path(year, table), usecols=columns))
+        return None
+
+    def read_day(self, date, columns=None, table='core'):
+        return self.read_range(date, date, columns=columns, table=table)
+
+    def read_range(self, start_date, end_date, columns=None, table='core'):
+        """
+        Rows with ``start_date <= settlement_date <= end_date`` (inclusive),
+        with settlement_date as ``YYYY-MM-DD`` strings like the CSV files.
+        Returns None when no year in the range has core data.
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        if columns is not None and 'settlement_date' not in columns:
+            columns = ['settlement_date'] + list(columns)
+
+        frames = []
+        for year in range(start_date.year, end_date.year + 1):
+            if self.has_parquet(year, table):
+                first_month = start_date.month if year == start_date.year else 1
+                last_month = end_date.month if year == end_date.year else 12
+                paths = [self.month_path(year, m, table) for m in range(first_month, last_month + 1)]
+                paths = [p for p in paths if os.path.exists(p)]
+                filters = [('settlement_date', '>=', start_date), ('settlement_date', '<=', end_date)]
+                frames.append(self._read_parquet(paths, columns=columns, filters=filters))
+            elif os.path.exists(self.csv_path(year, table)):
+                df = pd.read_csv(self.csv_path(year, table), usecols=columns)
+                dates = pd.to_datetime(df['settlement_date']).dt.date
+                frames.append(df[(dates >= start_date) & (dates <= end_date)])
+
+        if not frames:
+            return None
+        return upgrade_legacy_mixes(pd.concat(frames, ignore_index=True))
+
+    def _read_parquet(self, paths, columns=None, filters=None):
+        tables = [pq.read_table(path, columns=columns, filters=filters) for path in paths]
+        if not tables:
+            schema_cols = columns or []
+            return pd.DataFrame(columns=schema_cols)
+        df = pa.concat_tables(tables).to_pandas()
+        if 'settlement_date' in df.columns:
+            df['settlement_date'] = pd.to_datetime(df['settlement_date']).dt.strftime('%Y-%m-%d')
+        return upgrade_legacy_mixes(df)
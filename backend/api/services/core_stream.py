@@ -0,0 +1,134 @@
+import pandas as pd
+
+from .fuel_mix import ALL_MIX_COLUMNS, mix_matrix, normalise_fuel_types
+
+KEYS = ['settlement_date', 'settlement_period', 'gsp_group_id']
+
+# Narrow dtypes for the processed BOA columns the core build reads
+PROCESSED_DTYPES = {
+    'settlement_date': 'category',
+    'settlement_period': 'int8',
+    'gsp_group_id': 'category',
+    'bmu_fuel_type': 'category',
+    'total_volume_accepted': 'float64',
+    'balancing_cost': 'float64',
+    'system_operator_flag': 'float32',
+}
+PROCESSED_COLUMNS = list(PROCESSED_DTYPES) + ['acceptance_id']
+
+# Partial results are folded together once this many have been collected
+COMPACT_EVERY = 8
+
+
+def _plain_index(frame):
+    # Categorical levels differ between chunks; use plain values so partials align
+    frame = frame.reset_index()
+    for col in frame.columns:
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            frame[col] = frame[col].astype(frame[col].cat.categories.dtype)
+    return frame
+
+
+class MonthAccumulator:
+    """
+    Running core aggregates for one month of processed BOA rows.
+
+    The sums and fuel mixes are folded to one row per key (and fuel) as they
+    are compacted, so they grow with the month's keys. boas_count needs the
+    distinct acceptance IDs of each key, and one key's rows can be spread
+    over several chunks, so the distinct ``(key, acceptance_id)`` pairs of
+    the whole month are kept until finish(): that part grows with the
+    month's acceptances, not with the chunk size.
+    """
+
+    def __init__(self):
+        self.sums = []
+        self.mixes = []
+        self.acceptances = []
+
+    def add(self, chunk):
+        volume = chunk['total_volume_accepted']
+        parts = pd.DataFrame({
+            'net_volume': volume,
+            'bids_count': (volume < 0).astype('int64'),
+            'offers_count': (volume > 0).astype('int64'),
+            'balancing_cost': chunk['balancing_cost'],
+            'system_volume': volume.where(chunk['system_operator_flag'] == 1, 0.0),
+        })
+        parts[KEYS] = chunk[KEYS]
+        self.sums.append(_plain_index(parts.groupby(KEYS, observed=True).sum()))
+
+        side = pd.Series('generation_mix', index=chunk.index).where(volume > 0, 'consumption_mix')
+        mix_rows = chunk.loc[volume != 0, KEYS + ['bmu_fuel_type', 'total_volume_accepted']]
+        mix_rows = mix_rows.assign(
+            side=side[volume != 0],
+            bmu_fuel_type=normalise_fuel_types(mix_rows['bmu_fuel_type'].astype(object)),
+        )
+        self.mixes.append(_plain_index(
+            mix_rows.groupby(KEYS + ['side', 'bmu_fuel_type'], observed=True)['total_volume_accepted'].sum()
+        ))
+
+        ids = chunk[KEYS + ['acceptance_id']].dropna(subset=['acceptance_id'])
+        self.acceptances.append(_plain_index(ids.set_index(KEYS)).drop_duplicates())
+
+        if len(self.sums) >= COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        if self.sums:
+            self.sums = [pd.concat(self.sums, ignore_index=True).groupby(KEYS, as_index=False).sum()]
+        if self.mixes:
+            mix_keys = KEYS + ['side', 'bmu_fuel_type']
+            self.mixes = [pd.concat(self.mixes, ignore_index=True).groupby(mix_keys, as_index=False).sum()]
+        if self.acceptances:
+            self.acceptances = [pd.concat(self.acceptances, ignore_index=True).drop_duplicates()]
+
+    def finish(self):
+        """Core rows for the month, in the same shape as DataProcessor.aggregate_core_data."""
+        self.compact()
+        sums = self.sums[0].set_index(KEYS)
+        boas_count = self.acceptances[0].groupby(KEYS).size().rename('boas_count')
+
+        core_data = sums[['net_volume']].join(boas_count)
+        core_data['boas_count'] = core_data['boas_count'].fillna(0).astype('int64')
+        core_data = core_data.join(sums[['bids_count', 'offers_count', 'balancing_cost', 'system_volume']])
+        core_data['energy_volume'] = core_data['net_volume'] - core_data['system_volume']
+
+        mixes = self.mixes[0].set_index(KEYS + ['side', 'bmu_fuel_type'])['total_volume_accepted']
+        for side in ['generation_mix', 'consumption_mix']:
+            side_mix = mixes[mixes.index.get_level_values('side') == side].droplevel('side')
+            core_data = core_data.join(mix_matrix(side_mix, side))
+        core_data[ALL_MIX_COLUMNS] = core_data[ALL_MIX_COLUMNS].fillna(0.0)
+
+        core_data.sort_index(inplace=True)
+        core_data.reset_index(inplace=True)
+        return core_data
+
+
+def read_processed_chunks(path, chunksize):
+    """
+    Read a processed BOA CSV ``chunksize`` rows at a time with narrow dtypes.
+    Rows without a settlement_date are dropped, as the in-memory build's
+    groupby drops them.
+    """
+    for chunk in pd.read_csv(path, usecols=PROCESSED_COLUMNS, dtype=PROCESSED_DTYPES, chunksize=chunksize):
+        yield chunk[chunk['settlement_date'].notna()]
+
+
+def chunk_months(chunk):
+    # Parse each distinct date once rather than every row; the chunk must
+    # have no missing dates (their category code, -1, has no month)
+    dates = chunk['settlement_date']
+    months = pd.to_datetime(pd.Series(dates.cat.categories)).dt.month.to_numpy()
+    return pd.Series(months[dates.cat.codes], index=chunk.index)
+
+
+def last_chunk_per_month(path, chunksize):
+    """Index of the last chunk each month appears in (reads only settlement_date)."""
+    last_seen = {}
+    reader = pd.read_csv(path, usecols=['settlement_date'], dtype={'settlement_date': 'category'}, chunksize=chunksize)
+    for i, chunk in enumerate(reader):
+        chunk = chunk[chunk['settlement_date'].notna()]
+        for month in chunk_months(chunk).unique():
+            last_seen[int(month)] = i
+    return last_seen
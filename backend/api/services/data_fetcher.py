@@ -1,28 +1,242 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
 import requests
 import pandas as pd
-from datetime import datetime
+
+from .boa_store import BoaStore
+from .core_store import _atomic_write_text, _tmp_path
+
+# Rows parsed at a time while filtering a download to the requested window
+DEFAULT_CHUNKSIZE = 200_000
+
+# Columns identifying a processed row, so an ingest that overlaps earlier
+# ones only appends the rows that aren't in the file yet
+INGEST_KEY = ['settlement_date', 'settlement_period', 'gsp_group_id', 'bmu_fuel_type', 'acceptance_id']
 
 class NESODataFetcher:
     BASE_URL = "https://api.neso.energy/dataset"
     DATASET_ID = "93ebb15e-4c2c-4768-9750-45c2789f4186"
-    
+
+    # BOA files of the dataset and the dates each covers
+    BOA_RESOURCES = [
+        {
+            'resource_id': "1c3fac4b-a7ec-4448-a08b-7b0888d17910",
+            'filename': "all-boas-april2024-march2025.csv",
+            'start': date(2024, 4, 1),
+            'end': date(2025, 3, 31),
+        },
+    ]
+    TIMESTAMP_COLUMN = 'timestamp'
+
+    def __init__(self, cache_dir=None, base_url=None, workers=None, chunksize=DEFAULT_CHUNKSIZE, timeout=60):
+        """
+        Downloads are kept in ``cache_dir`` (default NESO_CACHE_DIR, else
+        backend/data/downloads) and revalidated with ETag/Last-Modified; pass
+        ``cache_dir=False`` to stream without keeping them. ``base_url``
+        (default NESO_BASE_URL, else BASE_URL) lets a local server stand in
+        for the API.
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get('NESO_CACHE_DIR') or os.path.join(Path(__file__).resolve().parent.parent.parent, 'data', 'downloads')
+        self.cache_dir = cache_dir or None
+        self.base_url = (base_url or os.environ.get('NESO_BASE_URL') or self.BASE_URL).rstrip('/')
+        self.workers = workers or int(os.environ.get('NESO_FETCH_WORKERS', 4))
+        self.chunksize = chunksize
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def resource_url(self, resource):
+        return f"{self.base_url}/{self.DATASET_ID}/resource/{resource['resource_id']}/download/{resource['filename']}"
+
+    def resources_for(self, start_date, end_date):
+        start, end = pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date()
+        return [r for r in self.BOA_RESOURCES if r['start'] <= end and r['end'] >= start]
+
+    def download(self, resource):
+        """
+        Path of an up-to-date local copy of ``resource``. A cached copy is
+        revalidated and only downloaded again when the server has a newer
+        one; it is used as-is if the server cannot be reached.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, resource['filename'])
+        meta_path = path + '.meta.json'
+        meta = {}
+        if os.path.exists(path) and os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        url = self.resource_url(resource)
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 304:
+                    return path
+                response.raise_for_status()
+                tmp_path = _tmp_path(path)
+                with open(tmp_path, 'wb') as f:
+                    for block in response.iter_content(chunk_size=1 << 20):
+                        f.write(block)
+                os.replace(tmp_path, path)
+                meta = {
+                    'url': url,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                }
+        except requests.RequestException as e:
+            if meta:
+                print(f"Could not revalidate {resource['filename']}, using the cached copy: {e}")
+                return path
+            raise
+
+        _atomic_write_text(meta_path, json.dumps(meta))
+        return path
+
+    def _read_window(self, source, start_date, end_date):
+        # Parse a chunk at a time and keep only rows inside the window
+        parts = []
+        for chunk in pd.read_csv(source, chunksize=self.chunksize):
+            timestamps = pd.to_datetime(chunk[self.TIMESTAMP_COLUMN])
+            mask = (timestamps >= start_date) & (timestamps <= end_date)
+            if mask.any():
+                parts.append(chunk[mask].assign(**{self.TIMESTAMP_COLUMN: timestamps[mask]}))
+        if not parts:
+            return None
+        return pd.concat(parts, ignore_index=True)
+
+    def _fetch_resource(self, resource, start_date, end_date):
+        if self.cache_dir is not None:
+            return self._read_window(self.download(resource), start_date, end_date)
+        with self.session.get(self.resource_url(resource), stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return self._read_window(response.raw, start_date, end_date)
+
     def fetch_boa_data(self, start_date: datetime, end_date: datetime):
         """
         Fetch BOA (Bid-Offer Acceptance) data from NESO API
+        for ``start_date <= timestamp <= end_date``. Resources covering the
+        window are fetched concurrently.
         """
-        resource_id = "1c3fac4b-a7ec-4448-a08b-7b0888d17910"
-        url = f"{self.BASE_URL}/{self.DATASET_ID}/resource/{resource_id}/download/all-boas-april2024-march2025.csv"
-        
+        resources = self.resources_for(start_date, end_date)
+        if not resources:
+            print(f"No BOA resource covers {start_date} to {end_date}")
+            return None
+
         try:
-            df = pd.read_csv(url)
-            # Filter by date range
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
-            return df[mask]
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(resources))) as executor:
+                parts = list(executor.map(lambda r: self._fetch_resource(r, start_date, end_date), resources))
         except Exception as e:
             print(f"Error fetching BOA data: {e}")
             return None
 
+        parts = [part for part in parts if part is not None]
+        if not parts:
+            return pd.DataFrame()
+        return pd.concat(parts, ignore_index=True)
+
+    def ingest(self, start_date, end_date, data_processor, transform):
+        """
+        Fetch BOAs for a window and feed them through the processed/core
+        pipeline. ``transform(raw_df)`` turns the raw rows into processed
+        rows (the columns of ``{year}boadf_processed.csv``); that needs BMU
+        metadata for the GSP group and fuel type. Rows not already in each
+        year's processed file (by INGEST_KEY) are appended to it, then the
+        year's core data, BOA store and (in SQL mode) database rows are
+        brought up to date. Returns the years that changed.
+        """
+        raw = self.fetch_boa_data(start_date, end_date)
+        if raw is None or raw.empty:
+            return []
+
+        processed = transform(raw)
+        dates = pd.to_datetime(processed['settlement_date'])
+        changed = []
+        for year, rows in processed.groupby(dates.dt.year, sort=True):
+            processed_file = os.path.join(data_processor.processed_dir, f'{year}boadf_processed.csv')
+            if os.path.exists(processed_file):
+                columns = list(pd.read_csv(processed_file, nrows=0).columns)
+                last_date = _ingested_through(processed_file)
+                rows = self._not_ingested(processed_file, rows, last_date)
+                if rows.empty:
+                    continue
+                rows[columns].to_csv(processed_file, mode='a', header=False, index=False)
+            else:
+                last_date = None
+                rows.to_csv(processed_file, index=False)
+            last_ingested = pd.to_datetime(rows['settlement_date']).max()
+            if last_date is not None:
+                last_ingested = max(last_ingested, pd.Timestamp(last_date))
+            _record_ingested(processed_file, last_ingested)
+            print(f'Ingested {len(rows)} BOA rows into {year}boadf_processed.csv.')
+
+            data_processor.update_core_data(year)
+            data_processor.build_boa_store(year)
+            if data_processor.sql_store is not None:
+                data_processor.load_core_sql(year)
+            changed.append(int(year))
+        return changed
+
+    def _not_ingested(self, processed_file, rows, last_date):
+        # Rows dated after the file's last ingested date are all new. Earlier
+        # dates (an overlapping window, or a day only partly published last
+        # time) are checked row by row against the file's rows on those dates.
+        dates = pd.to_datetime(rows['settlement_date'])
+        if last_date is None or dates.min() > pd.Timestamp(last_date):
+            return rows
+        overlap = set(dates[dates <= pd.Timestamp(last_date)].dt.strftime('%Y-%m-%d'))
+        existing = []
+        for chunk in pd.read_csv(processed_file, usecols=INGEST_KEY, chunksize=self.chunksize):
+            chunk_dates = pd.to_datetime(chunk['settlement_date'], errors='coerce').dt.strftime('%Y-%m-%d')
+            existing.append(chunk[chunk_dates.isin(overlap)])
+        existing = _ingest_keys(pd.concat(existing, ignore_index=True))
+        return rows[~_ingest_keys(rows).isin(existing)]
+
+def _ingest_keys(df):
+    # INGEST_KEY values in one form whether parsed from the CSV or not, with
+    # repeats of a key numbered so they are matched one for one
+    keys = pd.DataFrame({
+        'settlement_date': pd.to_datetime(df['settlement_date'], errors='coerce').dt.strftime('%Y-%m-%d'),
+        'settlement_period': pd.to_numeric(df['settlement_period'], errors='coerce').astype('float64'),
+        'gsp_group_id': df['gsp_group_id'].astype(str),
+        'bmu_fuel_type': df['bmu_fuel_type'].astype(str),
+        'acceptance_id': pd.to_numeric(df['acceptance_id'], errors='coerce').astype('float64'),
+    }).reset_index(drop=True)
+    keys['occurrence'] = keys.groupby(INGEST_KEY, dropna=False).cumcount()
+    return pd.MultiIndex.from_frame(keys)
+
+def _ingested_through(processed_file):
+    # Latest settlement_date of a processed file, from the high-water mark
+    # written by the last ingest. If the file has changed since (rebuilt or
+    # edited by hand) the settlement_date column is parsed in full instead,
+    # which doesn't depend on the order rows were appended in.
+    mark_path = processed_file + '.ingest.json'
+    try:
+        with open(mark_path) as f:
+            mark = json.load(f)
+        if mark['source'] == BoaStore.source_signature(processed_file):
+            return mark['last_date']
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+    dates = pd.to_datetime(pd.read_csv(processed_file, usecols=['settlement_date'])['settlement_date'], errors='coerce')
+    last_date = dates.max()
+    return None if pd.isna(last_date) else last_date.strftime('%Y-%m-%d')
+
+def _record_ingested(processed_file, last_date):
+    _atomic_write_text(processed_file + '.ingest.json', json.dumps({
+        'last_date': last_date.strftime('%Y-%m-%d'),
+        'source': BoaStore.source_signature(processed_file),
+    }))
+
 class BMUDataFetcher:
     def fetch_bmu_metadata(self, bmu_id: str):
         """
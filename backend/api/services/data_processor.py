@@ -1,12 +1,48 @@
 import pandas as pd
-import json
 from pathlib import Path
 import numpy as np
 import os
-from collections import Counter
+import hashlib
+from datetime import date as date_cls, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .core_store import ROLLUP_TABLES, CoreStore, _to_date
+from .boa_store import BoaStore
+from .merit_index import MeritIndexStore
+from .asset_benchmark import AssetBenchmark
+from .core_cache import shared_core_cache
+from .core_stream import KEYS, MonthAccumulator, chunk_months, last_chunk_per_month, read_processed_chunks
+from .fuel_mix import ALL_MIX_COLUMNS, mix_arrays, mix_matrix, normalise_fuel_types, with_mix_dicts
+from .serialization import frame_columns, frame_records
+from .downsample import resample
+from .timing import span
+
+# National tables holding each prebuilt time-series resolution; week and
+# month are summed from the daily rows on request
+NATIONAL_TABLES = {
+    'period': 'national',
+    'hour': 'hourly_national',
+    'day': 'daily_national',
+}
+
+# Numeric core columns, as offered by the time-series endpoint
+NUMERIC_COLUMNS = [
+    'net_volume',
+    'boas_count',
+    'bids_count',
+    'offers_count',
+    'system_volume',
+    'energy_volume',
+    'balancing_cost',
+]
+
+# Summed when rolling core rows up to hours, days or the whole country
+SUM_COLUMNS = NUMERIC_COLUMNS + ALL_MIX_COLUMNS
+
+# Rows parsed at a time when scanning a processed file for some dates
+PROCESSED_SCAN_CHUNKSIZE = 200_000
 
 class DataProcessor:
-    def __init__(self, data_dir=None):
+    def __init__(self, data_dir=None, storage_format=None, backend=None):
         # Determine the correct data directory path
         if data_dir is None:
             # Get the directory where this file is located
@@ -19,12 +55,27 @@ class DataProcessor:
         self.processed_dir = self.data_dir
         self.core_data_dir = os.path.join(self.data_dir, 'core')
         os.makedirs(self.core_data_dir, exist_ok=True)
+        # Parquet when pyarrow is available, otherwise the per-year CSV files
+        self.core_store = CoreStore(self.core_data_dir, storage_format=storage_format)
+        # Loaded years are shared between all processors in this process
+        self.core_cache = shared_core_cache(self.core_store)
+        # Typed, memory-mapped copy of the processed BOAs for the asset benchmark
+        self.boa_store = BoaStore(self.data_dir)
+        # Presorted merit stacks built from it, so simulations skip the sort
+        self.merit_index = MeritIndexStore(self.data_dir)
+        # With CORE_BACKEND=sql the core reads go to the Django database,
+        # loaded from the files by load_core_sql, instead of the local files
+        if backend is None:
+            backend = os.environ.get('CORE_BACKEND', 'files')
+        self.sql_store = None
+        if backend == 'sql':
+            from .sql_store import SqlCoreStore
+            self.sql_store = SqlCoreStore()
 
-    def create_core_data(self, year):
+    def create_core_data(self, year, chunksize=None):
         processed_file = os.path.join(self.processed_dir, f'{year}boadf_processed.csv')
-        core_file = os.path.join(self.core_data_dir, f'core_data_{year}.csv')
         
-        if os.path.exists(core_file):
+        if self.core_store.is_complete(year):
             print(f'Core data for {year} already exists.')
             return
 
@@ -33,21 +84,161 @@ class DataProcessor:
             return
 
         print(f'Creating core data for {year}...')
+        # Size before reading; anything appended later is picked up by update_core_data
+        source_size = os.path.getsize(processed_file)
+        if chunksize is None:
+            chunksize = int(os.environ.get('CORE_BUILD_CHUNKSIZE', 0)) or None
+        if chunksize:
+            self._create_core_data_streaming(year, processed_file, chunksize)
+        else:
+            self._create_core_data_in_memory(year, processed_file)
+        self._write_build_state(year, source_size)
+        print(f'Finished creating core data for {year}.')
+
+    def _create_core_data_in_memory(self, year, processed_file):
         df = pd.read_csv(processed_file)
 
+        if self.core_store.storage_format != 'parquet':
+            self._write_core_year(year, self.aggregate_core_data(df))
+            return
+
+        # Build month by month; months finished before an interrupted run are kept.
+        # Rows without a date have no month (aggregation drops them anyway)
+        df = df[df['settlement_date'].notna()]
+        months = pd.to_datetime(df['settlement_date']).dt.month
+        for month, month_df in df.groupby(months, sort=True):
+            if self.core_store.has_month(year, month):
+                print(f'Core data for {year}-{month:02d} already exists, skipping.')
+                continue
+            self._write_core_month(year, month, self.aggregate_core_data(month_df))
+        self.core_store.mark_complete(year)
+
+    def _write_core_month(self, year, month, core_data):
+        # Rollups go first: a month counts as built once its core file exists
+        for table, rollup in self.build_rollups(core_data).items():
+            self.core_store.write_month(year, month, rollup, table)
+        self.core_store.write_month(year, month, core_data)
+
+    def _write_core_year(self, year, core_data):
+        for table, rollup in self.build_rollups(core_data).items():
+            self.core_store.write(year, rollup, table)
+        self.core_store.write(year, core_data)
+
+    def update_core_data(self, year):
+        """
+        Bring a year up to date with rows appended to the processed file since
+        the last build. Only bytes after the recorded source offset are parsed
+        (the whole file if it was rewritten). Every settlement date with rows
+        in that tail is aggregated again and replaces its rows in the core and
+        rollup tables; a date that was already built (its rows arrived over
+        several appends) is aggregated from all of its rows in the file.
+        """
+        processed_file = os.path.join(self.processed_dir, f'{year}boadf_processed.csv')
+        if not os.path.exists(processed_file):
+            print(f'Processed data for {year} not found.')
+            return
+
+        if not self.core_store.is_complete(year):
+            self.create_core_data(year)
+            return
+
+        state = self.core_store.read_state(year) or {
+            'last_settlement_date': self.core_store.last_settlement_date(year),
+            'source_offset': 0,
+        }
+        source_size = os.path.getsize(processed_file)
+        new_rows = self._read_processed_tail(processed_file, state['source_offset'], source_size)
+        new_rows = new_rows[new_rows['settlement_date'].notna()]
+
+        if new_rows.empty:
+            print(f'Core data for {year} is up to date.')
+        else:
+            # Dates up to the last built one may already have rows before the tail
+            last_date = state['last_settlement_date']
+            dates = pd.to_datetime(new_rows['settlement_date'])
+            built = set(new_rows.loc[dates <= pd.Timestamp(last_date), 'settlement_date']) if last_date is not None else set()
+            if built:
+                new_rows = pd.concat([
+                    new_rows[~new_rows['settlement_date'].isin(built)],
+                    self._read_processed_dates(processed_file, built),
+                ], ignore_index=True)
+
+            print(f'Updating {new_rows["settlement_date"].nunique()} settlement dates of core data for {year}...')
+            core_data = self.aggregate_core_data(new_rows)
+            for table, rollup in self.build_rollups(core_data).items():
+                self.core_store.replace_dates(year, rollup, table)
+            self.core_store.replace_dates(year, core_data)
+        self._write_build_state(year, source_size)
+
+    def _read_processed_dates(self, processed_file, dates):
+        # Every row of some settlement dates, a chunk of the file at a time
+        wanted = set(pd.to_datetime(list(dates)).strftime('%Y-%m-%d'))
+        parts = []
+        for chunk in pd.read_csv(processed_file, chunksize=PROCESSED_SCAN_CHUNKSIZE):
+            chunk_dates = pd.to_datetime(chunk['settlement_date']).dt.strftime('%Y-%m-%d')
+            parts.append(chunk[chunk_dates.isin(wanted)])
+        return pd.concat(parts, ignore_index=True)
+
+    def _read_processed_tail(self, processed_file, offset, size):
+        # Parse only what was appended after a previous end-of-file offset; read the
+        # whole file if it shrank or the offset is not at a line boundary
+        if 0 < offset <= size:
+            with open(processed_file, 'rb') as f:
+                header = f.readline().decode().strip().split(',')
+                f.seek(offset - 1)
+                if f.read(1) == b'\n':
+                    if offset == size:
+                        return pd.DataFrame(columns=header)
+                    return pd.read_csv(f, names=header, header=None)
+        return pd.read_csv(processed_file)
+
+    def _write_build_state(self, year, source_size):
+        self.core_store.write_state(year, {
+            'last_settlement_date': self.core_store.last_settlement_date(year),
+            'source_offset': source_size,
+        })
+
+    def _create_core_data_streaming(self, year, processed_file, chunksize):
+        # Bounded-memory build: chunks are folded into per-month accumulators and
+        # each month is written as soon as the last chunk containing it is read
+        parquet = self.core_store.storage_format == 'parquet'
+        last_chunk = last_chunk_per_month(processed_file, chunksize)
+        pending = {m for m in last_chunk if not (parquet and self.core_store.has_month(year, m))}
+        for month in sorted(set(last_chunk) - pending):
+            print(f'Core data for {year}-{month:02d} already exists, skipping.')
+
+        accumulators = {}
+        finished = []
+        for chunk_index, chunk in enumerate(read_processed_chunks(processed_file, chunksize)):
+            for month, piece in chunk.groupby(chunk_months(chunk), sort=True):
+                if month in pending:
+                    accumulators.setdefault(month, MonthAccumulator()).add(piece)
+
+            for month in sorted(m for m in accumulators if last_chunk[m] == chunk_index):
+                core_data = accumulators.pop(month).finish()
+                if parquet:
+                    self._write_core_month(year, month, core_data)
+                else:
+                    finished.append(core_data)
+
+        if parquet:
+            self.core_store.mark_complete(year)
+        elif finished:
+            self._write_core_year(year, pd.concat(finished, ignore_index=True).sort_values(KEYS, ignore_index=True))
+
+    def aggregate_core_data(self, df):
+        df = df.copy()
         df['bids_count'] = np.where(df['total_volume_accepted'] < 0, 1, 0)
         df['offers_count'] = np.where(df['total_volume_accepted'] > 0, 1, 0)
+        df['bmu_fuel_type'] = normalise_fuel_types(df['bmu_fuel_type'])
 
         # Separate data for generation (offers) and consumption (bids)
         offers_df = df[df['total_volume_accepted'] > 0]
         bids_df = df[df['total_volume_accepted'] < 0]
 
         # Calculate generation and consumption tech mixes
-        gen_mix_df = offers_df.groupby(['settlement_date', 'settlement_period', 'gsp_group_id', 'bmu_fuel_type'])['total_volume_accepted'].sum().unstack(fill_value=0)
-        con_mix_df = bids_df.groupby(['settlement_date', 'settlement_period', 'gsp_group_id', 'bmu_fuel_type'])['total_volume_accepted'].sum().unstack(fill_value=0)
-
-        gen_mix_json = gen_mix_df.apply(lambda x: x.to_dict(), axis=1)
-        con_mix_json = con_mix_df.apply(lambda x: x.to_dict(), axis=1)
+        gen_mix_df = mix_matrix(offers_df.groupby(['settlement_date', 'settlement_period', 'gsp_group_id', 'bmu_fuel_type'])['total_volume_accepted'].sum(), 'generation_mix')
+        con_mix_df = mix_matrix(bids_df.groupby(['settlement_date', 'settlement_period', 'gsp_group_id', 'bmu_fuel_type'])['total_volume_accepted'].sum(), 'consumption_mix')
 
         agg_funcs = {
             'total_volume_accepted': 'sum',
@@ -70,130 +261,491 @@ class DataProcessor:
         
         core_data['energy_volume'] = core_data['net_volume'] - core_data['system_volume']
         
-        core_data = core_data.join(gen_mix_json.rename('generation_mix'))
-        core_data = core_data.join(con_mix_json.rename('consumption_mix'))
-
-        core_data['generation_mix'].fillna({}, inplace=True)
-        core_data['consumption_mix'].fillna({}, inplace=True)
+        # One column per fuel; groups with no offers (or bids) get zeros
+        core_data = core_data.join(gen_mix_df).join(con_mix_df)
+        core_data[ALL_MIX_COLUMNS] = core_data[ALL_MIX_COLUMNS].fillna(0.0)
 
         core_data.reset_index(inplace=True)
-        core_data.to_csv(core_file, index=False)
-        print(f'Finished creating core data for {year}.')
+        return core_data
+
+    def create_all_core_data(self, years=None, workers=None, chunksize=None, incremental=False):
+        years = list(years) if years is not None else list(range(2021, 2026))
+        if workers is None:
+            workers = int(os.environ.get('CORE_BUILD_WORKERS', os.cpu_count() or 1))
+        workers = max(1, min(workers, len(years)))
+
+        # A failed year doesn't stop the others; the failures are raised together at the end
+        failed = {}
+        if workers == 1:
+            for year in years:
+                try:
+                    _build_core_year(self.data_dir, self.core_store.storage_format, year, chunksize, incremental)
+                except Exception as e:
+                    print(f'Error creating core data for {year}: {e}')
+                    failed[year] = e
+        else:
+            # Each year is built in its own process
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_build_core_year, self.data_dir, self.core_store.storage_format, year, chunksize, incremental): year
+                    for year in years
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f'Error creating core data for {futures[future]}: {e}')
+                        failed[futures[future]] = e
+
+        if failed:
+            raise RuntimeError(f"Core data could not be created for {', '.join(str(year) for year in sorted(failed))}")
+
+    def load_processed_range(self, start_date, end_date):
+        # Processed BOA rows (input to the asset benchmark) for an inclusive date range
+        all_data = []
+        for year in range(start_date.year, end_date.year + 1):
+            processed_file = os.path.join(self.processed_dir, f'{year}boadf_processed.csv')
+            if os.path.exists(processed_file):
+                all_data.append(pd.read_csv(processed_file))
+
+        if not all_data:
+            return None
+
+        full_df = pd.concat(all_data, ignore_index=True)
+        full_df['settlement_date'] = pd.to_datetime(full_df['settlement_date'])
+        mask = (full_df['settlement_date'] >= start_date) & (full_df['settlement_date'] <= end_date)
+        return full_df.loc[mask]
+
+    def load_core_sql(self, year):
+        """Bulk load a year of core rows and per-GSP rollups from the files into the SQL store."""
+        from .sql_store import TABLE_MODELS, SqlCoreStore
+        sql_store = self.sql_store or SqlCoreStore()
+        self.build_missing_rollups(year)
+        for table in TABLE_MODELS:
+            df = self.core_store.read_year(year, table=table)
+            if df is None:
+                continue
+            rows = sql_store.load(year, df, table)
+            print(f'Loaded {rows} {table} rows for {year} into the database.')
+
+    def build_boa_store(self, year, merit_index=True):
+        """
+        Build or refresh a year's BOA store and, unless ``merit_index`` is
+        false, its merit index. Returns whether anything was built.
+        """
+        processed_file = os.path.join(self.processed_dir, f'{year}boadf_processed.csv')
+        if not self.boa_store.available or not os.path.exists(processed_file):
+            return False
+        built = False
+        if not self.boa_store.is_current(year, processed_file):
+            print(f'Building simulation input store for {year}...')
+            self.boa_store.build(year, processed_file)
+            built = True
+        signature = self.boa_store.source_signature(processed_file)
+        if merit_index and not self.merit_index.is_current(year, signature):
+            print(f'Building merit-stack index for {year}...')
+            df = self.boa_store.read_range(date_cls(year, 1, 1), date_cls(year, 12, 31))
+            if df is not None:
+                self.merit_index.build(year, df, signature)
+                built = True
+        return built
+
+    def load_simulation_range(self, start_date, end_date):
+        """
+        Processed BOA rows for the asset benchmark over an inclusive date range,
+        from the BOA store (built or refreshed here when needed; the merit
+        index is left to build_boa_store's other callers). Falls back to
+        load_processed_range when pyarrow is not installed.
+        """
+        if not self.boa_store.available:
+            with span('load'):
+                return self.load_processed_range(start_date, end_date)
+        with span('load'):
+            for year in range(start_date.year, end_date.year + 1):
+                self.build_boa_store(year, merit_index=False)
+            return self.boa_store.read_range(start_date, end_date)
+
+    def merit_indexes(self, start_date, end_date, build=False):
+        """
+        The MeritIndex of every year of an inclusive date range. None unless
+        every year with processed BOA rows has a current one (or pyarrow is
+        not installed); years without processed rows have nothing to index.
+        Missing or stale indexes are built here only with ``build``, as jobs
+        do; requests fall back to the rows instead of sorting a whole year.
+        """
+        if not self.boa_store.available:
+            return None
+        indexes = []
+        with span('load'):
+            for year in range(start_date.year, end_date.year + 1):
+                processed_file = os.path.join(self.processed_dir, f'{year}boadf_processed.csv')
+                if build:
+                    self.build_boa_store(year)
+                elif os.path.exists(processed_file) and not self.merit_index.is_current(year, self.boa_store.source_signature(processed_file)):
+                    return None
+                index = self.merit_index.load(year)
+                if index is not None:
+                    indexes.append(index)
+                elif os.path.exists(processed_file):
+                    return None
+        return indexes
+
+    def simulation_benchmark(self, start_date, end_date, build_index=False):
+        """
+        An AssetBenchmark over an inclusive date range: over the prebuilt merit
+        indexes when every year has one (see merit_indexes for
+        ``build_index``), else over load_simulation_range rows. None when
+        there is no data.
+        """
+        indexes = self.merit_indexes(start_date, end_date, build=build_index)
+        if indexes is not None:
+            benchmark = AssetBenchmark.from_merit_indexes(indexes, start_date, end_date)
+            return benchmark if len(benchmark.gsp_ids) else None
+
+        df = self.load_simulation_range(start_date, end_date)
+        if df is None or df.empty:
+            return None
+        return AssetBenchmark(df)
+
+    def iter_simulation_benchmarks(self, start_date, end_date):
+        """
+        ``(gsp_group_id, AssetBenchmark)`` for each GSP group of an inclusive
+        date range, each over that group only: from the merit indexes when
+        every year has one, else from the rows of iter_simulation_groups.
+        """
+        indexes = self.merit_indexes(start_date, end_date)
+        if indexes is None:
+            for gsp, df in self.iter_simulation_groups(start_date, end_date):
+                yield gsp, AssetBenchmark(df, workers=1)
+            return
+        gsps = sorted({gsp for index in indexes for gsp in index.gsp_group_ids(start_date, end_date)})
+        for gsp in gsps:
+            yield gsp, AssetBenchmark.from_merit_indexes(indexes, start_date, end_date, gsp_group_ids=[gsp])
+
+    def iter_simulation_groups(self, start_date, end_date):
+        """
+        ``(gsp_group_id, rows)`` for each GSP group of load_simulation_range.
+        With the BOA store only one group's rows are read at a time.
+        """
+        if not self.boa_store.available:
+            df = self.load_processed_range(start_date, end_date)
+            if df is not None:
+                yield from df.groupby('gsp_group_id', sort=True)
+            return
+        for year in range(start_date.year, end_date.year + 1):
+            self.build_boa_store(year, merit_index=False)
+        for gsp in self.boa_store.gsp_group_ids(start_date, end_date):
+            df = self.boa_store.read_range(start_date, end_date, gsp_group_ids=[gsp])
+            if df is not None and not df.empty:
+                yield gsp, df
+
+    def data_version(self, years, sources=('core',)):
+        """
+        Fingerprint of the files behind ``years``: 'core' covers the core
+        store (CSV files and the parquet directories, whose mtimes change as
+        month files are replaced, or the loads of the SQL store), 'processed'
+        the processed BOA CSVs. Any rebuild or append changes it.
+        """
+        paths = []
+        signature = hashlib.sha256()
+        if 'core' in sources and self.sql_store is not None:
+            signature.update(repr(self.sql_store.version(years)).encode())
+            sources = [source for source in sources if source != 'core']
+        for year in years:
+            if 'core' in sources:
+                paths.append(self.core_store.state_path(year))
+                for table in ('core', *ROLLUP_TABLES):
+                    paths.append(self.core_store.csv_path(year, table))
+                    paths.append(self.core_store.parquet_dir(year, table))
+            if 'processed' in sources:
+                paths.append(os.path.join(self.processed_dir, f'{year}boadf_processed.csv'))
+
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                signature.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode())
+            except FileNotFoundError:
+                signature.update(f'{path}:-\n'.encode())
+        return signature.hexdigest()[:16]
+
+    def get_core_range(self, start_date, end_date, columns=None):
+        return self._read_range(start_date, end_date, columns=columns)
 
-    def create_all_core_data(self):
-        for year in range(2021, 2026):
+    def _read_range(self, start_date, end_date, columns=None, table='core'):
+        # A table for a date range, filtered (and for the national tables
+        # summed) by the database in SQL mode, else from the year cache
+        if self.sql_store is not None:
+            return self.sql_store.read_range(start_date, end_date, columns=columns, table=table)
+        return self.core_cache.get_range(start_date, end_date, columns=columns, table=table)
+
+    def _read_day(self, date, table='core'):
+        if self.sql_store is not None:
+            return self.sql_store.read_day(date, table=table)
+        return self.core_cache.get_day(date, table=table)
+
+    def _has_table(self, year, table='core'):
+        return (self.sql_store or self.core_store).exists(year, table)
+
+    def _ensure_core_data(self, year):
+        # Build a missing year from the processed files; the SQL store is
+        # only filled by load_core_sql
+        if self.sql_store is None and not self.core_store.is_complete(year):
             self.create_core_data(year)
 
-    def get_daily_data(self, date):
+    def get_national_range(self, start_date, end_date, columns=None):
+        """
+        National per-period totals for an inclusive date range, sorted by
+        settlement_date and settlement_period. Read from the prebuilt
+        national table; years built without it are summed from the core rows.
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        frames = []
+        for year in range(start_date.year, end_date.year + 1):
+            year_start = max(start_date, date_cls(year, 1, 1))
+            year_end = min(end_date, date_cls(year, 12, 31))
+            if self._has_table(year, 'national'):
+                frames.append(self._read_range(year_start, year_end, columns=columns, table='national'))
+            elif self._has_table(year):
+                core = self._read_range(year_start, year_end, columns=columns)
+                frames.append(self.aggregate_to_national_periods(core))
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def get_national_series(self, start_date, end_date, columns, resolution='period'):
+        """
+        National totals of ``columns`` at ``resolution`` (see downsample.RESOLUTIONS).
+        Per-period rows keep settlement_date and settlement_period; coarser
+        resolutions are keyed by the bucket start timestamp in settlement_date.
+        """
+        if resolution == 'period':
+            with span('load'):
+                return self.get_national_range(start_date, end_date, columns=['settlement_date', 'settlement_period'] + columns)
+
+        base = resolution if resolution in NATIONAL_TABLES else 'day'
+        table = NATIONAL_TABLES[base]
+        key_columns = ['settlement_date', 'hour'] if base == 'hour' else ['settlement_date']
+        start, end = _to_date(start_date), _to_date(end_date)
+        # Years without any core data are simply absent from the result
+        with span('load'):
+            if all(self._has_table(year, table) or not self._has_table(year) for year in range(start.year, end.year + 1)):
+                df = self._read_range(start, end, columns=key_columns + columns, table=table)
+            else:
+                df = self.get_national_range(start, end, columns=['settlement_date', 'settlement_period'] + columns)
+        if df is None:
+            return None
+        with span('resample'):
+            return resample(df, resolution)
+
+    def build_missing_rollups(self, year):
+        """Write any rollup table missing from a year that was built before it existed."""
+        missing = [table for table in ROLLUP_TABLES if not self.core_store.exists(year, table)]
+        if not missing or not self.core_store.is_complete(year):
+            return
+        print(f'Building {", ".join(missing)} rollups for {year}...')
+        rollups = self.build_rollups(self.core_store.read_year(year))
+        for table in missing:
+            self.core_store.write(year, rollups[table], table)
+
+    def get_daily_frames(self, date):
+        """
+        ``(day_type, frames)`` for one date, where ``frames`` holds the
+        per-period, hourly and daily rows keyed 'settlement_period', 'hourly'
+        and 'daily' (empty when the date has no rows). None if the year has
+        no core data.
+        """
         year = date.year
-        core_file = os.path.join(self.core_data_dir, f'core_data_{year}.csv')
-        if not os.path.exists(core_file):
-            self.create_core_data(year)
+        self._ensure_core_data(year)
 
-        if not os.path.exists(core_file):
+        if not self._has_table(year):
             return None
             
-        df = pd.read_csv(core_file)
-        date_str = date.strftime('%Y-%m-%d')
-        daily_data = df[df['settlement_date'] == date_str].copy()
+        with span('load'):
+            daily_data = self._read_day(date)
         
         if daily_data.empty:
-            return {'day_type': 'N', 'settlement_period': [], 'hourly': [], 'daily': []}
+            return 'N', {}
 
-        max_sp = daily_data['settlement_period'].max()
-        if max_sp == 48:
-            day_type = 'N'
-        elif max_sp > 48:
-            day_type = 'L'
-        else:
-            day_type = 'S'
+        day_type = _day_type(daily_data['settlement_period'].max())
         
-        # Convert tech_mix from string representation of dict to dict first
-        for col in ['generation_mix', 'consumption_mix']:
-            daily_data[col] = daily_data[col].apply(lambda x: json.loads(x.replace("'", "\"")) if isinstance(x, str) and pd.notna(x) and x not in ('{}', 'nan') else {})
-
-        # Aggregations
-        daily_data_sp = daily_data.copy()
+        daily_data_sp = daily_data
         daily_data_sp['hour'] = (daily_data_sp['settlement_period'] - 1) // 2
-        
-        daily_data_hr = self.aggregate_to_hourly(daily_data_sp)
-        daily_data_day = self.aggregate_to_daily(daily_data_sp)
-
-        # Convert DataFrames to lists of dictionaries, handling the mix columns properly
-        def df_to_json_serializable(df):
-            records = []
-            for _, row in df.iterrows():
-                record = row.to_dict()
-                # Handle NaN and infinity values
-                for key, value in record.items():
-                    if pd.isna(value) or (isinstance(value, float) and (np.isinf(value) or np.isnan(value))):
-                        if key in ['generation_mix', 'consumption_mix']:
-                            record[key] = {}
-                        else:
-                            record[key] = None
-                    elif key in ['generation_mix', 'consumption_mix']:
-                        # Ensure mix fields are properly serialized
-                        if not isinstance(value, dict):
-                            record[key] = {}
-                records.append(record)
-            return records
 
-        return {
-            'day_type': day_type,
-            'settlement_period': df_to_json_serializable(daily_data_sp),
-            'hourly': df_to_json_serializable(daily_data_hr),
-            'daily': df_to_json_serializable(daily_data_day),
+        # Hourly and daily rows are precomputed at build time; aggregate here
+        # only for years built before the rollup tables existed
+        with span('rollups'):
+            daily_data_hr = self._get_rollup_day(date, 'hourly')
+            if daily_data_hr is None:
+                daily_data_hr = self.aggregate_to_hourly(daily_data_sp)
+            daily_data_day = self._get_rollup_day(date, 'daily')
+            if daily_data_day is None:
+                daily_data_day = self.aggregate_to_daily(daily_data_sp)
+
+        return day_type, {
+            'settlement_period': daily_data_sp,
+            'hourly': daily_data_hr,
+            'daily': daily_data_day,
         }
 
-    def _aggregate_mix(self, series_of_dicts):
-        total = Counter()
-        for d in series_of_dicts:
-            if isinstance(d, dict):
-                total.update(d)
-        return dict(total)
+    def get_daily_data(self, date, orient='records'):
+        """
+        Per-period, hourly and daily rows for one date. ``orient='records'``
+        gives lists of row objects; ``orient='split'`` gives one array per
+        column, with the mixes as ``{fuel: array}``.
+        """
+        daily = self.get_daily_frames(date)
+        if daily is None:
+            return None
 
-    def aggregate_to_hourly(self, df):
-        # Aggregate numeric columns
-        numeric_aggs = {
-            'net_volume': 'sum',
-            'boas_count': 'sum',
-            'bids_count': 'sum',
-            'offers_count': 'sum',
-            'system_volume': 'sum',
-            'energy_volume': 'sum',
-            'balancing_cost': 'sum'
-        }
-        
-        all_aggs = {
-            **numeric_aggs,
-            'generation_mix': self._aggregate_mix,
-            'consumption_mix': self._aggregate_mix
+        day_type, frames = daily
+        with span('serialise'):
+            return _daily_payload(day_type, frames, orient)
+
+    def get_daily_range_frames(self, start_date, end_date):
+        """
+        ``[(date, day_type, frames)]`` for each date of an inclusive range,
+        with ``frames`` as from get_daily_frames. Each table is loaded once for
+        the whole range and split by date, and day types come from one
+        groupby. Dates in years without core data are left out; None if no
+        year of the range has any.
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        years = range(start_date.year, end_date.year + 1)
+        for year in years:
+            self._ensure_core_data(year)
+        years = [year for year in years if self._has_table(year)]
+        if not years:
+            return None
+
+        with span('load'):
+            core = self._read_range(start_date, end_date)
+        core['hour'] = (core['settlement_period'] - 1) // 2
+        day_types = core.groupby('settlement_date')['settlement_period'].max().map(_day_type)
+
+        with span('rollups'):
+            rollups = {}
+            for table, aggregate in (('hourly', self.aggregate_to_hourly), ('daily', self.aggregate_to_daily)):
+                if all(self._has_table(year, table) for year in years):
+                    rollups[table] = self._read_range(start_date, end_date, table=table)
+                else:
+                    rollups[table] = aggregate(core)
+
+        tables = {'settlement_period': core, **rollups}
+        by_date = {name: _split_by_date(df) for name, df in tables.items()}
+        days = []
+        for offset in range((end_date - start_date).days + 1):
+            day = start_date + timedelta(days=offset)
+            if day.year not in years:
+                continue
+            date_str = day.strftime('%Y-%m-%d')
+            if date_str not in day_types.index:
+                days.append((day, 'N', {}))
+                continue
+            days.append((day, day_types[date_str], {name: by_date[name].get(date_str, tables[name].iloc[:0]) for name in tables}))
+        return days
+
+    def get_daily_range(self, start_date, end_date, orient='records'):
+        """get_daily_data for each date of an inclusive range, as a list with each day's ISO ``date``."""
+        days = self.get_daily_range_frames(start_date, end_date)
+        if days is None:
+            return None
+
+        with span('serialise'):
+            return [
+                {'date': day.strftime('%Y-%m-%d'), **_daily_payload(day_type, frames, orient)}
+                for day, day_type, frames in days
+            ]
+
+    def _get_rollup_day(self, date, table):
+        rollup = self._read_day(date, table=table)
+        if rollup is None or rollup.empty:
+            return None
+        return rollup
+
+    def build_rollups(self, core_data):
+        """Hourly and daily rollups of core rows, per GSP and national."""
+        df = core_data.copy()
+        df['hour'] = (df['settlement_period'] - 1) // 2
+
+        return {
+            'hourly': self.aggregate_to_hourly(df),
+            'daily': self.aggregate_to_daily(df),
+            'hourly_national': self.aggregate_to_national(df, ['settlement_date', 'hour']),
+            'daily_national': self.aggregate_to_national(df, ['settlement_date']),
+            'national': self.aggregate_to_national_periods(df),
         }
-        
+
+    def aggregate_to_hourly(self, df):
         # Group by settlement_date, gsp_group_id, hour
-        df_hourly = df.groupby(['settlement_date', 'gsp_group_id', 'hour']).agg(all_aggs).reset_index()
-        
+        df_hourly = df.groupby(['settlement_date', 'gsp_group_id', 'hour'])[SUM_COLUMNS].sum().reset_index()
+
         return df_hourly
 
     def aggregate_to_daily(self, df):
-        # Aggregate numeric columns
-        numeric_aggs = {
-            'net_volume': 'sum',
-            'boas_count': 'sum',
-            'bids_count': 'sum',
-            'offers_count': 'sum',
-            'system_volume': 'sum',
-            'energy_volume': 'sum',
-            'balancing_cost': 'sum'
-        }
+        # Group by settlement_date and gsp_group_id
+        df_daily = df.groupby(['settlement_date', 'gsp_group_id'])[SUM_COLUMNS].sum().reset_index()
 
-        all_aggs = {
-            **numeric_aggs,
-            'generation_mix': self._aggregate_mix,
-            'consumption_mix': self._aggregate_mix
-        }
+        return df_daily
 
-        # Group by settlement_date and gsp_group_id
-        df_daily = df.groupby(['settlement_date', 'gsp_group_id']).agg(all_aggs).reset_index()
-        
-        return df_daily
\ No newline at end of file
+    def aggregate_to_national(self, df, group_cols):
+        # Sum across GSP groups
+        return df.groupby(group_cols)[SUM_COLUMNS].sum().reset_index()
+
+    def aggregate_to_national_periods(self, df):
+        # National per-period totals of the numeric columns; backs the time-series endpoint
+        columns = [col for col in NUMERIC_COLUMNS if col in df.columns]
+        return df.groupby(['settlement_date', 'settlement_period'])[columns].sum().reset_index()
+
+
+def _day_type(max_period):
+    # Normal, long (autumn clock change) or short (spring clock change) day
+    if max_period == 48:
+        return 'N'
+    if max_period > 48:
+        return 'L'
+    return 'S'
+
+
+def _split_by_date(df):
+    # Rows of a frame sorted by settlement_date, as a date -> rows mapping
+    dates = df['settlement_date'].to_numpy(dtype=object)
+    if not len(dates):
+        return {}
+    starts = np.r_[0, np.flatnonzero(dates[1:] != dates[:-1]) + 1]
+    stops = np.r_[starts[1:], len(dates)]
+    return {dates[start]: df.iloc[start:stop] for start, stop in zip(starts, stops)}
+
+
+def _daily_payload(day_type, frames, orient):
+    if not frames:
+        empty = {} if orient == 'split' else []
+        return {'day_type': day_type, 'settlement_period': empty, 'hourly': empty, 'daily': empty}
+    return {
+        'day_type': day_type,
+        **{name: _serialise_frame(frame, orient) for name, frame in frames.items()},
+    }
+
+
+def _serialise_frame(df, orient):
+    # The per-fuel columns are turned back into generation_mix/consumption_mix
+    # only here, at the response edge
+    if orient == 'split':
+        columns = frame_columns(df.drop(columns=ALL_MIX_COLUMNS))
+        columns['generation_mix'] = mix_arrays(df, 'generation_mix')
+        columns['consumption_mix'] = mix_arrays(df, 'consumption_mix')
+        return columns
+    return frame_records(with_mix_dicts(df))
+
+
+def _build_core_year(data_dir, storage_format, year, chunksize=None, incremental=False):
+    processor = DataProcessor(data_dir, storage_format=storage_format, backend='files')
+    # Existing CSV-only years are converted rather than rebuilt
+    if processor.core_store.convert_csv(year):
+        print(f'Converted core data for {year} to parquet.')
+    processor.build_missing_rollups(year)
+    processor.build_boa_store(year)
+    if incremental:
+        processor.update_core_data(year)
+    else:
+        processor.create_core_data(year, chunksize=chunksize)
@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Time-series resolutions, finest first. 'period' is one row per settlement
+# period; coarser resolutions sum the periods of each hour/day/week/month.
+RESOLUTIONS = ['period', 'hour', 'day', 'week', 'month']
+
+# Rows per day at each resolution, used to pick a resolution before loading
+ROWS_PER_DAY = {
+    'period': 48,
+    'hour': 24,
+    'day': 1,
+    'week': 1 / 7,
+    'month': 12 / 365,
+}
+
+# Automatic mode loads at most this many times max_points rows before
+# reducing them with LTTB
+OVERSAMPLE = 4
+
+DEFAULT_MAX_POINTS = 5000
+
+# Settlement periods count from midnight UK time
+UK_TIMEZONE = 'Europe/London'
+
+
+def choose_resolution(start_date, end_date, max_points):
+    """The finest resolution with at most ``OVERSAMPLE * max_points`` rows for the range."""
+    days = (end_date - start_date).days + 1
+    for resolution in RESOLUTIONS:
+        if days * ROWS_PER_DAY[resolution] <= OVERSAMPLE * max_points:
+            return resolution
+    return RESOLUTIONS[-1]
+
+
+def year_chunks(start_date, end_date, resolution):
+    """
+    Inclusive ``(start, end)`` dates splitting a range at each new year, so it
+    can be produced a year at a time. Weekly chunks break on the Monday
+    starting the year's first week, so no week is split between two chunks.
+    """
+    start = pd.Timestamp(start_date).date()
+    end = pd.Timestamp(end_date).date()
+    bounds = []
+    for year in range(start.year + 1, end.year + 1):
+        bound = date(year, 1, 1)
+        if resolution == 'week':
+            bound -= timedelta(days=bound.weekday())
+        if start < bound <= end:
+            bounds.append(bound)
+    starts = [start] + bounds
+    ends = [bound - timedelta(days=1) for bound in bounds] + [end]
+    return list(zip(starts, ends))
+
+
+def resample(df, resolution):
+    """
+    Sum national rows (per period, per hour or per day) to ``resolution``,
+    keyed by the bucket start in ``settlement_date``.
+
+    Hours are bucketed by (date, hour of the day) like the hourly tables. A
+    clock-change day has 23 or 25 hours, so each hour is labelled with its
+    UK wall-clock start: the spring day has no 01:00 and the autumn day has
+    two, rather than running its last hour into the next day.
+    """
+    values = [col for col in df.columns if col not in ('settlement_date', 'settlement_period', 'hour')]
+    dates = pd.to_datetime(df['settlement_date'], format='%Y-%m-%d')
+
+    if resolution == 'hour':
+        hours = df['hour'] if 'hour' in df.columns else (df['settlement_period'] - 1) // 2
+        out = df[values].groupby([dates.rename('settlement_date'), hours.rename('hour')], sort=True).sum().reset_index()
+        midnight = out['settlement_date'].dt.tz_localize(UK_TIMEZONE)
+        starts = midnight + pd.to_timedelta(out['hour'], unit='h')
+        out['settlement_date'] = starts.dt.tz_convert(UK_TIMEZONE).dt.tz_localize(None)
+        return out.drop(columns='hour')
+    elif resolution == 'day':
+        keys = dates
+    elif resolution == 'week':
+        keys = dates - pd.to_timedelta(dates.dt.weekday, unit='D')
+    elif resolution == 'month':
+        keys = dates.dt.to_period('M').dt.start_time
+    else:
+        raise ValueError(f'Cannot resample to {resolution}')
+
+    out = df[values].groupby(keys.rename('settlement_date'), sort=True).sum().reset_index()
+    return out
+
+
+def lttb_indices(y, n_out):
+    """
+    Indices of ``n_out`` points of ``y`` chosen by Largest-Triangle-Three-Buckets,
+    which keeps peaks and troughs that averaging would flatten. Rows are taken
+    as equally spaced; the first and last points are always kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    x = np.arange(n, dtype=np.float64)
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # The next bucket's average is the third vertex; the last bucket uses the final point
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(df, columns, max_points):
+    """
+    Reduce ``df`` to about ``max_points`` rows. Each column gets an equal share
+    of the points by LTTB and the union of the chosen rows is kept in order.
+    """
+    if len(df) <= max_points or not columns:
+        return df
+    per_column = max(3, max_points // len(columns))
+    keep = np.unique(np.concatenate([lttb_indices(df[col].to_numpy(), per_column) for col in columns]))
+    return df.iloc[keep].reset_index(drop=True)
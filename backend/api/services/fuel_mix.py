@@ -0,0 +1,127 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+# Fixed fuel-type vocabulary for the generation/consumption mixes. Each mix is
+# stored as one float column per fuel (``gen_CCGT``, ``con_CCGT``, ...) so mixes
+# aggregate with plain column sums; anything outside the list is counted as OTHER.
+FUEL_TYPES = [
+    'BATTERY',
+    'BIOMASS',
+    'CCGT',
+    'COAL',
+    'DIESEL',
+    'GAS',
+    'HYDRO',
+    'INTELEC',
+    'INTEW',
+    'INTFR',
+    'INTGRNL',
+    'INTIFA2',
+    'INTIRL',
+    'INTNED',
+    'INTNEM',
+    'INTNSL',
+    'INTVKL',
+    'NPSHYD',
+    'NUCLEAR',
+    'OCGT',
+    'OIL',
+    'PS',
+    'SOLAR',
+    'WIND',
+    'OTHER',
+]
+
+MIX_PREFIXES = {
+    'generation_mix': 'gen_',
+    'consumption_mix': 'con_',
+}
+
+
+def mix_columns(mix):
+    return [MIX_PREFIXES[mix] + fuel for fuel in FUEL_TYPES]
+
+
+ALL_MIX_COLUMNS = mix_columns('generation_mix') + mix_columns('consumption_mix')
+
+
+def normalise_fuel_types(fuel_types):
+    """Map fuel types outside ``FUEL_TYPES`` to OTHER (missing values stay missing)."""
+    return fuel_types.where(fuel_types.isin(FUEL_TYPES) | fuel_types.isna(), 'OTHER')
+
+
+def mix_matrix(volumes, mix):
+    """
+    Reshape a Series of volumes indexed by ``(*keys, bmu_fuel_type)`` into a
+    frame with one column per fuel for ``mix``, zero-filled.
+    """
+    matrix = volumes.unstack('bmu_fuel_type', fill_value=0.0)
+    matrix = matrix.reindex(columns=FUEL_TYPES, fill_value=0.0)
+    matrix.columns = mix_columns(mix)
+    return matrix.astype('float64')
+
+
+def upgrade_legacy_mixes(df):
+    """
+    Convert ``generation_mix``/``consumption_mix`` columns holding dicts or
+    their ``str(dict)``/JSON text (the layout before the per-fuel columns)
+    into per-fuel columns. Frames without them are returned unchanged.
+    """
+    legacy_mixes = [mix for mix in MIX_PREFIXES if mix in df.columns]
+    if not legacy_mixes:
+        return df
+    df = df.copy()
+    for mix in MIX_PREFIXES:
+        columns = mix_columns(mix)
+        if mix in legacy_mixes:
+            legacy = pd.DataFrame.from_records([_parse_mix(value) for value in df[mix]], index=df.index)
+            if len(legacy.columns):
+                legacy.columns = normalise_fuel_types(pd.Series(legacy.columns)).to_numpy()
+                legacy = legacy.T.groupby(level=0).sum().T
+            legacy = legacy.reindex(columns=FUEL_TYPES, fill_value=0.0).fillna(0.0)
+            df = df.drop(columns=[mix])
+            for fuel, column in zip(FUEL_TYPES, columns):
+                df[column] = legacy[fuel].to_numpy(dtype=np.float64)
+        else:
+            for column in columns:
+                df[column] = 0.0
+    return df
+
+
+def mix_dicts(df, mix):
+    """``{fuel: volume}`` dicts (non-zero fuels only) for each row of ``df``."""
+    values = df[mix_columns(mix)].to_numpy(dtype=np.float64)
+    return [
+        {FUEL_TYPES[i]: float(row[i]) for i in np.flatnonzero(row)}
+        for row in np.nan_to_num(values)
+    ]
+
+
+def mix_arrays(df, mix):
+    """``{fuel: column}`` for the fuels of ``mix`` that are non-zero in any row of ``df``."""
+    arrays = {}
+    for fuel, column in zip(FUEL_TYPES, mix_columns(mix)):
+        values = df[column].to_numpy(dtype=np.float64)
+        if np.any(values):
+            arrays[fuel] = values
+    return arrays
+
+
+def with_mix_dicts(df):
+    """Replace the per-fuel columns of ``df`` by ``generation_mix``/``consumption_mix`` dicts."""
+    df = df.drop(columns=ALL_MIX_COLUMNS).assign(
+        generation_mix=mix_dicts(df, 'generation_mix'),
+        consumption_mix=mix_dicts(df, 'consumption_mix'),
+    )
+    return df
+
+
+def _parse_mix(value):
+    # Mixes used to be stored as dicts, str(dict) or JSON text
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str) and value not in ('{}', 'nan', ''):
+        return json.loads(value.replace("'", '"'))
+    return {}
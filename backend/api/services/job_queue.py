@@ -0,0 +1,174 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .core_store import _atomic_write_text, _tmp_path
+from .serialization import dumps
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_WORKERS = 2
+# Finished and failed jobs older than this are removed with their results
+DEFAULT_RETENTION_HOURS = 24
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobQueue:
+    """
+    Background jobs run on a local thread pool, with their state and result
+    persisted as JSON under ``jobs_dir`` so any server process can report on
+    them.
+
+    A job's ID is a hash of its kind, parameters and the version of the data
+    it reads, so submitting the same work again returns the existing job
+    (unless it failed, in which case it is run again) until the data changes.
+    Jobs left queued or running by a process that has since exited are
+    reported as failed. Jobs not updated for JOB_RETENTION_HOURS are removed
+    when new work is submitted.
+    """
+
+    def __init__(self, jobs_dir, workers=None, retention_hours=None):
+        self.jobs_dir = jobs_dir
+        os.makedirs(jobs_dir, exist_ok=True)
+        if workers is None:
+            workers = int(os.environ.get('JOB_WORKERS', DEFAULT_WORKERS))
+        self.workers = max(1, workers)
+        if retention_hours is None:
+            retention_hours = float(os.environ.get('JOB_RETENTION_HOURS', DEFAULT_RETENTION_HOURS))
+        self.retention = retention_hours * 3600
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_id(kind, params, version=None):
+        key = json.dumps({'kind': kind, 'params': params, 'version': version}, sort_keys=True)
+        return hashlib.sha256(key.encode()).hexdigest()[:24]
+
+    def job_path(self, job_id):
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def result_path(self, job_id):
+        return os.path.join(self.jobs_dir, f'{job_id}.result.json')
+
+    def submit(self, kind, params, fn, version=None):
+        """
+        Queue ``fn(params, progress)`` unless an identical job exists for the
+        same data ``version``. ``progress`` is called as
+        ``progress(done, total, label)`` while the job runs. Returns the job's
+        state.
+        """
+        self.cleanup()
+        job_id = self.job_id(kind, params, version)
+        now = time.time()
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'params': params,
+            'version': version,
+            'status': QUEUED,
+            'progress': {'done': 0, 'total': None, 'completed': []},
+            'error': None,
+            'created_at': now,
+            'updated_at': now,
+            'pid': os.getpid(),
+        }
+
+        with self._lock:
+            existing = self.get(job_id)
+            if existing is not None and existing['status'] != FAILED:
+                return existing
+            if existing is None:
+                # Exclusive create, so two processes submitting together share one job
+                try:
+                    with open(self.job_path(job_id), 'x') as f:
+                        json.dump(job, f)
+                except FileExistsError:
+                    return self.get(job_id)
+            else:
+                self._save(job)
+
+            # The worker thread updates ``job`` in place; hand back a copy
+            snapshot = json.loads(json.dumps(job))
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+            self._executor.submit(self._run, job, fn)
+        return snapshot
+
+    def cleanup(self):
+        """Remove jobs (and their results) not updated within the retention period."""
+        cutoff = time.time() - self.retention
+        for path in glob.glob(os.path.join(self.jobs_dir, '*.json')):
+            if path.endswith('.result.json'):
+                continue
+            job_id = os.path.basename(path)[:-len('.json')]
+            job = self.get(job_id)
+            if job is None or job['status'] in (QUEUED, RUNNING) or job['updated_at'] >= cutoff:
+                continue
+            for stale in (self.result_path(job_id), path):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+
+    def get(self, job_id):
+        try:
+            with open(self.job_path(job_id)) as f:
+                job = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if job['status'] in (QUEUED, RUNNING) and not _pid_alive(job['pid']):
+            job['status'] = FAILED
+            job['error'] = 'Interrupted: the server process running this job exited.'
+        return job
+
+    def result(self, job_id):
+        """The raw JSON bytes of a finished job's result, or None."""
+        try:
+            with open(self.result_path(job_id), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _save(self, job):
+        job['updated_at'] = time.time()
+        _atomic_write_text(self.job_path(job['id']), json.dumps(job))
+
+    def _run(self, job, fn):
+        job['status'] = RUNNING
+        self._save(job)
+
+        def progress(done, total, label=None):
+            job['progress']['done'] = done
+            job['progress']['total'] = total
+            if label is not None:
+                job['progress']['completed'].append(label)
+            self._save(job)
+
+        try:
+            result = fn(job['params'], progress)
+            tmp_path = _tmp_path(self.result_path(job['id']))
+            with open(tmp_path, 'wb') as f:
+                f.write(dumps(result))
+            os.replace(tmp_path, self.result_path(job['id']))
+            job['status'] = DONE
+        except Exception as e:
+            print(f"Job {job['id']} ({job['kind']}) failed: {e}")
+            job['status'] = FAILED
+            job['error'] = str(e)
+        self._save(job)
@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .core_store import _atomic_write_text, _current_version, _new_version, _publish_version, _to_date
+from .merit_order import MeritStack, build_merit_stacks
+
+SIDES = {'offer': True, 'bid': False}
+
+
+class MeritIndex:
+    """
+    The offer and bid merit stacks of every ``(gsp, date, period)`` of one
+    year, as built by ``build_merit_stacks``, with what a simulation needs to
+    restrict them to a date range: each stack's date (``stack_date``, an
+    index into ``dates``) and which GSP groups have rows on each date
+    (``presence``, dates x GSP groups).
+    """
+
+    def __init__(self, year, gsp_ids, dates, stacks, stack_dates, presence):
+        self.year = year
+        self.gsp_ids = gsp_ids
+        self.dates = dates
+        self.stacks = stacks
+        self.stack_dates = stack_dates
+        self.presence = presence
+        self._ranges = {}
+
+    def _date_bounds(self, start_date, end_date):
+        start = np.datetime64(_to_date(start_date), 'D')
+        end = np.datetime64(_to_date(end_date), 'D')
+        return np.searchsorted(self.dates, start, side='left'), np.searchsorted(self.dates, end, side='right')
+
+    def _gsp_ranges(self, side):
+        # (first, last) stack range of each GSP group code; stacks are sorted
+        # by GSP group, then date and period
+        if side not in self._ranges:
+            bounds = np.searchsorted(self.stacks[side].stack_gsp, np.arange(len(self.gsp_ids) + 1))
+            self._ranges[side] = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        return self._ranges[side]
+
+    def gsp_parts(self, side, start_date, end_date, gsp_group_ids=None):
+        """
+        ``{gsp_group_id: MeritStack}`` of the ``side`` stacks dated within an
+        inclusive range, optionally only for some GSP groups. A group's stacks
+        on those dates are contiguous, so each is one slice of the year's.
+        """
+        lo, hi = self._date_bounds(start_date, end_date)
+        stack = self.stacks[side]
+        stack_dates = self.stack_dates[side]
+        parts = {}
+        for code, (first, last) in enumerate(self._gsp_ranges(side)):
+            gsp = self.gsp_ids[code]
+            if gsp_group_ids is not None and gsp not in gsp_group_ids:
+                continue
+            dates = stack_dates[first:last]
+            part_first = first + int(np.searchsorted(dates, lo, side='left'))
+            part_last = first + int(np.searchsorted(dates, hi, side='left'))
+            if part_last > part_first:
+                parts[gsp] = stack.part(part_first, part_last)
+        return parts
+
+    def gsp_group_ids(self, start_date, end_date):
+        """GSP groups with rows in an inclusive date range."""
+        lo, hi = self._date_bounds(start_date, end_date)
+        return [self.gsp_ids[code] for code in np.flatnonzero(self.presence[lo:hi].any(axis=0))]
+
+
+class MeritIndexStore:
+    """
+    Prebuilt merit stacks, ``merit/{year}/{version}/``, so simulations only binary
+    search them instead of sorting BOA rows on every request. Every array of
+    each side's ``MeritStack`` (sorted prices, cumulative volumes, the next
+    energy (SO flag 0) position, offsets, ...) is its own ``.npy`` file and
+    is memory-mapped read-only when loaded, so server processes share them.
+
+    A year's index records the processed CSV signature it was built from
+    (as the BOA store does) and is rebuilt when that changes. Like the BOA
+    store, ``merit/{year}/CURRENT`` names the live version.
+    """
+
+    def __init__(self, data_dir):
+        self.index_dir = os.path.join(data_dir, 'merit')
+        self._loaded = {}
+
+    def year_dir(self, year):
+        return os.path.join(self.index_dir, str(year))
+
+    def version_dir(self, year):
+        return _current_version(self.year_dir(year))
+
+    def exists(self, year):
+        return self.version_dir(year) is not None
+
+    def is_current(self, year, signature):
+        version = self.version_dir(year)
+        if version is None:
+            return False
+        with open(os.path.join(version, '_SOURCE')) as f:
+            return json.load(f) == signature
+
+    def build(self, year, df, signature):
+        """Sort the BOA rows of a year (as read from the BOA store) into its index."""
+        gsp_ids, period_index, offer_stack, bid_stack = build_merit_stacks(df)
+        period_dates = pd.to_datetime(period_index['settlement_date']).to_numpy().astype('datetime64[D]')
+        dates = np.unique(period_dates)
+        period_date_codes = np.searchsorted(dates, period_dates).astype(np.int32)
+
+        row_dates = np.searchsorted(dates, pd.to_datetime(df['settlement_date']).to_numpy().astype('datetime64[D]'))
+        row_gsps = gsp_ids.get_indexer(df['gsp_group_id'])
+        presence = np.zeros((len(dates), len(gsp_ids)), dtype=bool)
+        known = row_gsps >= 0
+        presence[row_dates[known], row_gsps[known]] = True
+
+        # Written as a new version and published once complete, like the BOA store
+        version = _new_version(self.year_dir(year))
+        for side, stack in (('offer', offer_stack), ('bid', bid_stack)):
+            os.makedirs(os.path.join(version, side))
+            for name in MeritStack.STORED_ARRAYS:
+                np.save(os.path.join(version, side, f'{name}.npy'), np.ascontiguousarray(getattr(stack, name)))
+            np.save(os.path.join(version, side, 'stack_date.npy'), period_date_codes[stack.stack_period])
+        np.save(os.path.join(version, 'dates.npy'), dates)
+        np.save(os.path.join(version, 'presence.npy'), presence)
+        _atomic_write_text(os.path.join(version, 'gsp_ids.json'), json.dumps([str(gsp) for gsp in gsp_ids]))
+        _atomic_write_text(os.path.join(version, '_SOURCE'), json.dumps(signature))
+
+        _publish_version(self.year_dir(year), version)
+        self._loaded.pop(year, None)
+
+    def load(self, year):
+        """The MeritIndex of a year, memory-mapped (and kept) on first use; None if not built."""
+        # Everything is read from the one version CURRENT names now, so a
+        # concurrent rebuild can't mix two versions into one index
+        version = self.version_dir(year)
+        if version is None:
+            return None
+        loaded = self._loaded.get(year)
+        if loaded is not None and loaded[0] == version:
+            return loaded[1]
+
+        with open(os.path.join(version, 'gsp_ids.json')) as f:
+            gsp_ids = pd.Index(json.load(f))
+        stacks = {}
+        stack_dates = {}
+        for side, ascending in SIDES.items():
+            arrays = {name: np.load(os.path.join(version, side, f'{name}.npy'), mmap_mode='r') for name in MeritStack.STORED_ARRAYS}
+            stacks[side] = MeritStack.from_arrays(arrays, ascending=ascending)
+            stack_dates[side] = np.load(os.path.join(version, side, 'stack_date.npy'), mmap_mode='r')
+        index = MeritIndex(
+            year,
+            gsp_ids,
+            np.load(os.path.join(version, 'dates.npy')),
+            stacks,
+            stack_dates,
+            np.load(os.path.join(version, 'presence.npy')),
+        )
+        self._loaded[year] = (version, index)
+        return index
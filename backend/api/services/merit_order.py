@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+
+# Slack allowed when deciding whether a stack position fits inside the
+# accepted volume for the period
+VOLUME_TOLERANCE = 0.0001
+
+
+class MeritStack:
+    """
+    Sorted merit stacks for one side of the market (offers or bids), one stack
+    per (gsp, settlement_date, settlement_period), packed into flat arrays.
+
+    Stack ``s`` occupies rows ``offsets[s]:offsets[s + 1]``. Rows are ordered by
+    ``keys`` (the price for offers, the negated price for bids, so both sides
+    are ascending), ties keeping their original row order like a stable sort.
+    A hypothetical asset therefore lands after every accepted action with an
+    equal or better price.
+    """
+
+    def __init__(self, offsets, keys, volumes, energy, stack_gsp, stack_period, ascending=True):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.keys = np.asarray(keys, dtype=np.float64)
+        self.volumes = np.asarray(volumes, dtype=np.float64)
+        self.energy = np.asarray(energy, dtype=bool)
+        self.stack_gsp = np.asarray(stack_gsp, dtype=np.int64)
+        self.stack_period = np.asarray(stack_period, dtype=np.int64)
+        self.ascending = ascending
+
+        self.starts = self.offsets[:-1]
+        self.ends = self.offsets[1:]
+        n_rows = len(self.keys)
+        stack_of_row = np.repeat(np.arange(len(self.starts)), np.diff(self.offsets))
+
+        # Running volume within each stack and each stack's total volume
+        self.cumulative = pd.Series(self.volumes).groupby(stack_of_row).cumsum().to_numpy()
+        self.totals = np.add.reduceat(self.volumes, self.starts) if n_rows else np.zeros(0)
+
+        # Composite (stack, price rank) key: ascending across the whole array,
+        # so one searchsorted finds a price's position in every stack at once
+        self.unique_keys = np.unique(self.keys)
+        self._width = len(self.unique_keys) + 1
+        self._composite = stack_of_row * self._width + np.searchsorted(self.unique_keys, self.keys)
+
+        # Index of the next energy (SO flag 0) row at or after each position
+        energy_idx = np.where(self.energy, np.arange(n_rows), n_rows)
+        self._next_energy = np.r_[np.minimum.accumulate(energy_idx[::-1])[::-1], n_rows]
+
+    # Everything a stack holds, including what __init__ derives; a stack is
+    # rebuilt from these by from_arrays without recomputing anything
+    STORED_ARRAYS = [
+        'offsets', 'keys', 'volumes', 'energy', 'stack_gsp', 'stack_period',
+        'cumulative', 'totals', 'unique_keys', '_composite', '_next_energy',
+    ]
+
+    @classmethod
+    def from_arrays(cls, arrays, ascending=True):
+        """A stack over ``STORED_ARRAYS`` saved from another, e.g. memory-mapped from a merit index."""
+        stack = cls.__new__(cls)
+        for name in cls.STORED_ARRAYS:
+            setattr(stack, name, arrays[name])
+        stack.ascending = ascending
+        stack.starts = stack.offsets[:-1]
+        stack.ends = stack.offsets[1:]
+        stack._width = len(stack.unique_keys) + 1
+        return stack
+
+    def part(self, first, last):
+        """
+        Stacks ``first`` to ``last - 1`` (e.g. one GSP group's, as stacks are
+        sorted by GSP) as a stack of their own. Built from this stack's arrays
+        without recomputing anything; most of them are views.
+        """
+        row_first, row_last = int(self.offsets[first]), int(self.offsets[last])
+        rows = slice(row_first, row_last)
+        part = MeritStack.__new__(MeritStack)
+        part.offsets = self.offsets[first:last + 1] - row_first
+        part.keys = self.keys[rows]
+        part.volumes = self.volumes[rows]
+        part.energy = self.energy[rows]
+        part.stack_gsp = self.stack_gsp[first:last]
+        part.stack_period = self.stack_period[first:last]
+        part.cumulative = self.cumulative[rows]
+        part.totals = self.totals[first:last]
+        part.unique_keys = self.unique_keys
+        part._width = self._width
+        # Rebased so the part's first stack is stack 0 and its first row row 0;
+        # energy rows past the part count as none, like the end of the array
+        part._composite = self._composite[rows] - first * self._width
+        part._next_energy = np.minimum(self._next_energy[row_first:row_last + 1], row_last) - row_first
+        part.ascending = self.ascending
+        part.starts = part.offsets[:-1]
+        part.ends = part.offsets[1:]
+        return part
+
+    @property
+    def n_stacks(self):
+        return len(self.starts)
+
+    def _price_key(self, price):
+        return price if self.ascending else -price
+
+    def locate(self, price):
+        """
+        Row positions of ``price`` in every stack: ``(first_equal, insert)``,
+        where the asset is inserted after any equally priced actions.
+        ``price`` may be a scalar or an array with one value per stack.
+        """
+        key = np.broadcast_to(np.asarray(self._price_key(price), dtype=np.float64), self.starts.shape)
+        base = np.arange(self.n_stacks) * self._width
+        rank_lo = np.searchsorted(self.unique_keys, key, side='left')
+        rank_hi = np.searchsorted(self.unique_keys, key, side='right')
+        first_equal = np.searchsorted(self._composite, base + rank_lo, side='left')
+        insert = np.searchsorted(self._composite, base + rank_hi, side='left')
+        return first_equal, insert
+
+    def evaluate(self, price, volume):
+        """
+        Place a hypothetical action of ``volume`` at ``price`` in every stack.
+
+        Returns boolean arrays ``(in_merit, accepted)`` per stack: whether the
+        asset falls within the period's accepted volume, and whether it is also
+        priced within the energy (SO flag 0) part of the accepted stack.
+        """
+        return self.evaluate_at(self.locate(price), volume)
+
+    def evaluate_at(self, location, volume):
+        """``evaluate`` for a price already placed with ``locate``."""
+        first_equal, insert = location
+        threshold = self.totals + VOLUME_TOLERANCE
+        cumulative = np.r_[self.cumulative, 0.0]
+
+        volume_before = np.where(insert > self.starts, cumulative[insert - 1], 0.0)
+        in_merit = (volume_before + volume) <= threshold
+
+        # Equally priced energy actions ahead of the asset
+        tie = self._next_energy[first_equal]
+        tie_ok = (tie < insert) & (cumulative[tie] <= threshold)
+        # Cheapest energy action behind the asset; later ones only sit deeper
+        after = self._next_energy[insert]
+        after_ok = (after < self.ends) & ((cumulative[after] + volume) <= threshold)
+
+        accepted = in_merit & (tie_ok | after_ok)
+        return in_merit, accepted
+
+
+def build_merit_stacks(df):
+    """
+    Build offer and bid ``MeritStack``s from processed BOA rows.
+
+    Returns ``(gsp_ids, period_index, offer_stack, bid_stack)`` where
+    ``stack_gsp`` indexes ``gsp_ids`` (first-appearance order) and
+    ``stack_period`` indexes the ``(settlement_date, settlement_period)``
+    rows of ``period_index``.
+    """
+    gsp_codes, gsp_ids = pd.factorize(df['gsp_group_id'])
+    period_groups = df.groupby(['settlement_date', 'settlement_period'], sort=True)
+    period_codes = period_groups.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    period_index = period_groups.size().index.to_frame(index=False)
+
+    prices = df['accepted_price'].to_numpy(dtype=np.float64)
+    volumes = df['total_volume_accepted'].to_numpy(dtype=np.float64)
+    energy = df['system_operator_flag'].to_numpy() == 0
+    valid = (gsp_codes >= 0) & (period_codes >= 0)
+
+    stacks = []
+    for side_mask, ascending in ((volumes > 0, True), (volumes < 0, False)):
+        rows = np.flatnonzero(valid & side_mask)
+        keys = prices[rows] if ascending else -prices[rows]
+        order = rows[np.lexsort((keys, period_codes[rows], gsp_codes[rows]))]
+
+        row_gsp = gsp_codes[order]
+        row_period = period_codes[order]
+        boundary = np.r_[True, (row_gsp[1:] != row_gsp[:-1]) | (row_period[1:] != row_period[:-1])]
+        starts = np.flatnonzero(boundary[:len(order)])
+        offsets = np.r_[starts, len(order)]
+
+        stacks.append(MeritStack(
+            offsets=offsets,
+            keys=prices[order] if ascending else -prices[order],
+            volumes=np.abs(volumes[order]),
+            energy=energy[order],
+            stack_gsp=row_gsp[starts],
+            stack_period=row_period[starts],
+            ascending=ascending,
+        ))
+
+    return gsp_ids, period_index, stacks[0], stacks[1]
+
+
+def count_periods(stack, capacities, prices, n_gsp):
+    """
+    Periods per GSP group in which an asset of each capacity (MW, offering
+    ``capacity / 2`` MWh per period) at each price is accepted or skipped.
+
+    Returns two int64 arrays ``(accepted, skipped)`` of shape
+    ``(len(capacities), len(prices), n_gsp)``; a ``None`` price counts nothing.
+    """
+    accepted = np.zeros((len(capacities), len(prices), n_gsp), dtype=np.int64)
+    skipped = np.zeros_like(accepted)
+    for j, price in enumerate(prices):
+        if price is None:
+            continue
+        location = stack.locate(price)
+        for i, capacity in enumerate(capacities):
+            in_merit, ok = stack.evaluate_at(location, capacity / 2)
+            accepted[i, j] = np.bincount(stack.stack_gsp[ok], minlength=n_gsp)
+            skipped[i, j] = np.bincount(stack.stack_gsp[in_merit & ~ok], minlength=n_gsp)
+    return accepted, skipped
@@ -0,0 +1,139 @@
+import multiprocessing
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .merit_order import MeritStack, count_periods
+
+# Raw MeritStack arrays shared with the workers; everything else in a stack
+# is derived from these when a worker first sees a GSP's rows
+STACK_ARRAYS = ['offsets', 'keys', 'volumes', 'energy', 'stack_gsp', 'stack_period']
+
+# Per-worker cache of rebuilt GSP stacks, most recently used last
+MAX_CACHED_PARTS = 64
+
+
+class SharedStacks:
+    """
+    The offer and bid stacks of one AssetBenchmark copied into shared memory.
+    ``spec`` is the small picklable description workers attach with; the
+    blocks are unlinked by ``close()`` or when this object is collected.
+    """
+
+    def __init__(self, stacks):
+        self.spec = {}
+        blocks = []
+        for side, stack in stacks.items():
+            arrays = {}
+            for name in STACK_ARRAYS:
+                array = getattr(stack, name)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                blocks.append(block)
+                arrays[name] = (block.name, array.dtype.str, array.shape)
+            self.spec[side] = {'ascending': stack.ascending, 'arrays': arrays}
+        self._finalizer = weakref.finalize(self, _release, blocks)
+
+    def close(self):
+        self._finalizer()
+
+
+def _release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers):
+    """A process pool with ``workers`` processes, shared by every benchmark in this process."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            # spawn: the web server process may be running threads
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[workers] = pool
+        return pool
+
+
+def gsp_parts(stack, n_gsp):
+    """``(first_stack, last_stack)`` ranges of each GSP group; stacks are sorted by GSP."""
+    codes = np.arange(n_gsp)
+    firsts = np.searchsorted(stack.stack_gsp, codes, side='left')
+    lasts = np.searchsorted(stack.stack_gsp, codes, side='right')
+    return [(int(f), int(l)) for f, l in zip(firsts, lasts) if l > f]
+
+
+def side_counts(shared, side, stack, capacities, prices, n_gsp, workers, on_gsp=None):
+    """
+    count_periods for one side, one task per GSP group on the worker pool.
+    ``on_gsp(code)`` is called as each group's task finishes, if given.
+    """
+    pool = get_pool(workers)
+    futures = {
+        pool.submit(_count_part, shared.spec[side], first, last, capacities, prices, n_gsp): first
+        for first, last in gsp_parts(stack, n_gsp)
+    }
+    accepted = np.zeros((len(capacities), len(prices), n_gsp), dtype=np.int64)
+    skipped = np.zeros_like(accepted)
+    for future in as_completed(futures):
+        part_accepted, part_skipped = future.result()
+        accepted += part_accepted
+        skipped += part_skipped
+        if on_gsp is not None:
+            on_gsp(int(stack.stack_gsp[futures[future]]))
+    return accepted, skipped
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+_parts = OrderedDict()
+
+
+def _part_stack(spec, first, last):
+    key = (spec['arrays']['keys'][0], first, last)
+    if key in _parts:
+        _parts.move_to_end(key)
+        return _parts[key][1]
+
+    blocks, arrays = [], {}
+    for name, (block_name, dtype, shape) in spec['arrays'].items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    offsets = arrays['offsets'][first:last + 1]
+    rows = slice(offsets[0], offsets[-1])
+    stack = MeritStack(
+        offsets=offsets - offsets[0],
+        keys=arrays['keys'][rows],
+        volumes=arrays['volumes'][rows],
+        energy=arrays['energy'][rows],
+        stack_gsp=arrays['stack_gsp'][first:last],
+        stack_period=arrays['stack_period'][first:last],
+        ascending=spec['ascending'],
+    )
+
+    _parts[key] = (blocks, stack)
+    while len(_parts) > MAX_CACHED_PARTS:
+        old_blocks, old_stack = _parts.popitem(last=False)[1]
+        del old_stack
+        for block in old_blocks:
+            try:
+                block.close()
+            except BufferError:
+                # Still referenced by a stack that is in use; freed with the process
+                pass
+    return stack
+
+
+def _count_part(spec, first, last, capacities, prices, n_gsp):
+    return count_periods(_part_stack(spec, first, last), capacities, prices, n_gsp)
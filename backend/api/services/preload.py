@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+from .core_cache import pa
+from .core_store import TABLE_KEYS
+
+# Startup preload progress, reported by the ready/ endpoint
+state = {
+    'status': 'idle',
+    'years': [],
+    'tables': 0,
+    'seconds': None,
+    'error': None,
+}
+
+# This process's background preload thread, if any
+_thread = None
+
+
+def preload_years():
+    """Years listed in CORE_PRELOAD_YEARS (comma separated), e.g. ``2024,2025``."""
+    value = os.environ.get('CORE_PRELOAD_YEARS', '')
+    return [int(year) for year in value.split(',') if year.strip()]
+
+
+def preload(data_processor, years):
+    """
+    Write a current snapshot of every table of ``years`` and map it into the
+    shared core cache. Run before the server forks its workers (gunicorn
+    --preload), the workers inherit the mappings; otherwise each worker maps
+    the same snapshot files, which the OS still shares between them.
+    """
+    cache = data_processor.core_cache
+    state.update(status='loading', years=list(years), tables=0, error=None)
+    started = time.perf_counter()
+    try:
+        for year in years:
+            for table in TABLE_KEYS:
+                if not data_processor.core_store.exists(year, table):
+                    continue
+                if not cache.snapshot_is_current(year, table):
+                    print(f'Writing {table} snapshot for {year}...')
+                    cache.write_snapshot(year, table)
+                    # Drop the copy read to write it; the next get maps the snapshot
+                    cache.evict(year, table)
+                cache.get_year(year, table)
+                state['tables'] += 1
+    except Exception as e:
+        print(f'Preload failed: {e}')
+        state.update(status='failed', error=str(e))
+        return
+    state.update(status='ready', seconds=round(time.perf_counter() - started, 3))
+    print(f"Preloaded {state['tables']} core tables for {', '.join(map(str, years))} in {state['seconds']}s.")
+
+
+def running():
+    """Whether a background preload is running in this process."""
+    return _thread is not None and _thread.is_alive()
+
+
+def snapshots_current(data_processor, years):
+    """Whether every stored table of ``years`` has a current snapshot on disk."""
+    cache = data_processor.core_cache
+    return all(
+        cache.snapshot_is_current(year, table)
+        for year in years
+        for table in TABLE_KEYS
+        if data_processor.core_store.exists(year, table)
+    )
+
+
+def _start_background(data_processor, years):
+    global _thread
+    state['status'] = 'loading'
+    _thread = threading.Thread(target=preload, args=(data_processor, years), name='core-preload', daemon=True)
+    _thread.start()
+
+
+def _after_fork(data_processor, years):
+    # Threads don't survive fork: a worker forked (gunicorn --preload) while
+    # the master was still loading runs its own preload
+    global _thread
+    _thread = None
+    if state['status'] == 'loading':
+        _start_background(data_processor, years)
+
+
+def preload_from_env():
+    """
+    Preload CORE_PRELOAD_YEARS, in a background thread when
+    CORE_PRELOAD_BACKGROUND is set (the ready/ endpoint reports when it is
+    done). A background preload still running when the process forks is
+    started again in the child.
+    """
+    years = preload_years()
+    if not years:
+        return
+    if pa is None:
+        print('CORE_PRELOAD_YEARS is set but pyarrow is not installed; skipping the preload.')
+        return
+    from .data_processor import DataProcessor
+    data_processor = DataProcessor()
+    if os.environ.get('CORE_PRELOAD_BACKGROUND', '').lower() in ('1', 'true', 'yes'):
+        _start_background(data_processor, years)
+        os.register_at_fork(after_in_child=lambda: _after_fork(data_processor, years))
+    else:
+        preload(data_processor, years)
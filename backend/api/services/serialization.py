@@ -0,0 +1,102 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Response shapes for tabular data: a list of row objects (the original
+# shape) or one array per column
+ORIENTS = ('records', 'split')
+
+
+def _column_values(values):
+    """A column as a plain list with NaN/inf/NaT replaced by None."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'M':
+        # ISO 8601 like DjangoJSONEncoder, e.g. 2024-03-25T00:00:00
+        missing = np.isnat(values)
+        values = np.datetime_as_string(values, unit='s').astype(object)
+        values[missing] = None
+    elif values.dtype.kind == 'f':
+        missing = ~np.isfinite(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+    elif values.dtype.kind == 'O':
+        missing = pd.isna(values)
+        if missing.any():
+            values = values.copy()
+            values[missing] = None
+    return values.tolist()
+
+
+def frame_records(df):
+    """``df`` as a list of ``{column: value}`` rows, NaN/inf masked to None."""
+    names = list(df.columns)
+    columns = [_column_values(df[name].to_numpy()) for name in names]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def frame_columns(df):
+    """``df`` as ``{column: array}``; numeric arrays are masked when encoded."""
+    columns = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        columns[name] = _column_values(values) if values.dtype.kind == 'M' else values
+    return columns
+
+
+def frame_arrow(df, metadata=None):
+    """
+    ``df`` as Arrow IPC stream bytes, with ``metadata`` (str to str) added to
+    the schema. Columns keep their dtypes; requires pyarrow.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _default(obj):
+    # Types neither encoder handles natively: object/masked NumPy arrays and scalars
+    if isinstance(obj, np.ndarray):
+        return _column_values(obj)
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and not np.isfinite(value):
+            return None
+        return value
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """Encode ``data`` as JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        # orjson writes NumPy arrays directly and NaN/inf as null
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(_encodable(data), default=_default, allow_nan=False).encode()
+
+
+def _encodable(data):
+    # The stdlib encoder would write float arrays as NaN; mask them first
+    if isinstance(data, dict):
+        return {key: _encodable(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_encodable(value) for value in data]
+    if isinstance(data, np.ndarray):
+        return _column_values(data)
+    if isinstance(data, float) and not np.isfinite(data):
+        return None
+    return data
@@ -0,0 +1,152 @@
+import io
+from datetime import date as date_cls
+
+import pandas as pd
+from django.db import connections, models, transaction
+
+from ..models import CoreLoad, CorePeriod, DailyRollup, HourlyRollup
+from .core_store import TABLE_KEYS, _to_date
+
+# Tables stored per GSP group; the national tables are summed from them in
+# the query
+TABLE_MODELS = {
+    'core': CorePeriod,
+    'hourly': HourlyRollup,
+    'daily': DailyRollup,
+}
+
+# National table -> GSP table it is summed from
+NATIONAL_SOURCES = {
+    'national': 'core',
+    'hourly_national': 'hourly',
+    'daily_national': 'daily',
+}
+
+# Rows per executemany batch when COPY is not available
+INSERT_BATCH_SIZE = 5000
+
+
+class SqlCoreStore:
+    """
+    Core rows and their per-GSP rollups in the Django database (``using``),
+    so several app instances can read one store. Reads filter on
+    settlement_date in SQL, using the composite key indexes, and the national
+    tables are GSP sums computed by the database.
+
+    Frames come back like CoreStore's: sorted by the table's key columns, with
+    settlement_date as ``YYYY-MM-DD`` strings.
+    """
+
+    def __init__(self, using='default'):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+    def load(self, year, df, table='core'):
+        """
+        Replace a year of ``table`` with the rows of ``df`` (as read from
+        CoreStore), with COPY on PostgreSQL and batched executemany elsewhere.
+        """
+        model = TABLE_MODELS[table]
+        columns = [field.column for field in model._meta.concrete_fields if not field.primary_key]
+        frame = df.reindex(columns=columns)
+        frame['settlement_date'] = pd.to_datetime(frame['settlement_date']).dt.date
+
+        with transaction.atomic(using=self.using):
+            model.objects.using(self.using).filter(settlement_date__year=year).delete()
+            if self.connection.vendor == 'postgresql':
+                self._copy(model, columns, frame)
+            else:
+                self._insert(model, columns, frame)
+            CoreLoad.objects.using(self.using).update_or_create(year=year, table=table, defaults={'rows': len(frame)})
+
+        if self.connection.vendor == 'postgresql':
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {self._quote(model._meta.db_table)}')
+        return len(frame)
+
+    def _copy(self, model, columns, frame):
+        buffer = io.StringIO()
+        frame.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        column_list = ', '.join(self._quote(column) for column in columns)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {self._quote(model._meta.db_table)} ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+    def _insert(self, model, columns, frame):
+        column_list = ', '.join(self._quote(column) for column in columns)
+        placeholders = ', '.join(['%s'] * len(columns))
+        sql = f'INSERT INTO {self._quote(model._meta.db_table)} ({column_list}) VALUES ({placeholders})'
+        # Missing values become NULL; object dtype gives plain Python scalars
+        values = frame.astype(object).where(frame.notna(), None).to_numpy()
+        with self.connection.cursor() as cursor:
+            for start in range(0, len(values), INSERT_BATCH_SIZE):
+                cursor.executemany(sql, [tuple(row) for row in values[start:start + INSERT_BATCH_SIZE]])
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+    def exists(self, year, table='core'):
+        table = NATIONAL_SOURCES.get(table, table)
+        return CoreLoad.objects.using(self.using).filter(year=year, table=table).exists()
+
+    def version(self, years):
+        """``(year, table, rows, loaded_at)`` of the loads behind ``years``, for data versions."""
+        loads = CoreLoad.objects.using(self.using).filter(year__in=list(years)).order_by('year', 'table')
+        return [(load.year, load.table, load.rows, load.loaded_at.isoformat()) for load in loads]
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def read_day(self, date, columns=None, table='core'):
+        return self.read_range(date, date, columns=columns, table=table)
+
+    def read_range(self, start_date, end_date, columns=None, table='core'):
+        """
+        Rows with ``start_date <= settlement_date <= end_date`` (inclusive).
+        National tables are summed over GSP groups by the database.
+        """
+        start_date, end_date = _to_date(start_date), _to_date(end_date)
+        keys = TABLE_KEYS[table]
+        source = NATIONAL_SOURCES.get(table, table)
+        model = TABLE_MODELS[source]
+        fields = {field.column: field for field in model._meta.concrete_fields if not field.primary_key}
+        values = [column for column in (columns or fields) if column in fields and column not in TABLE_KEYS[source]]
+
+        db_table = self._quote(model._meta.db_table)
+        key_list = ', '.join(self._quote(key) for key in keys)
+        if table in NATIONAL_SOURCES:
+            selected = [self._sum(fields[column]) for column in values]
+            group_by = f' GROUP BY {key_list}'
+        else:
+            selected = [self._quote(column) for column in values]
+            group_by = ''
+        sql = (
+            f'SELECT {", ".join([key_list] + selected)} FROM {db_table}'
+            f' WHERE {self._quote("settlement_date")} BETWEEN %s AND %s{group_by} ORDER BY {key_list}'
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [start_date, end_date])
+            rows = cursor.fetchall()
+
+        df = pd.DataFrame.from_records(rows, columns=keys + values)
+        # SQLite returns dates as text, PostgreSQL as date objects
+        df['settlement_date'] = df['settlement_date'].map(lambda d: d.isoformat() if isinstance(d, date_cls) else d)
+        if columns is not None:
+            df = df[[column for column in dict.fromkeys(['settlement_date'] + list(columns)) if column in df.columns]]
+        return df
+
+    def _sum(self, field):
+        column = self._quote(field.column)
+        # SUM of a bigint is numeric on PostgreSQL; keep counts integral
+        if isinstance(field, models.BigIntegerField):
+            return f'CAST(SUM({column}) AS BIGINT) AS {column}'
+        return f'SUM({column}) AS {column}'
+
+    def _quote(self, name):
+        return self.connection.ops.quote_name(name)
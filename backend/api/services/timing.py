@@ -0,0 +1,119 @@
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Request timing is opt-in: with REQUEST_TIMING unset, span() only checks a
+# context variable
+ENABLED = os.environ.get('REQUEST_TIMING', '').lower() in ('1', 'true', 'yes')
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_spans = contextvars.ContextVar('timing_spans', default=None)
+
+
+def start():
+    """Begin recording spans for the current request; pass the token to finish()."""
+    return _spans.set([])
+
+
+def finish(token):
+    """Stop recording and return the ``(stage, seconds)`` spans in completion order."""
+    spans = _spans.get()
+    _spans.reset(token)
+    return spans or []
+
+
+@contextmanager
+def span(stage):
+    """Time the enclosed block as ``stage`` when the current request is being timed."""
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((stage, time.perf_counter() - started))
+
+
+def stage_totals(spans):
+    """Total seconds per stage, in the order stages first finished. Nested stages overlap."""
+    totals = {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return totals
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+        self.total += seconds
+        self.count += 1
+
+    def render(self, name, labels):
+        lines = []
+        for bound, count in zip(BUCKETS, self.counts):
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class Metrics:
+    """
+    Request counters and request/stage duration histograms, in Prometheus
+    text format. They are kept in memory per process: under a multi-worker
+    server each scrape of ``metrics/`` reports the worker that answered it,
+    so scrape every worker (or run one) to see all requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.request_seconds = {}
+        self.stage_seconds = {}
+
+    def observe_request(self, endpoint, status, seconds, stages):
+        with self._lock:
+            key = (endpoint, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.request_seconds.setdefault(endpoint, Histogram()).observe(seconds)
+            for stage, stage_seconds in stages.items():
+                self.stage_seconds.setdefault((endpoint, stage), Histogram()).observe(stage_seconds)
+
+    def render(self):
+        with self._lock:
+            lines = [
+                '# HELP bmview_requests_total Requests served, by endpoint and status.',
+                '# TYPE bmview_requests_total counter',
+            ]
+            for (endpoint, status), count in sorted(self.requests.items()):
+                lines.append(f'bmview_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+            lines += [
+                '# HELP bmview_request_seconds Request duration.',
+                '# TYPE bmview_request_seconds histogram',
+            ]
+            for endpoint, histogram in sorted(self.request_seconds.items()):
+                lines += histogram.render('bmview_request_seconds', f'endpoint="{endpoint}"')
+            lines += [
+                '# HELP bmview_stage_seconds Time spent in each stage of a request.',
+                '# TYPE bmview_stage_seconds histogram',
+            ]
+            for (endpoint, stage), histogram in sorted(self.stage_seconds.items()):
+                lines += histogram.render('bmview_stage_seconds', f'endpoint="{endpoint}",stage="{stage}"')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
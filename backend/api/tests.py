@@ -0,0 +1,42 @@
+import pandas as pd
+from django.test import SimpleTestCase
+
+from .services.downsample import resample
+
+
+def _national_periods(days):
+    # One row per settlement period of each (date, periods) day, boas_count 1
+    rows = [
+        {'settlement_date': day, 'settlement_period': period, 'boas_count': 1}
+        for day, periods in days
+        for period in range(1, periods + 1)
+    ]
+    return pd.DataFrame(rows)
+
+
+class HourlyResampleTests(SimpleTestCase):
+    def test_short_day_has_23_hours_without_0100(self):
+        out = resample(_national_periods([('2024-03-31', 46), ('2024-04-01', 48)]), 'hour')
+
+        self.assertEqual(len(out), 23 + 24)
+        self.assertTrue((out['boas_count'] == 2).all())
+        labels = out['settlement_date'].dt.strftime('%Y-%m-%d %H:%M').tolist()
+        self.assertEqual(labels[:3], ['2024-03-31 00:00', '2024-03-31 02:00', '2024-03-31 03:00'])
+        self.assertEqual(labels[22:24], ['2024-03-31 23:00', '2024-04-01 00:00'])
+
+    def test_long_day_keeps_its_25th_hour_out_of_the_next_day(self):
+        out = resample(_national_periods([('2024-10-26', 48), ('2024-10-27', 50), ('2024-10-28', 48)]), 'hour')
+
+        self.assertEqual(len(out), 24 + 25 + 24)
+        self.assertTrue((out['boas_count'] == 2).all())
+        labels = out['settlement_date'].dt.strftime('%Y-%m-%d %H:%M').tolist()
+        self.assertEqual(labels.count('2024-10-27 01:00'), 2)
+        self.assertEqual(labels.count('2024-10-28 00:00'), 1)
+        self.assertEqual(labels[48], '2024-10-27 23:00')
+
+    def test_hourly_rollup_rows_match_period_rows(self):
+        periods = _national_periods([('2024-03-31', 46), ('2024-10-27', 50)])
+        hourly = periods.assign(hour=(periods['settlement_period'] - 1) // 2)
+        hourly = hourly.groupby(['settlement_date', 'hour'], as_index=False)['boas_count'].sum()
+
+        pd.testing.assert_frame_equal(resample(hourly, 'hour'), resample(periods, 'hour'))
@@ -1,9 +1,19 @@
 from django.urls import path
-from .views import daily_data, time_series_data, available_variables, asset_benchmark_data
+from .views import (
+    daily_data, daily_data_range, time_series_data, available_variables, asset_benchmark_data, asset_benchmark_sweep,
+    asset_benchmark_jobs, asset_benchmark_job, asset_benchmark_job_result, metrics, ready,
+)
 
 urlpatterns = [
     path('daily-data/', daily_data, name='daily_data'),
+    path('daily-data/range/', daily_data_range, name='daily_data_range'),
     path('time-series/', time_series_data, name='time_series_data'),
     path('available-variables/', available_variables, name='available_variables'),
     path('asset-benchmark/', asset_benchmark_data, name='asset_benchmark_data'),
+    path('asset-benchmark/sweep/', asset_benchmark_sweep, name='asset_benchmark_sweep'),
+    path('asset-benchmark/jobs/', asset_benchmark_jobs, name='asset_benchmark_jobs'),
+    path('asset-benchmark/jobs/<str:job_id>/', asset_benchmark_job, name='asset_benchmark_job'),
+    path('asset-benchmark/jobs/<str:job_id>/result/', asset_benchmark_job_result, name='asset_benchmark_job_result'),
+    path('metrics/', metrics, name='metrics'),
+    path('ready/', ready, name='ready'),
 ] 
\ No newline at end of file
@@ -1,12 +1,132 @@
-from django.http import JsonResponse
-from datetime import datetime
-from .services.data_processor import DataProcessor
-from .services.asset_benchmark import AssetBenchmark
-import pandas as pd
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.vary import vary_on_headers
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial, wraps
+import copy
 import os
+import threading
+from .services.data_processor import NUMERIC_COLUMNS, DataProcessor
+from .services.serialization import ORIENTS, dumps, frame_columns, frame_records
+from .services.downsample import DEFAULT_MAX_POINTS, RESOLUTIONS, choose_resolution, downsample, year_chunks
+from .services.job_queue import JobQueue
+from .services.benchmark_jobs import JOB_KINDS
+from .services import preload, timing
+from .services.timing import span
+from .responses import ArrowResponse, FastJsonResponse, arrow_available, ndjson_lines, ndjson_response, response_format
+from .response_cache import response_cache_from_env
+import pandas as pd
+import numpy as np
 
 data_processor = DataProcessor()
+# Background asset benchmark jobs, persisted next to the data
+job_queue = JobQueue(os.path.join(data_processor.data_dir, 'jobs'))
+# Responses of the read-only endpoints, keyed by parameters and data version
+response_cache = response_cache_from_env(os.path.join(data_processor.data_dir, 'response_cache'))
+
+# Upper bound on capacity x bid x offer points for one sweep request
+MAX_SWEEP_POINTS = 10000
+
+# Response formats of the time-series and asset benchmark endpoints; ndjson
+# streams the result a year (or GSP group) at a time. Arrow is also chosen
+# by an Accept header naming the Arrow stream type.
+FORMATS = ('json', 'ndjson', 'arrow')
+
+# Tables of a daily-data response; an Arrow response holds one of them
+DAILY_TABLES = ('settlement_period', 'hourly', 'daily')
+
+# Longest range daily-data/range/ returns in one response
+MAX_DAILY_RANGE_DAYS = 31
+
+# Days either side of a served daily-data date whose responses are warmed in
+# the background (0 disables it); needs the response cache
+DAILY_PREFETCH_DAYS = int(os.environ.get('DAILY_PREFETCH_DAYS', 0))
+_prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='daily-prefetch') if DAILY_PREFETCH_DAYS else None
+_prefetch_pending = set()
+_prefetch_lock = threading.Lock()
+
+def _format_error(fmt, formats):
+    if fmt not in formats:
+        return JsonResponse({'error': f"format must be one of {', '.join(formats)}"}, status=400)
+    if fmt == 'arrow' and not arrow_available():
+        return JsonResponse({'error': 'Arrow responses are not available on this server'}, status=406)
+    return None
+
+def _years_between(start_date_str, end_date_str):
+    start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
+    end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
+    return range(start_date.year, end_date.year + 1)
+
+def _daily_data_version(request):
+    try:
+        year = datetime.strptime(request.GET.get('date', ''), '%d-%m-%Y').year
+    except ValueError:
+        return None
+    return data_processor.data_version([year])
+
+def _daily_range_version(request):
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%d-%m-%Y')
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%d-%m-%Y')
+    except ValueError:
+        return None
+    return data_processor.data_version(range(start_date.year, end_date.year + 1))
+
+def _time_series_version(request):
+    try:
+        years = _years_between(request.GET.get('start_date', ''), request.GET.get('end_date', ''))
+    except ValueError:
+        return None
+    return data_processor.data_version(years)
+
+def _asset_benchmark_version(request):
+    try:
+        years = _years_between(request.GET.get('start_date', ''), request.GET.get('end_date', ''))
+    except ValueError:
+        return None
+    return data_processor.data_version(years, sources=('processed',))
+
+def _prefetch_neighbours(view):
+    # After serving a date, warm the cached responses of the days around it
+    # so stepping through the date selector hits the cache
+    @wraps(view)
+    def wrapper(request):
+        response = view(request)
+        if _prefetch_executor is not None and response.status_code in (200, 304):
+            _schedule_daily_prefetch(view, request)
+        return response
+    return wrapper
 
+def _schedule_daily_prefetch(view, request):
+    try:
+        date = datetime.strptime(request.GET.get('date', ''), '%d-%m-%Y')
+    except ValueError:
+        return
+    for offset in range(1, DAILY_PREFETCH_DAYS + 1):
+        for day in (date + timedelta(days=offset), date - timedelta(days=offset)):
+            neighbour = copy.copy(request)
+            neighbour.GET = request.GET.copy()
+            neighbour.GET['date'] = day.strftime('%d-%m-%Y')
+            pending = neighbour.GET.urlencode() + request.META.get('HTTP_ACCEPT', '')
+            with _prefetch_lock:
+                if pending in _prefetch_pending:
+                    continue
+                _prefetch_pending.add(pending)
+            _prefetch_executor.submit(_warm, view, neighbour, pending)
+
+def _warm(view, request, pending):
+    try:
+        view.warm(request)
+    except Exception as e:
+        print(f"Prefetch of {request.GET.urlencode()} failed: {e}")
+    finally:
+        with _prefetch_lock:
+            _prefetch_pending.discard(pending)
+
+@_prefetch_neighbours
+@vary_on_headers('Accept')
+@response_cache.cached(_daily_data_version, vary=response_format)
 def daily_data(request):
     date_str = request.GET.get('date', None)
     if not date_str:
@@ -16,122 +136,371 @@ def daily_data(request):
         date = datetime.strptime(date_str, '%d-%m-%Y')
     except ValueError:
         return JsonResponse({"error": "Invalid date format. Use DD-MM-YYYY."}, status=400)
+
+    orient = request.GET.get('orient', 'records')
+    if orient not in ORIENTS:
+        return JsonResponse({"error": f"orient must be one of {', '.join(ORIENTS)}."}, status=400)
+
+    fmt = response_format(request)
+    error = _format_error(fmt, ('json', 'arrow'))
+    if error is not None:
+        return error
+    if fmt == 'arrow':
+        return _daily_data_arrow(date, request.GET.get('table', 'settlement_period'))
         
-    data = data_processor.get_daily_data(date)
+    data = data_processor.get_daily_data(date, orient=orient)
     
     if data is None:
         return JsonResponse({"error": "Data not available for the selected date."}, status=404)
         
-    return JsonResponse(data)
+    with span('serialise'):
+        return FastJsonResponse(data)
+
+def _daily_data_arrow(date, table):
+    # One table per response, typed, with the mixes as their per-fuel columns
+    if table not in DAILY_TABLES:
+        return JsonResponse({'error': f"table must be one of {', '.join(DAILY_TABLES)}"}, status=400)
+    daily = data_processor.get_daily_frames(date)
+    if daily is None:
+        return JsonResponse({"error": "Data not available for the selected date."}, status=404)
+    day_type, frames = daily
+    with span('serialise'):
+        return ArrowResponse(frames.get(table, pd.DataFrame()), metadata={'day_type': day_type})
 
+@response_cache.cached(_daily_range_version)
+def daily_data_range(request):
+    # daily-data for every date from start_date to end_date (DD-MM-YYYY,
+    # inclusive), sharing one load and aggregation across the days
+    try:
+        start_date = datetime.strptime(request.GET.get('start_date', ''), '%d-%m-%Y')
+        end_date = datetime.strptime(request.GET.get('end_date', ''), '%d-%m-%Y')
+    except ValueError:
+        return JsonResponse({"error": "start_date and end_date are required, as DD-MM-YYYY."}, status=400)
+
+    if end_date < start_date:
+        return JsonResponse({"error": "end_date must not be before start_date."}, status=400)
+    if (end_date - start_date).days >= MAX_DAILY_RANGE_DAYS:
+        return JsonResponse({"error": f"At most {MAX_DAILY_RANGE_DAYS} days can be requested at once."}, status=400)
+
+    orient = request.GET.get('orient', 'records')
+    if orient not in ORIENTS:
+        return JsonResponse({"error": f"orient must be one of {', '.join(ORIENTS)}."}, status=400)
+
+    days = data_processor.get_daily_range(start_date, end_date, orient=orient)
+
+    if days is None:
+        return JsonResponse({"error": "Data not available for the selected dates."}, status=404)
+
+    with span('serialise'):
+        return FastJsonResponse({'days': days})
+
+@vary_on_headers('Accept')
+@response_cache.cached(_time_series_version, vary=response_format)
 def time_series_data(request):
     start_date_str = request.GET.get('start_date')
     end_date_str = request.GET.get('end_date')
     variables_str = request.GET.get('variables')
+    orient = request.GET.get('orient', 'records')
+    fmt = response_format(request)
+    max_points_str = request.GET.get('max_points')
+    # Full settlement-period resolution unless a resolution or point budget is given
+    resolution = request.GET.get('resolution') or ('auto' if max_points_str else 'period')
 
     if not all([start_date_str, end_date_str, variables_str]):
         return JsonResponse({'error': 'start_date, end_date, and variables are required'}, status=400)
 
+    if orient not in ORIENTS:
+        return JsonResponse({'error': f"orient must be one of {', '.join(ORIENTS)}"}, status=400)
+
+    error = _format_error(fmt, FORMATS)
+    if error is not None:
+        return error
+
+    if resolution != 'auto' and resolution not in RESOLUTIONS:
+        return JsonResponse({'error': f"resolution must be auto or one of {', '.join(RESOLUTIONS)}"}, status=400)
+
     try:
         start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
         end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
         variables = variables_str.split(',')
+        max_points = int(max_points_str) if max_points_str else None
     except ValueError:
         return JsonResponse({'error': 'Invalid date or variable format'}, status=400)
 
-    data_processor = DataProcessor()
-    all_data = []
-    for year in range(start_date.year, end_date.year + 1):
-        core_file = os.path.join(data_processor.core_data_dir, f'core_data_{year}.csv')
-        if os.path.exists(core_file):
-            df = pd.read_csv(core_file)
-            all_data.append(df)
+    if max_points is not None and max_points < 3:
+        return JsonResponse({'error': 'max_points must be at least 3'}, status=400)
 
-    if not all_data:
-        return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
+    if resolution == 'auto':
+        max_points = max_points or DEFAULT_MAX_POINTS
+        resolution = choose_resolution(start_date, end_date, max_points)
 
-    full_df = pd.concat(all_data, ignore_index=True)
-    full_df['settlement_date'] = pd.to_datetime(full_df['settlement_date'])
+    # National totals are prebuilt per period, hour and day; take the date range and requested columns
+    numeric_vars = [v for v in dict.fromkeys(variables) if v in NUMERIC_COLUMNS]
 
-    mask = (full_df['settlement_date'] >= start_date) & (full_df['settlement_date'] <= end_date)
-    filtered_df = full_df.loc[mask]
+    if fmt == 'ndjson':
+        response = ndjson_response(_time_series_chunks(start_date, end_date, numeric_vars, resolution, max_points, orient))
+        if response is None:
+            return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
+        response['X-Resolution'] = resolution
+        return response
 
-    if filtered_df.empty:
+    response_df = data_processor.get_national_series(start_date, end_date, numeric_vars, resolution=resolution)
+
+    if response_df is None or response_df.empty:
         return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
 
-    # Aggregate nationally
-    group_by_cols = ['settlement_date', 'settlement_period']
-    
-    numeric_vars = [v for v in variables if v in filtered_df.columns and pd.api.types.is_numeric_dtype(filtered_df[v])]
-    
-    agg_dict = {var: 'sum' for var in numeric_vars}
+    if resolution == 'period':
+        response_df['settlement_date'] = pd.to_datetime(response_df['settlement_date'], format='%Y-%m-%d')
 
-    national_df = filtered_df.groupby(group_by_cols).agg(agg_dict).reset_index()
+    if max_points is not None:
+        # Shape-preserving reduction to about max_points rows
+        with span('downsample'):
+            response_df = downsample(response_df, numeric_vars, max_points)
 
-    # Ensure all requested variables are in the final df
-    final_vars = group_by_cols + numeric_vars
-    response_df = national_df[[col for col in final_vars if col in variables or col in group_by_cols]]
+    with span('serialise'):
+        if fmt == 'arrow':
+            response = ArrowResponse(response_df)
+        elif orient == 'split':
+            response = FastJsonResponse(frame_columns(response_df))
+        else:
+            response = FastJsonResponse(frame_records(response_df))
+    response['X-Resolution'] = resolution
+    return response
 
-    return JsonResponse(response_df.to_dict('records'), safe=False)
+def _time_series_chunks(start_date, end_date, columns, resolution, max_points, orient):
+    # NDJSON a year at a time: a line per row, or with orient=split a line of
+    # column arrays per year
+    total_days = (end_date - start_date).days + 1
+    for chunk_start, chunk_end in year_chunks(start_date, end_date, resolution):
+        chunk_df = data_processor.get_national_series(chunk_start, chunk_end, columns, resolution=resolution)
+        if chunk_df is None or chunk_df.empty:
+            continue
+        if resolution == 'period':
+            chunk_df['settlement_date'] = pd.to_datetime(chunk_df['settlement_date'], format='%Y-%m-%d')
+        if max_points is not None:
+            # Each year gets its share of the point budget
+            share = ((chunk_end - chunk_start).days + 1) / total_days
+            chunk_df = downsample(chunk_df, columns, max(3, round(max_points * share)))
+        if orient == 'split':
+            yield dumps(frame_columns(chunk_df)) + b'\n'
+        else:
+            yield ndjson_lines(frame_records(chunk_df))
 
 def available_variables(request):
     # Provide a list of plottable variables to the frontend
     # This is based on the columns in the core_data files
-    plottable_columns = [
-        'net_volume',
-        'boas_count',
-        'bids_count',
-        'offers_count',
-        'system_volume',
-        'energy_volume',
-        'balancing_cost',
-    ]
+    plottable_columns = NUMERIC_COLUMNS
     time_columns = [
         'settlement_date',
         'settlement_period'
     ]
     return JsonResponse({'time': time_columns, 'numeric': plottable_columns}, safe=False)
 
-def asset_benchmark_data(request):
-    start_date_str = request.GET.get('start_date')
-    end_date_str = request.GET.get('end_date')
-    asset_type = request.GET.get('asset_type')
-    capacity_mw = request.GET.get('capacity_mw')
-    price_bid = request.GET.get('price_bid')
-    price_offer = request.GET.get('price_offer')
+def _simulation_params(query):
+    # Validated asset benchmark parameters as plain JSON values, or an error response
+    start_date_str = query.get('start_date')
+    end_date_str = query.get('end_date')
+    asset_type = query.get('asset_type')
+    capacity_mw = query.get('capacity_mw')
+    price_bid = query.get('price_bid')
+    price_offer = query.get('price_offer')
 
     if not all([start_date_str, end_date_str, asset_type, capacity_mw]):
-        return JsonResponse({'error': 'Missing required parameters'}, status=400)
+        return None, JsonResponse({'error': 'Missing required parameters'}, status=400)
 
     try:
-        start_date = datetime.strptime(start_date_str, '%Y-%m-%d')
-        end_date = datetime.strptime(end_date_str, '%Y-%m-%d')
-        capacity_mw_float = float(capacity_mw)
-        price_bid_float = float(price_bid) if price_bid else None
-        price_offer_float = float(price_offer) if price_offer else None
+        datetime.strptime(start_date_str, '%Y-%m-%d')
+        datetime.strptime(end_date_str, '%Y-%m-%d')
+        params = {
+            'start_date': start_date_str,
+            'end_date': end_date_str,
+            'asset_type': asset_type,
+            'capacity_mw': float(capacity_mw),
+            'price_bid': float(price_bid) if price_bid else None,
+            'price_offer': float(price_offer) if price_offer else None,
+        }
     except (ValueError, TypeError):
-        return JsonResponse({'error': 'Invalid parameter format'}, status=400)
-
-    # Load all processed (not core) data for the simulation
-    all_data = []
-    for year in range(start_date.year, end_date.year + 1):
-        processed_file = os.path.join(data_processor.processed_dir, f'{year}boadf_processed.csv')
-        if os.path.exists(processed_file):
-            df = pd.read_csv(processed_file)
-            all_data.append(df)
-    
-    if not all_data:
+        return None, JsonResponse({'error': 'Invalid parameter format'}, status=400)
+    return params, None
+
+@vary_on_headers('Accept')
+@response_cache.cached(_asset_benchmark_version, vary=response_format)
+def asset_benchmark_data(request):
+    params, error = _simulation_params(request.GET)
+    if error is not None:
+        return error
+
+    fmt = response_format(request)
+    error = _format_error(fmt, FORMATS)
+    if error is not None:
+        return error
+
+    start_date = datetime.strptime(params['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(params['end_date'], '%Y-%m-%d')
+
+    if fmt == 'ndjson':
+        response = ndjson_response(_simulation_chunks(start_date, end_date, params))
+        if response is None:
+            return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
+        return response
+
+    # Prebuilt merit stacks when available, else the processed (not core)
+    # rows; ASSET_BENCHMARK_WORKERS > 1 spreads the latter's GSP groups over
+    # a process pool
+    benchmark = data_processor.simulation_benchmark(start_date, end_date)
+
+    if benchmark is None:
         return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
 
-    full_df = pd.concat(all_data, ignore_index=True)
-    full_df['settlement_date'] = pd.to_datetime(full_df['settlement_date'])
-    mask = (full_df['settlement_date'] >= start_date) & (full_df['settlement_date'] <= end_date)
-    filtered_df = full_df.loc[mask]
+    try:
+        results = benchmark.run_simulation(params['asset_type'], params['capacity_mw'], params['price_bid'], params['price_offer'])
+    finally:
+        benchmark.close()
+
+    with span('serialise'):
+        if fmt == 'arrow':
+            return ArrowResponse(pd.DataFrame(results))
+        return JsonResponse(results, safe=False)
+
+def _simulation_chunks(start_date, end_date, params):
+    # NDJSON results, sent as each GSP group is simulated; without the merit
+    # index only that group's rows are in memory
+    for gsp, benchmark in data_processor.iter_simulation_benchmarks(start_date, end_date):
+        try:
+            results = benchmark.run_simulation(params['asset_type'], params['capacity_mw'], params['price_bid'], params['price_offer'])
+        finally:
+            benchmark.close()
+        yield ndjson_lines(results)
+
+def _parse_grid(value):
+    # Comma separated values and/or start:stop:step ranges (stop inclusive)
+    points = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if ':' in part:
+            start, stop, step = (float(x) for x in part.split(':'))
+            if step <= 0:
+                raise ValueError('Grid step must be positive')
+            points.extend(np.round(np.arange(start, stop + step / 2, step), 10).tolist())
+        else:
+            points.append(float(part))
+    return points
 
-    if filtered_df.empty:
+def _sweep_params(query):
+    start_date_str = query.get('start_date')
+    end_date_str = query.get('end_date')
+    asset_type = query.get('asset_type')
+    capacity_mw = query.get('capacity_mw')
+    price_bid = query.get('price_bid')
+    price_offer = query.get('price_offer')
+
+    if not all([start_date_str, end_date_str, asset_type, capacity_mw]):
+        return None, JsonResponse({'error': 'Missing required parameters'}, status=400)
+
+    try:
+        datetime.strptime(start_date_str, '%Y-%m-%d')
+        datetime.strptime(end_date_str, '%Y-%m-%d')
+        capacities = _parse_grid(capacity_mw)
+        prices_bid = _parse_grid(price_bid) if price_bid else []
+        prices_offer = _parse_grid(price_offer) if price_offer else []
+    except (ValueError, TypeError):
+        return None, JsonResponse({'error': 'Invalid parameter format'}, status=400)
+
+    if asset_type not in ['offer', 'bid', 'both']:
+        return None, JsonResponse({'error': 'asset_type must be offer, bid or both'}, status=400)
+    if not capacities or (asset_type in ['bid', 'both'] and not prices_bid) or (asset_type in ['offer', 'both'] and not prices_offer):
+        return None, JsonResponse({'error': 'Missing price or capacity grid for asset_type'}, status=400)
+    if len(capacities) * max(len(prices_bid), 1) * max(len(prices_offer), 1) > MAX_SWEEP_POINTS:
+        return None, JsonResponse({'error': f'Sweep is limited to {MAX_SWEEP_POINTS} grid points'}, status=400)
+
+    return {
+        'start_date': start_date_str,
+        'end_date': end_date_str,
+        'asset_type': asset_type,
+        'capacity_mw': capacities,
+        'price_bid': prices_bid,
+        'price_offer': prices_offer,
+    }, None
+
+@response_cache.cached(_asset_benchmark_version)
+def asset_benchmark_sweep(request):
+    params, error = _sweep_params(request.GET)
+    if error is not None:
+        return error
+
+    start_date = datetime.strptime(params['start_date'], '%Y-%m-%d')
+    end_date = datetime.strptime(params['end_date'], '%Y-%m-%d')
+    benchmark = data_processor.simulation_benchmark(start_date, end_date)
+
+    if benchmark is None:
         return JsonResponse({'error': 'No data available for the selected date range'}, status=404)
 
-    benchmark = AssetBenchmark(filtered_df)
-    results = benchmark.run_simulation(asset_type, capacity_mw_float, price_bid_float, price_offer_float)
+    try:
+        results = benchmark.run_sweep(params['asset_type'], params['capacity_mw'], params['price_bid'], params['price_offer'])
+    finally:
+        benchmark.close()
+
+    with span('serialise'):
+        return JsonResponse(results)
+
+JOB_PARAMS = {
+    'simulation': _simulation_params,
+    'sweep': _sweep_params,
+}
+
+def _job_payload(job):
+    return {key: job[key] for key in ['id', 'kind', 'params', 'status', 'progress', 'error', 'created_at', 'updated_at']}
+
+@csrf_exempt
+def asset_benchmark_jobs(request):
+    # Submit a simulation (or sweep) to run in the background; identical
+    # submissions share one job
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Use POST to submit a job'}, status=405)
+
+    query = request.POST or request.GET
+    kind = query.get('kind', 'simulation')
+    if kind not in JOB_KINDS:
+        return JsonResponse({'error': f"kind must be one of {', '.join(JOB_KINDS)}"}, status=400)
+
+    params, error = JOB_PARAMS[kind](query)
+    if error is not None:
+        return error
+
+    # Keyed on the processed BOA files too, so a rebuilt year reruns the job
+    years = _years_between(params['start_date'], params['end_date'])
+    version = data_processor.data_version(years, sources=('processed',))
+    job = job_queue.submit(kind, params, partial(JOB_KINDS[kind], data_processor), version=version)
+    return JsonResponse(_job_payload(job), status=202)
+
+def asset_benchmark_job(request, job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    return JsonResponse(_job_payload(job))
+
+def asset_benchmark_job_result(request, job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return JsonResponse({'error': 'Job not found'}, status=404)
+    if job['status'] != 'done':
+        payload = _job_payload(job)
+        payload['error'] = payload['error'] or f"Job is {job['status']}"
+        return JsonResponse(payload, status=409)
+    return HttpResponse(job_queue.result(job_id), content_type='application/json')
+
+def metrics(request):
+    # Prometheus scrape target; empty unless REQUEST_TIMING is on, and only
+    # counts the requests of the worker process that answers it
+    return HttpResponse(timing.metrics.render(), content_type='text/plain; version=0.0.4')
 
-    return JsonResponse(results, safe=False)
\ No newline at end of file
+def ready(request):
+    # Readiness probe: 503 while the startup preload is still loading. If no
+    # preload is running in this process, current snapshots on disk count
+    state = dict(preload.state)
+    if state['status'] == 'loading' and not preload.running() and preload.snapshots_current(data_processor, state['years']):
+        state['status'] = 'ready'
+    status = 200 if state['status'] in ('idle', 'ready') else 503
+    return JsonResponse(state, status=status)
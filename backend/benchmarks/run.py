@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+# Benchmarks run against throwaway data directories; keep the response cache
+# out of the timings
+os.environ['RESPONSE_CACHE'] = 'off'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark-only')
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django
+
+django.setup()
+
+from django.test import RequestFactory
+
+from api import views
+from api.services.asset_benchmark import AssetBenchmark
+from api.services.data_processor import DataProcessor
+from benchmarks.synthetic import generate_year
+
+YEAR = 2024
+
+# Data sizes: days of data from 1 January, BMUs and mean acceptances per period
+SIZES = {
+    'small': {'days': 14, 'bmus': 150, 'acceptances_per_period': 20},
+    'medium': {'days': 90, 'bmus': 300, 'acceptances_per_period': 40},
+    'large': {'days': 366, 'bmus': 600, 'acceptances_per_period': 80},
+}
+
+# A stage is reported as a regression when it is this much slower than the baseline
+DEFAULT_TOLERANCE = 0.2
+
+
+def measure(fn, repeat, setup=None):
+    """Best wall time of ``repeat`` runs of ``fn()``, then its peak traced memory in MB from one more run."""
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024 / 1024
+
+
+def run_size(name, spec, repeat, data_root):
+    data_dir = os.path.join(data_root, name)
+    print(f'Generating {name} data ({spec})...')
+    rows = generate_year(data_dir, YEAR, **spec)
+    days = spec['days']
+    first_day = date(YEAR, 1, 1)
+    last_day = first_day + timedelta(days=days - 1)
+    processor = DataProcessor(data_dir)
+    views.data_processor = processor
+    factory = RequestFactory()
+    results = {}
+
+    def clear_core():
+        shutil.rmtree(processor.core_data_dir, ignore_errors=True)
+        os.makedirs(processor.core_data_dir, exist_ok=True)
+
+    seconds, peak_mb = measure(lambda: processor.create_core_data(YEAR), repeat, setup=clear_core)
+    results['create_core_data'] = {'seconds': seconds, 'throughput': rows / seconds, 'unit': 'rows/s', 'peak_mb': peak_mb}
+
+    sample_days = [first_day + timedelta(days=i) for i in range(0, days, max(1, days // 10))]
+
+    def daily():
+        for day in sample_days:
+            processor.get_daily_data(datetime(day.year, day.month, day.day))
+
+    seconds, peak_mb = measure(daily, repeat)
+    results['get_daily_data'] = {'seconds': seconds, 'throughput': len(sample_days) / seconds, 'unit': 'days/s', 'peak_mb': peak_mb}
+
+    series_request = factory.get('/api/time-series/', {
+        'start_date': first_day.isoformat(),
+        'end_date': last_day.isoformat(),
+        'variables': 'net_volume,balancing_cost',
+    })
+
+    def time_series():
+        response = views.time_series_data(series_request)
+        assert response.status_code == 200, response.content[:200]
+
+    seconds, peak_mb = measure(time_series, repeat)
+    periods = days * 48
+    results['time_series_data'] = {'seconds': seconds, 'throughput': periods / seconds, 'unit': 'periods/s', 'peak_mb': peak_mb}
+
+    simulation_df = processor.load_simulation_range(datetime(YEAR, 1, 1), datetime(last_day.year, last_day.month, last_day.day))
+
+    def simulation():
+        benchmark = AssetBenchmark(simulation_df)
+        try:
+            benchmark.run_simulation('both', 50.0, 30.0, 120.0)
+        finally:
+            benchmark.close()
+
+    seconds, peak_mb = measure(simulation, repeat)
+    results['run_simulation'] = {'seconds': seconds, 'throughput': len(simulation_df) / seconds, 'unit': 'rows/s', 'peak_mb': peak_mb}
+
+    # The same simulation over the merit index built alongside the BOA store
+    def indexed_simulation():
+        benchmark = processor.simulation_benchmark(datetime(YEAR, 1, 1), datetime(last_day.year, last_day.month, last_day.day))
+        benchmark.run_simulation('both', 50.0, 30.0, 120.0)
+
+    seconds, peak_mb = measure(indexed_simulation, repeat)
+    results['indexed_simulation'] = {'seconds': seconds, 'throughput': len(simulation_df) / seconds, 'unit': 'rows/s', 'peak_mb': peak_mb}
+    return {'rows': rows, 'stages': results}
+
+
+def compare(results, baseline, tolerance):
+    """Print each stage against the baseline; returns the regressed ``(size, stage)`` pairs."""
+    regressions = []
+    for size, result in results.items():
+        for stage, current in result['stages'].items():
+            previous = baseline.get(size, {}).get('stages', {}).get(stage)
+            if previous is None:
+                continue
+            ratio = current['seconds'] / previous['seconds']
+            flag = ''
+            if ratio > 1 + tolerance:
+                flag = '  REGRESSION'
+                regressions.append((size, stage))
+            print(f"{size:8} {stage:18} {previous['seconds']:9.3f}s -> {current['seconds']:9.3f}s  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the data pipeline and endpoints on synthetic BOA data.")
+    parser.add_argument("--sizes", nargs="+", default=['small', 'medium'], choices=list(SIZES), help="Data sizes to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is reported.")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file (e.g. to store a baseline).")
+    parser.add_argument("--baseline", default=None, help="Compare against results stored by an earlier --output.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown against the baseline (0.2 = 20%%).")
+    parser.add_argument("--keep-data", default=None, help="Generate data here and keep it (default a temporary directory).")
+    args = parser.parse_args(argv)
+
+    data_root = args.keep_data or tempfile.mkdtemp(prefix='bmview-bench-')
+    try:
+        results = {name: run_size(name, SIZES[name], args.repeat, data_root) for name in args.sizes}
+    finally:
+        if not args.keep_data:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    print()
+    for size, result in results.items():
+        print(f"{size} ({result['rows']} rows)")
+        for stage, stats in result['stages'].items():
+            print(f"  {stage:18} {stats['seconds']:9.3f}s  {stats['throughput']:14,.0f} {stats['unit']:10} peak {stats['peak_mb']:8.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print()
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import argparse
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Columns of a {year}boadf_processed.csv file, in order
+PROCESSED_COLUMNS = [
+    'settlement_date',
+    'settlement_period',
+    'gsp_group_id',
+    'bmu_fuel_type',
+    'total_volume_accepted',
+    'acceptance_id',
+    'balancing_cost',
+    'system_operator_flag',
+    'accepted_price',
+]
+
+GSP_GROUPS = ['_A', '_B', '_C', '_D', '_E', '_F', '_G', '_H', '_J', '_K', '_L', '_M', '_N', '_P']
+
+# Fuel type -> (share of BMUs, typical accepted price in GBP/MWh)
+FUEL_PROFILES = {
+    'CCGT': (0.22, 95.0),
+    'WIND': (0.30, 10.0),
+    'PS': (0.05, 120.0),
+    'NPSHYD': (0.04, 70.0),
+    'BIOMASS': (0.04, 85.0),
+    'OCGT': (0.05, 160.0),
+    'BATTERY': (0.12, 110.0),
+    'NUCLEAR': (0.02, 40.0),
+    'COAL': (0.01, 130.0),
+    'INTFR': (0.02, 90.0),
+    'INTNED': (0.02, 90.0),
+    'INTNSL': (0.01, 90.0),
+    'SOLAR': (0.03, 5.0),
+    'OTHER': (0.07, 80.0),
+}
+
+
+def last_sunday(year, month):
+    day = date(year, month + 1, 1) - timedelta(days=1)
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def periods_in_day(day):
+    """48 settlement periods, 46 on the spring clock change and 50 on the autumn one."""
+    if day == last_sunday(day.year, 3):
+        return 46
+    if day == last_sunday(day.year, 10):
+        return 50
+    return 48
+
+
+def make_bmus(n_bmus, gsp_groups, fuel_types, rng):
+    """A fixed GSP group, fuel type and price level for each synthetic BMU."""
+    weights = np.array([FUEL_PROFILES.get(fuel, (0.05, 80.0))[0] for fuel in fuel_types])
+    fuels = rng.choice(len(fuel_types), size=n_bmus, p=weights / weights.sum())
+    prices = np.array([FUEL_PROFILES.get(fuel, (0.05, 80.0))[1] for fuel in fuel_types])[fuels]
+    return {
+        'gsp': rng.choice(len(gsp_groups), size=n_bmus),
+        'fuel': fuels,
+        'price': prices * rng.lognormal(0.0, 0.2, size=n_bmus),
+    }
+
+
+def generate_day(day, bmus, gsp_groups, fuel_types, acceptances_per_period, so_flag_rate,
+                 missing_price_rate, rng, first_acceptance_id=0):
+    """Processed BOA rows for one settlement date."""
+    n_periods = periods_in_day(day)
+    counts = rng.poisson(acceptances_per_period, size=n_periods)
+    n = int(counts.sum())
+    periods = np.repeat(np.arange(1, n_periods + 1), counts)
+    bmu = rng.integers(len(bmus['gsp']), size=n)
+
+    # Offers raise output above the BMU's price level, bids lower it below
+    offer = rng.random(n) < 0.5
+    volume = rng.exponential(25.0, size=n) * np.where(offer, 1.0, -1.0)
+    volume[rng.random(n) < 0.03] = 0.0
+    spread = rng.exponential(15.0, size=n)
+    price = np.round(bmus['price'][bmu] + np.where(offer, spread, -spread), 2)
+    # Prices cluster on round numbers, so ties in the merit order are common
+    round_price = rng.random(n) < 0.2
+    price[round_price] = np.round(price[round_price], -1)
+    volume = np.round(volume, 3)
+    cost = np.round(volume * price, 2)
+    price[rng.random(n) < missing_price_rate] = np.nan
+
+    return pd.DataFrame({
+        'settlement_date': day.isoformat(),
+        'settlement_period': periods,
+        'gsp_group_id': np.asarray(gsp_groups, dtype=object)[bmus['gsp'][bmu]],
+        'bmu_fuel_type': np.asarray(fuel_types, dtype=object)[bmus['fuel'][bmu]],
+        'total_volume_accepted': volume,
+        'acceptance_id': first_acceptance_id + np.arange(n),
+        'balancing_cost': cost,
+        'system_operator_flag': (rng.random(n) < so_flag_rate).astype(np.int8),
+        'accepted_price': price,
+    }, columns=PROCESSED_COLUMNS)
+
+
+def generate_year(out_dir, year, start=None, days=None, bmus=300, gsp_groups=None, fuel_types=None,
+                  acceptances_per_period=40, so_flag_rate=0.3, missing_price_rate=0.005, seed=0):
+    """
+    Write ``{year}boadf_processed.csv`` to ``out_dir`` with synthetic but
+    realistically shaped BOAs: ``bmus`` units spread over ``gsp_groups`` with
+    fuel-dependent prices, about ``acceptances_per_period`` acceptances per
+    settlement period and clock-change days of 46 and 50 periods. Covers
+    ``days`` days from ``start`` (default the whole year). Written a day at a
+    time; returns the number of rows.
+    """
+    gsp_groups = list(gsp_groups or GSP_GROUPS)
+    fuel_types = list(fuel_types or FUEL_PROFILES)
+    rng = np.random.default_rng(seed)
+    bmu_table = make_bmus(bmus, gsp_groups, fuel_types, rng)
+
+    first = start or date(year, 1, 1)
+    if days is None:
+        days = (date(year, 12, 31) - first).days + 1
+
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f'{year}boadf_processed.csv')
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        for i in range(days):
+            day = first + timedelta(days=i)
+            df = generate_day(day, bmu_table, gsp_groups, fuel_types, acceptances_per_period,
+                              so_flag_rate, missing_price_rate, rng, first_acceptance_id=rows)
+            df.to_csv(f, index=False, header=(i == 0))
+            rows += len(df)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic {year}boadf_processed.csv files.")
+    parser.add_argument("--out", required=True, help="Directory to write the CSV files to.")
+    parser.add_argument("--years", type=int, nargs="+", default=[2024], help="Years to generate.")
+    parser.add_argument("--days", type=int, default=None, help="Days per year from 1 January (default the whole year).")
+    parser.add_argument("--bmus", type=int, default=300, help="Number of BMUs.")
+    parser.add_argument("--gsp-groups", type=int, default=len(GSP_GROUPS), help="Number of GSP groups (at most 14).")
+    parser.add_argument("--acceptances", type=float, default=40, help="Mean acceptances per settlement period.")
+    parser.add_argument("--so-flag-rate", type=float, default=0.3, help="Share of acceptances flagged by the SO.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for year in args.years:
+        rows = generate_year(args.out, year, days=args.days, bmus=args.bmus, gsp_groups=GSP_GROUPS[:args.gsp_groups],
+                             acceptances_per_period=args.acceptances, so_flag_rate=args.so_flag_rate, seed=args.seed + year)
+        print(f'Wrote {rows} rows for {year}.')
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,8 @@ INSTALLED_APPS = [
 # ------------------------------------------------------------------------------
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Opt-in request timing and profiling (REQUEST_TIMING)
+    "api.middleware.TimingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -182,6 +184,21 @@ REST_FRAMEWORK = {
     ),
 }
 
+# ------------------------------------------------------------------------------
+# Logging
+# ------------------------------------------------------------------------------
+# Request timing lines (REQUEST_TIMING) are logged by api.middleware at INFO
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "api": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # ------------------------------------------------------------------------------
 # Misc
 # ------------------------------------------------------------------------------
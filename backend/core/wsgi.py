@@ -8,4 +8,10 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_wsgi_application() 
\ No newline at end of file
+application = get_wsgi_application()
+
+# Map the hot years (CORE_PRELOAD_YEARS) into shared read-only snapshots. With
+# gunicorn --preload this runs once in the master, before workers fork.
+from api.services.preload import preload_from_env
+
+preload_from_env()
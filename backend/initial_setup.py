@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 
@@ -6,11 +7,32 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from api.services.data_processor import DataProcessor
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the core data files from the processed BOA data.")
+    parser.add_argument("--years", type=int, nargs="+", default=None, help="Years to build (default 2021-2025).")
+    parser.add_argument("--workers", type=int, default=None, help="Years built in parallel (default CORE_BUILD_WORKERS or CPU count).")
+    parser.add_argument("--chunksize", type=int, default=None, help="Stream processed CSVs this many rows at a time to bound memory (default CORE_BUILD_CHUNKSIZE).")
+    parser.add_argument("--incremental", action="store_true", help="Only add settlement dates that are newer than the existing core data.")
+    parser.add_argument("--load-sql", action="store_true", help="Also bulk load the built years into the configured database (for CORE_BACKEND=sql).")
+    args = parser.parse_args(argv)
+
     print("Starting initial data processing...")
-    processor = DataProcessor()
-    processor.create_all_core_data()
+    processor = DataProcessor(backend='files')
+    try:
+        processor.create_all_core_data(years=args.years, workers=args.workers, chunksize=args.chunksize, incremental=args.incremental)
+    except RuntimeError as e:
+        print(f"Initial data processing failed: {e}")
+        return 1
+    if args.load_sql:
+        # The models need Django set up; run `manage.py migrate` first
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+        import django
+        django.setup()
+        for year in args.years or range(2021, 2026):
+            if processor.core_store.exists(year):
+                processor.load_core_sql(year)
     print("Initial data processing finished.")
+    return 0
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import GBMap from './Map';
 import DateSelector from './DateSelector';
 import SettlementPeriodSlider from './SettlementPeriodSlider';
@@ -7,9 +7,22 @@ import TechnologyMix from './TechnologyMix';
 import RegionalInfoPanel from './RegionalInfoPanel';
 import NumericsPanel from './NumericsPanel';
 import styled from '@emotion/styled';
-import { fetchDailyData } from '../services/api';
+import { fetchDailyDataRange } from '../services/api';
 import { GB_ZONES } from './Map/zones';
 
+// Days fetched ahead of the selected date, so stepping through a week is one request
+const DAYS_AHEAD = 6;
+// Cached days further than this from the selected date are dropped
+const CACHE_WINDOW_DAYS = 14;
+
+const isoDate = (date) =>
+  `${date.year}-${String(date.month).padStart(2, '0')}-${String(date.day).padStart(2, '0')}`;
+
+const addDays = (date, days) => {
+  const d = new Date(Date.UTC(date.year, date.month - 1, date.day + days));
+  return { day: d.getUTCDate(), month: d.getUTCMonth() + 1, year: d.getUTCFullYear() };
+};
+
 const SplitViewContainer = styled.div`
   display: flex;
   width: 100%;
@@ -125,6 +138,9 @@ const useMapViewController = (initialDate) => {
   
   const [processedSpData, setProcessedSpData] = useState({});
   const [processedHrData, setProcessedHrData] = useState({});
+  // Daily responses by ISO date, filled a range at a time and kept only
+  // around the selected date
+  const dayCache = useRef({});
   
   const [currentZoneData, setCurrentZoneData] = useState({});
   const [loading, setLoading] = useState(false);
@@ -168,7 +184,19 @@ const useMapViewController = (initialDate) => {
       setStatus({ message: 'Fetching daily data...', error: false });
       
       try {
-        const data = await fetchDailyData(selectedDate);
+        let data = dayCache.current[isoDate(selectedDate)];
+        if (!data) {
+          const days = await fetchDailyDataRange(selectedDate, addDays(selectedDate, DAYS_AHEAD));
+          days.forEach(day => { dayCache.current[day.date] = day; });
+          data = dayCache.current[isoDate(selectedDate)];
+          if (!data) throw new Error('Data not available for the selected date.');
+        }
+        const selected = Date.parse(isoDate(selectedDate));
+        Object.keys(dayCache.current).forEach(key => {
+          if (Math.abs(Date.parse(key) - selected) > CACHE_WINDOW_DAYS * 86400000) {
+            delete dayCache.current[key];
+          }
+        });
         setDailyData(data);
 
         const spData = data.settlement_period.reduce((acc, item) => {
@@ -80,6 +80,8 @@ const ResultsTable = styled.table`
   }
 `;
 
+const JOB_POLL_MS = 1000;
+
 const RegionalAssetBenchmarkPage = () => {
     const [params, setParams] = useState({
         start_date: '2024-01-01',
@@ -92,6 +94,7 @@ const RegionalAssetBenchmarkPage = () => {
     const [results, setResults] = useState(null);
     const [error, setError] = useState(null);
     const [loading, setLoading] = useState(false);
+    const [progress, setProgress] = useState(null);
 
     const handleInputChange = (e) => {
         const { name, value } = e.target;
@@ -102,19 +105,36 @@ const RegionalAssetBenchmarkPage = () => {
         setLoading(true);
         setError(null);
         setResults(null);
+        setProgress(null);
         try {
-            const query = new URLSearchParams(params);
-            const response = await fetch(`/api/asset-benchmark/?${query}`);
+            // Long simulations run as background jobs; identical requests share one job
+            const response = await fetch('/api/asset-benchmark/jobs/', {
+                method: 'POST',
+                body: new URLSearchParams(params),
+            });
+            let job = await response.json();
             if (!response.ok) {
-                const err = await response.json();
+                throw new Error(job.error || 'Failed to start benchmark job');
+            }
+            while (job.status === 'queued' || job.status === 'running') {
+                setProgress(job.progress);
+                await new Promise(resolve => setTimeout(resolve, JOB_POLL_MS));
+                job = await (await fetch(`/api/asset-benchmark/jobs/${job.id}/`)).json();
+            }
+            if (job.status !== 'done') {
+                throw new Error(job.error || 'Benchmark job failed');
+            }
+            const resultResponse = await fetch(`/api/asset-benchmark/jobs/${job.id}/result/`);
+            if (!resultResponse.ok) {
+                const err = await resultResponse.json();
                 throw new Error(err.error || 'Failed to fetch benchmark data');
             }
-            const data = await response.json();
-            setResults(data);
+            setResults(await resultResponse.json());
         } catch (e) {
             setError(e.message);
         } finally {
             setLoading(false);
+            setProgress(null);
         }
     };
 
@@ -151,7 +171,9 @@ const RegionalAssetBenchmarkPage = () => {
                     <Input type="number" name="price_bid" value={params.price_bid} onChange={handleInputChange} disabled={params.asset_type === 'offer'}/>
                 </ControlGroup>
                 <Button onClick={handleRunSimulation} disabled={loading}>
-                    {loading ? 'Running Simulation...' : 'Run Simulation'}
+                    {loading
+                        ? (progress && progress.total ? `Running Simulation... ${progress.done}/${progress.total} regions` : 'Running Simulation...')
+                        : 'Run Simulation'}
                 </Button>
             </FormContainer>
 
@@ -63,11 +63,39 @@ const PlotContainer = styled.div`
   box-shadow: 0 2px 5px rgba(0,0,0,0.05);
 `;
 
+const RESOLUTIONS = ['auto', 'period', 'hour', 'day', 'week', 'month'];
+const MAX_POINTS = 5000;
+// Longer full-resolution ranges are streamed as NDJSON; shorter or thinned
+// ones come as one JSON response, which the server caches (with ETags)
+const NDJSON_MIN_DAYS = 366;
+
+// Calls onRows with the rows of each chunk of an NDJSON response as it arrives
+const readNdjson = async (response, onRows) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buffered.split('\n');
+    buffered = done ? '' : lines.pop();
+    const rows = lines.filter(line => line.trim()).map(line => JSON.parse(line));
+    if (rows.length) {
+      onRows(rows);
+    }
+    if (done) {
+      return;
+    }
+  }
+};
+
 const TimeSeriesPage = () => {
   const [startDate, setStartDate] = useState('2024-01-01');
   const [endDate, setEndDate] = useState('2024-01-07');
   const [xVariable, setXVariable] = useState('settlement_date');
   const [yVariable, setYVariable] = useState('balancing_cost');
+  // 'auto' lets the server pick a resolution and thin the series to MAX_POINTS
+  const [resolution, setResolution] = useState('auto');
   const [availableVars, setAvailableVars] = useState({ time: [], numeric: [] });
   const [plotData, setPlotData] = useState(null);
   const [error, setError] = useState(null);
@@ -95,22 +123,44 @@ const TimeSeriesPage = () => {
         const params = new URLSearchParams({
             start_date: startDate,
             end_date: endDate,
-            variables: `${xVariable},${yVariable}`
+            variables: `${xVariable},${yVariable}`,
+            resolution: resolution
         });
+        if (resolution === 'auto') {
+            params.append('max_points', MAX_POINTS);
+        }
+        const days = (new Date(endDate) - new Date(startDate)) / 86400000 + 1;
+        const streamed = resolution !== 'auto' && days > NDJSON_MIN_DAYS;
+        if (streamed) {
+            // NDJSON arrives a year at a time; the plot grows as each year is read
+            params.append('format', 'ndjson');
+        }
         const response = await fetch(`/api/time-series/?${params}`);
         if (!response.ok) {
             const err = await response.json();
             throw new Error(err.error || 'Failed to fetch data');
         }
-        const data = await response.json();
-        
-        const plotObject = {
-            x: data.map(d => d[xVariable]),
-            y: data.map(d => d[yVariable]),
+
+        const x = [];
+        const y = [];
+        const showRows = () => setPlotData({
+            x: [...x],
+            y: [...y],
             type: 'scatter',
             mode: 'lines+markers',
+        });
+        const addRows = rows => {
+            rows.forEach(d => {
+                x.push(d[xVariable]);
+                y.push(d[yVariable]);
+            });
+            showRows();
         };
-        setPlotData(plotObject);
+        if (streamed) {
+            await readNdjson(response, addRows);
+        } else {
+            addRows(await response.json());
+        }
 
     } catch (e) {
       setError(e.message);
@@ -147,6 +197,12 @@ const TimeSeriesPage = () => {
             {availableVars.numeric.map(v => <option key={v} value={v}>{v}</option>)}
           </Select>
         </ControlGroup>
+        <ControlGroup>
+          <Label>Resolution</Label>
+          <Select value={resolution} onChange={e => setResolution(e.target.value)}>
+            {RESOLUTIONS.map(v => <option key={v} value={v}>{v}</option>)}
+          </Select>
+        </ControlGroup>
         <Button onClick={handleGeneratePlot}>Generate Plot</Button>
         <Button onClick={handleDownloadData}>Download Data</Button>
       </ControlsContainer>
@@ -4,20 +4,39 @@ import axios from 'axios';
 const API_BASE_URL =
   process.env.REACT_APP_API_BASE_URL || "http://localhost:8000/api";
 
-export const fetchDailyData = async (date) => {
-  // Format date to DD-MM-YYYY
+// Format a { day, month, year } date as DD-MM-YYYY
+const formatDate = (date) => {
   const day = String(date.day).padStart(2, '0');
   const month = String(date.month).padStart(2, '0');
-  const year = date.year;
-  const formattedDate = `${day}-${month}-${year}`;
+  return `${day}-${month}-${date.year}`;
+};
+
+// orient: 'records' (default, one object per row) or 'split' (one array per column)
+export const fetchDailyData = async (date, orient) => {
+  const formattedDate = formatDate(date);
 
   try {
     const response = await axios.get(`${API_BASE_URL}/daily-data/`, {
-      params: { date: formattedDate }
+      params: orient ? { date: formattedDate, orient } : { date: formattedDate }
     });
     return response.data;
   } catch (error) {
     console.error('Error fetching daily data:', error);
     throw error;
   }
+};
+
+// Daily data for every date from start to end (inclusive, at most 31 days) in
+// one request; resolves to a list of days, each with its ISO `date`
+export const fetchDailyDataRange = async (start, end, orient) => {
+  const params = { start_date: formatDate(start), end_date: formatDate(end) };
+  if (orient) params.orient = orient;
+
+  try {
+    const response = await axios.get(`${API_BASE_URL}/daily-data/range/`, { params });
+    return response.data.days;
+  } catch (error) {
+    console.error('Error fetching daily data range:', error);
+    throw error;
+  }
 };
\ No newline at end of file